@@ -0,0 +1,179 @@
+"""
+Benchmark the simulation across grid sizes and write a machine-readable report.
+
+For each grid the harness measures the setup time of
+``send_pubkey_through_wormhole`` (fields computed from scratch), RHS evaluations
+per second of the configured Hamiltonian backend, iterations per second of
+``run_simulation`` and the peak traced memory of a separate short run. The report
+is printed as a table and written as JSON together with the environment and the
+configuration hash, so reports from different commits can be compared.
+
+Usage:
+    python scripts/benchmark.py [--grids 5,5,5,5,3,3 8,8,8,8,4,4] [--iterations N]
+                                [--evals N] [--precision single --integrator rk4]
+                                [--output report.json]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+import numpy as np
+import scipy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import CONFIG
+from src.hamiltonian import build_hamiltonian
+from src.operators import clear_operator_cache
+from src.simulation import Unified6DTOE
+from src.utils import config_hash
+
+GRID_SIZES = [
+    (5, 5, 5, 5, 3, 3),
+    (6, 6, 6, 6, 4, 4),
+    (8, 8, 8, 8, 4, 4),
+    (10, 10, 10, 10, 4, 4),
+    (12, 12, 12, 12, 4, 4),
+]
+TARGET_ADDRESS = "1TestAddress"
+TARGET_PUBKEY = (0x123456789, None)
+
+logger = logging.getLogger("TOE6D_Benchmark")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+
+def parse_grid(text):
+    """Parse "5,5,5,5,3,3" into a 6-tuple."""
+    grid_size = tuple(int(n) for n in text.split(","))
+    if len(grid_size) != 6:
+        raise argparse.ArgumentTypeError(f"Grid must have 6 dimensions: {text}")
+    return grid_size
+
+
+def new_simulation(seed):
+    return Unified6DTOE(TARGET_ADDRESS, TARGET_PUBKEY, logger, rng=np.random.default_rng(seed))
+
+
+def measure_setup(sim, repeats):
+    """Best-of-``repeats`` time of send_pubkey_through_wormhole without the field cache."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        sim.send_pubkey_through_wormhole()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_rhs(sim, evals):
+    """RHS evaluations per second of the configured backend, after one warm-up call."""
+    clear_operator_cache()
+    hamiltonian = build_hamiltonian(sim.grid_size, sim.dx, sim.V, sim.wormhole_state, logger)
+    y = sim.quantum_state.state
+    history = [y.copy()]
+    out = np.empty_like(y)
+    hamiltonian(0.0, y, history, None, out=out)
+    start = time.perf_counter()
+    for i in range(evals):
+        hamiltonian(i * 1e-13, y, history, None, out=out)
+    return evals / (time.perf_counter() - start)
+
+
+def measure_iterations(seed, iterations):
+    """Iterations per second of run_simulation, excluding construction."""
+    sim = new_simulation(seed)
+    start = time.perf_counter()
+    sim.run_simulation(iterations, progress=False)
+    return sim.stop_iteration / (time.perf_counter() - start)
+
+
+def measure_peak_memory(seed, iterations):
+    """Peak traced allocation in MiB while constructing and running a simulation."""
+    tracemalloc.start()
+    try:
+        new_simulation(seed).run_simulation(iterations, progress=False)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def benchmark_grid(grid_size, args):
+    CONFIG["grid_size"] = grid_size
+    sim = new_simulation(args.seed)
+    result = {
+        "grid_size": list(grid_size),
+        "points": int(sim.total_points),
+        "setup_seconds": measure_setup(sim, args.repeats),
+        "rhs_per_second": measure_rhs(sim, args.evals),
+        "iterations_per_second": measure_iterations(args.seed, args.iterations),
+        "peak_memory_mib": measure_peak_memory(args.seed, min(args.iterations, 3)),
+    }
+    return result
+
+
+def environment():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TVLE simulation")
+    parser.add_argument("--grids", type=parse_grid, nargs="+", default=GRID_SIZES, help="Grid sizes to benchmark")
+    parser.add_argument("--iterations", type=int, default=20, help="Iterations of run_simulation per grid")
+    parser.add_argument("--evals", type=int, default=50, help="RHS evaluations per grid")
+    parser.add_argument("--repeats", type=int, default=3, help="Repeats of the setup measurement")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the initial phases")
+    parser.add_argument("--precision", choices=["double", "single"], help="Override CONFIG['precision']")
+    parser.add_argument("--integrator", help="Override CONFIG['integrator']")
+    parser.add_argument("--output", default="benchmark_report.json", help="JSON report path")
+    args = parser.parse_args()
+    saved = dict(CONFIG)
+    CONFIG["field_cache_dir"] = None
+    CONFIG["precision"] = args.precision or CONFIG["precision"]
+    CONFIG["integrator"] = args.integrator or CONFIG["integrator"]
+    print(f"{'grid':>24} {'points':>8} {'setup [s]':>10} {'RHS/s':>9} {'iter/s':>8} {'peak [MiB]':>11}")
+    results = []
+    try:
+        for grid_size in args.grids:
+            result = benchmark_grid(grid_size, args)
+            results.append(result)
+            print(f"{str(grid_size):>24} {result['points']:>8} {result['setup_seconds']:>10.4f} "
+                  f"{result['rhs_per_second']:>9.1f} {result['iterations_per_second']:>8.2f} "
+                  f"{result['peak_memory_mib']:>11.1f}")
+        report_config = {
+            "hamiltonian_backend": CONFIG["hamiltonian_backend"],
+            "integrator": CONFIG["integrator"],
+            "ode_method": CONFIG["ode_method"],
+            "substeps": CONFIG["substeps"],
+            "precision": CONFIG["precision"],
+            "config_hash": config_hash(dict(CONFIG, grid_size=saved["grid_size"])),
+        }
+    finally:
+        CONFIG.clear()
+        CONFIG.update(saved)
+    report = {
+        "environment": environment(),
+        "config": report_config,
+        "max_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare RHS throughput of the Hamiltonian backends as the 6D grid grows.
+
+Usage:
+    python scripts/benchmark_backends.py [--evals N]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import CONFIG
+from src.hamiltonian import HAMILTONIAN_BACKENDS
+from src.operators import clear_operator_cache
+from src.simulation import Unified6DTOE
+
+GRID_SIZES = [
+    (5, 5, 5, 5, 3, 3),
+    (6, 6, 6, 6, 4, 4),
+    (8, 8, 8, 8, 4, 4),
+    (10, 10, 10, 10, 4, 4),
+]
+
+logger = logging.getLogger("TOE6D_Benchmark")
+logger.addHandler(logging.NullHandler())
+
+
+def time_backend(backend, sim, evals):
+    """Return (setup seconds, RHS evaluations per second) for one backend."""
+    clear_operator_cache()
+    start = time.perf_counter()
+    hamiltonian = HAMILTONIAN_BACKENDS[backend](sim.grid_size, sim.dx, sim.V, sim.wormhole_state, logger)
+    setup = time.perf_counter() - start
+    y = sim.quantum_state.state
+    history = [y.copy()]
+    hamiltonian(0.0, y, history, None)  # Warm up caches
+    start = time.perf_counter()
+    for i in range(evals):
+        hamiltonian(i * 1e-13, y, history, None)
+    return setup, evals / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Hamiltonian backends")
+    parser.add_argument("--evals", type=int, default=50, help="RHS evaluations per measurement")
+    args = parser.parse_args()
+    print(f"{'grid':>24} {'points':>8} {'backend':>10} {'setup [s]':>10} {'evals/s':>10}")
+    for grid_size in GRID_SIZES:
+        CONFIG["grid_size"] = grid_size
+        sim = Unified6DTOE("1TestAddress", (0x123456789, None), logger)
+        for backend in HAMILTONIAN_BACKENDS:
+            setup, rate = time_backend(backend, sim, args.evals)
+            print(f"{str(grid_size):>24} {sim.total_points:>8} {backend:>10} {setup:>10.3f} {rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Regenerate the golden-trajectory fixture used by tests/test_golden.py.
+
+Only run this when a change to the simulated trajectory is intended, and say so in
+the commit that updates the fixture.
+
+Usage:
+    python scripts/make_golden.py
+"""
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tests.test_golden import GOLDEN_PATH, golden_trajectory
+
+
+def main():
+    states, keys = golden_trajectory()
+    os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+    np.savez_compressed(GOLDEN_PATH, states=states, keys=keys)
+    print(f"Wrote {len(states)} golden states to {GOLDEN_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Run a parameter sweep and print the summary of every run.
+
+Each ``--param`` gives a CONFIG key and a comma-separated list of JSON values; the
+sweep runs the Cartesian product of all lists for every seed. Runs already in the
+result store are not repeated.
+
+Usage:
+    python scripts/run_sweep.py --param wormhole_coupling=1000,5000 --param dt=1e-12,2e-12
+                                [--seeds 0 1] [--iterations N] [--workers N]
+                                [--store sweep_results]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.sweep import Sweep
+
+TARGET_ADDRESS = "1TestAddress"
+TARGET_PUBKEY = (0x123456789, None)
+
+logger = logging.getLogger("TOE6D_Sweep")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+
+def parse_param(text):
+    """Parse ``name=v1,v2,...`` into ``(name, [v1, v2, ...])``."""
+    name, _, values = text.partition("=")
+    if not values:
+        raise argparse.ArgumentTypeError(f"Expected name=v1,v2,... but got {text}")
+    return name, json.loads(f"[{values}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--param", type=parse_param, action="append", default=[], help="name=v1,v2,...")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--store", default="sweep_results")
+    args = parser.parse_args()
+
+    sweep = Sweep(TARGET_ADDRESS, TARGET_PUBKEY, logger, args.store, max_workers=args.workers)
+    grid = dict(args.param)
+    print(f"{'params':<48} {'seed':>5} {'iters':>6} {'wall s':>8} {'max|psi|':>10} {'PR':>10} {'cached':>7} {'status':>7}")
+    for result in sweep.run(grid, seeds=args.seeds, iterations=args.iterations):
+        summary = result.summary
+        print(f"{json.dumps(result.params):<48} {result.seed:>5} {summary['iterations']:>6} "
+              f"{summary['wall_time']:>8.3f} {summary['max_abs']:>10.3e} {summary['participation_ratio']:>10.2f} "
+              f"{str(result.cached):>7} {summary['status']:>7}")
+        if summary["error"]:
+            print(f"  {summary['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,21 @@
-```python
-from setuptools import setup, find_packages
+from setuptools import setup
 
 setup(
     name="tvle",
     version="1.0.0",
-    packages=find_packages(where="src"),
-    package_dir={"": "src"},
+    packages=["src"],
     install_requires=[
         "numpy>=1.26.4",
         "matplotlib>=3.9.2",
         "scipy>=1.14.1",
-        "tqdm>=4.66.5",
         "ecdsa>=0.19.0",
         "base58>=2.1.1",
     ],
+    entry_points={
+        "console_scripts": [
+            "tvle-daemon=src.daemon:main",
+        ],
+    },
     author="Travis Jones",
     author_email="holedozer@icloud.com",  # Replace with actual email
     description="Temporal Vector Lattice Entanglement Simulation",
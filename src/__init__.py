@@ -11,10 +11,46 @@ Version: 1.0.0
 
 __version__ = "1.0.0"
 
-# Expose key modules and classes for import
-from .config import CONFIG, G, c, hbar, e, epsilon_0, m_n, v_higgs, kappa, l_p, t_p, LAMBDA, INV_LAMBDA_SQ, TEMPORAL_CONSTANT, SECP256k1_CURVE, SECP256k1_P, SECP256k1_N, SEARCH_START, SEARCH_END
-from .quantum_state import QuantumState
-from .hamiltonian import Hamiltonian
-from .key_extraction import KeyExtractor
-from .simulation import Unified6DTOE
-from .utils import validate_key
+import importlib
+
+# Public names and the submodules that define them. They are imported on first
+# access, so ``import src`` does not load scipy, ecdsa or the simulation modules.
+_EXPORTS = {
+    "config": ("CONFIG", "G", "c", "hbar", "e", "epsilon_0", "m_n", "v_higgs", "kappa", "l_p", "t_p", "LAMBDA",
+               "INV_LAMBDA_SQ", "TEMPORAL_CONSTANT", "SECP256k1_CURVE", "SECP256k1_P", "SECP256k1_N",
+               "SEARCH_START", "SEARCH_END"),
+    "quantum_state": ("QuantumState", "QuantumStateEnsemble"),
+    "integrators": ("SolveIVPIntegrator", "RK4Integrator", "DormandPrinceIntegrator", "build_integrator"),
+    "hamiltonian": ("Hamiltonian", "CompiledHamiltonian", "SparseHamiltonian", "build_hamiltonian"),
+    "key_extraction": ("KeyExtractor",),
+    "jacobian": ("SparseJacobian",),
+    "fields": ("wormhole_fields", "load_fields"),
+    "simulation": ("Unified6DTOE",),
+    "farm": ("RunFarm", "RunResult"),
+    "distributed": ("DistributedQuantumState",),
+    "sweep": ("Sweep", "SweepResult", "ResultStore"),
+    "checkpoint": ("save_checkpoint", "load_checkpoint", "TrajectoryRecorder"),
+    "profiling": ("Profiler", "RunStats"),
+    "convergence": ("ConvergenceMonitor",),
+    "live_monitor": ("LiveMonitor",),
+    "telemetry": ("MetricRing", "TelemetryWriter", "Progress", "read_telemetry"),
+    "daemon": ("SimulationDaemon", "DaemonClient"),
+    "utils": ("validate_key", "stable_hash", "config_hash"),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    """Import the submodule defining ``name`` on first access and cache the attribute."""
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,127 @@
+import json
+import os
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+
+
+def rng_state(rng):
+    """
+    Capture the state of a random source as a JSON string.
+
+    Args:
+        rng: ``np.random.Generator`` or the global ``np.random`` module
+
+    Returns:
+        str: JSON-encoded state
+    """
+    if rng is np.random:
+        name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+        return json.dumps({"legacy": [name, keys.tolist(), pos, has_gauss, cached_gaussian]})
+    return json.dumps({"bit_generator": rng.bit_generator.state})
+
+
+def set_rng_state(rng, state):
+    """Restore a state captured by ``rng_state`` into ``rng``."""
+    state = json.loads(state)
+    if "legacy" in state:
+        if rng is not np.random:
+            raise ValueError("Checkpoint holds the global np.random state but the run uses a Generator")
+        name, keys, pos, has_gauss, cached_gaussian = state["legacy"]
+        np.random.set_state((name, np.array(keys, dtype=np.uint32), pos, has_gauss, cached_gaussian))
+    else:
+        if rng is np.random:
+            raise ValueError("Checkpoint holds a Generator state but the run uses the global np.random state")
+        rng.bit_generator.state = state["bit_generator"]
+
+
+def save_checkpoint(path, quantum_state, iteration, config_digest):
+    """
+    Write a checkpoint of the evolving state to ``path`` (an ``.npz`` archive).
+
+    The file is written next to its destination and renamed into place, so an
+    interrupted write never replaces the previous checkpoint.
+
+    Args:
+        path (str): Destination file
+        quantum_state (QuantumState): State to save, including CTC history and RNG
+        iteration (int): Number of completed iterations
+        config_digest (str): Hash of the configuration the run uses
+    """
+    history = np.array(quantum_state.state_history) if quantum_state.state_history else \
+        np.empty((0, quantum_state.total_points), dtype=quantum_state.state.dtype)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            version=CHECKPOINT_VERSION,
+            state=quantum_state.state,
+            state_history=history,
+            iteration=iteration,
+            rng_state=rng_state(quantum_state.rng),
+            config_hash=config_digest,
+        )
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """
+    Read a checkpoint written by ``save_checkpoint``.
+
+    Args:
+        path (str): Checkpoint file
+
+    Returns:
+        dict: ``state``, ``state_history`` (list), ``iteration``, ``rng_state`` and ``config_hash``
+    """
+    with np.load(path) as data:
+        if int(data["version"]) != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {int(data['version'])}")
+        return {
+            "state": data["state"].copy(),
+            "state_history": [row.copy() for row in data["state_history"]],
+            "iteration": int(data["iteration"]),
+            "rng_state": str(data["rng_state"]),
+            "config_hash": str(data["config_hash"]),
+        }
+
+
+class TrajectoryRecorder:
+    """
+    Streams every ``every``-th state of a run into a preallocated ``.npy`` memmap.
+
+    Frame ``j`` holds the state after iteration ``j * every``; states are written
+    straight into the mapped file, and frames beyond ``n_frames`` are dropped. The
+    file can be opened offline with ``np.load(path, mmap_mode="r")``.
+    """
+
+    def __init__(self, path, n_points, n_frames, every=1, dtype=np.complex128, resume=False):
+        """
+        Args:
+            path (str): Output ``.npy`` file
+            n_points (int): Points per state
+            n_frames (int): Number of frames to preallocate
+            every (int): Record every k-th iteration
+            dtype: Stored dtype
+            resume (bool): Reopen an existing file instead of creating a new one
+        """
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.path = path
+        self.every = every
+        if resume and os.path.exists(path):
+            self.frames = np.lib.format.open_memmap(path, mode="r+")
+        else:
+            self.frames = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(int(n_frames), int(n_points)))
+
+    def record(self, iteration, state):
+        """Store ``state`` if ``iteration`` is a multiple of ``every`` and within range."""
+        if iteration % self.every:
+            return
+        frame = iteration // self.every
+        if frame < len(self.frames):
+            self.frames[frame] = state
+
+    def close(self):
+        """Flush the mapped file to disk."""
+        self.frames.flush()
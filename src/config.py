@@ -1,3 +1,5 @@
+import numpy as np
+
 CONFIG = {
     "grid_size": (5, 5, 5, 5, 3, 3),  # 6D grid: (x, y, z, t, w1, w2)
     "max_iterations": 10000,          # For extensive key space exploration
@@ -17,8 +19,51 @@ CONFIG = {
     "scalar_coupling": 1e-2,          # Coupling constant for scalar field
     "j4_coupling": 1.0,               # Coupling for J-4 scalar longitudinal waves
     "entanglement_factor": 0.2,       # Factor for temporal entanglement
+    "hamiltonian_backend": "compiled",  # Hamiltonian implementation: "compiled", "sparse" or "reference"
+    "operator_cache_size": 8,         # Number of sparse operator sets kept in the LRU cache
+    "integrator": "solve_ivp",        # Time integrator: "solve_ivp", "rk4", "dopri5" or "split_step"
+    "ode_method": "RK45",             # solve_ivp method used by the "solve_ivp" integrator, or "auto"
+    "implicit_method": "Radau",       # Method "auto" picks for stiff runs ("Radau" or "BDF")
+    "stiffness_threshold": 1000.0,    # Stiffness ratio above which "auto" integrates implicitly
+    "substeps": 1,                    # Fixed steps per dt for the fixed-step integrators
+    "field_cache_dir": None,          # Directory for cached V/wormhole/scalar fields (None disables)
+    "checkpoint_path": None,          # Checkpoint file written during run_simulation (None disables)
+    "checkpoint_every": 100,          # Iterations between checkpoints
+    "precision": "double",            # "double" (complex128) or "single" (complex64) state and workspaces
+    "profiling": False,               # Collect per-term and solver statistics in run_simulation
+    "convergence_window": 0,          # Iterations the steady-state criteria must hold (0 disables the monitor)
+    "convergence_fidelity": 1 - 1e-8,  # Minimum |<psi_prev|psi>| between iterations
+    "convergence_phase_tol": 1e-6,    # Maximum change of the per-iteration global phase (radians)
+    "convergence_action": "stop",     # On convergence: "stop" the run or "hold" the state without integrating
+    "telemetry_path": None,           # File receiving per-iteration metrics from run_simulation (None disables)
+    "telemetry_format": "jsonl",      # Telemetry file format: "jsonl" or "binary"
+    "telemetry_interval": 1.0,        # Seconds between telemetry batches written by the background thread
+    "progress_interval": 0.5,         # Minimum seconds between progress display redraws
+    "distributed_timeout": 60.0,      # Seconds a distributed worker or the coordinator waits at a barrier
+}
+
+# (state dtype, real dtype) for each CONFIG["precision"] mode
+PRECISION_DTYPES = {
+    "double": (np.complex128, np.float64),
+    "single": (np.complex64, np.float32),
 }
 
+# Run-control settings that do not affect the simulated trajectory; excluded from
+# configuration hashes so that, e.g., a resumed run may checkpoint elsewhere
+RUNTIME_KEYS = frozenset({
+    "max_iterations",
+    "operator_cache_size",
+    "field_cache_dir",
+    "checkpoint_path",
+    "checkpoint_every",
+    "profiling",
+    "telemetry_path",
+    "telemetry_format",
+    "telemetry_interval",
+    "progress_interval",
+    "distributed_timeout",
+})
+
 # Physical Constants
 G = 6.67430e-11          # Gravitational constant (m^3 kg^-1 s^-2)
 c = 2.99792458e8         # Speed of light (m/s)
@@ -36,9 +81,17 @@ INV_LAMBDA_SQ = 1 / (LAMBDA ** 2)  # Inverse square of Lambda for gravitational
 # Temporal constant for Maxwell's Demon (scaled by dt)
 TEMPORAL_CONSTANT = t_p / CONFIG["dt"]
 
-# Bitcoin SECP256k1 Curve Constants
-SECP256k1_CURVE = ecdsa.SECP256k1
-SECP256k1_P = SECP256k1_CURVE.curve.p()  # Field prime
-SECP256k1_N = SECP256k1_CURVE.order  # Curve order
+# Bitcoin SECP256k1 Curve Constants; the ecdsa curve object is loaded on first access
+SECP256k1_P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F  # Field prime
+SECP256k1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141  # Curve order
 SEARCH_START = 1  # Minimum valid value
 SEARCH_END = SECP256k1_N
+
+
+def __getattr__(name):
+    """Import ecdsa only when ``SECP256k1_CURVE`` is first used."""
+    if name == "SECP256k1_CURVE":
+        import ecdsa
+        globals()[name] = ecdsa.SECP256k1
+        return ecdsa.SECP256k1
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
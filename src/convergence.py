@@ -0,0 +1,105 @@
+import numpy as np
+from src.config import CONFIG
+
+CONVERGENCE_ACTIONS = ("stop", "hold")
+
+
+class ConvergenceMonitor:
+    """
+    Detects a steady state of ``run_simulation`` from cheap per-iteration signals.
+
+    After every iteration the monitor compares the new state with the previous one,
+    taken from ``QuantumState.state_history`` before it is replaced, so no extra
+    copies are kept. It tracks:
+
+    - the fidelity |<psi_prev|psi>|,
+    - the phase drift, i.e. the change of the global phase arg<psi_prev|psi>
+      advanced per iteration, and
+    - how many consecutive iterations produced the same key candidate.
+
+    The run counts as converged once the fidelity is at least ``fidelity``, the
+    phase drift at most ``phase_tol`` and the candidate unchanged for ``window``
+    consecutive iterations.
+    """
+
+    def __init__(self, window, fidelity=1 - 1e-8, phase_tol=1e-6, action="stop"):
+        """
+        Args:
+            window (int): Consecutive iterations the criteria must hold
+            fidelity (float): Minimum fidelity between consecutive states
+            phase_tol (float): Maximum change of the per-iteration global phase (radians)
+            action (str): "stop" to end the run, or "hold" to keep the converged
+                state and skip the integration for the remaining iterations
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        if action not in CONVERGENCE_ACTIONS:
+            raise ValueError(f"Unknown convergence action: {action}")
+        self.window = int(window)
+        self.min_fidelity = fidelity
+        self.phase_tol = phase_tol
+        self.action = action
+        self.reset()
+
+    @classmethod
+    def from_config(cls, config=None):
+        """
+        Build the monitor configured by config["convergence_window"].
+
+        Args:
+            config (dict, optional): Simulation configuration; defaults to the global CONFIG
+
+        Returns:
+            ConvergenceMonitor or None: None when the window is 0 (monitor disabled)
+        """
+        config = CONFIG if config is None else config
+        if not config["convergence_window"]:
+            return None
+        return cls(config["convergence_window"], config["convergence_fidelity"],
+                   config["convergence_phase_tol"], config["convergence_action"])
+
+    def reset(self):
+        """Forget all observed iterations."""
+        self.fidelity = None
+        self.phase_step = None
+        self.phase_drift = None
+        self.candidate = None
+        self.repeats = 0
+        self.streak = 0
+        self.converged = False
+
+    def update(self, previous, state, candidate):
+        """
+        Record one iteration.
+
+        Args:
+            previous (np.ndarray or None): Normalized state before the iteration,
+                or None when there is none yet
+            state (np.ndarray): Normalized state after the iteration
+            candidate (int): Key candidate extracted from ``state``
+
+        Returns:
+            bool: Whether the criteria have now held for ``window`` iterations
+        """
+        self.repeats = self.repeats + 1 if candidate == self.candidate else 1
+        self.candidate = candidate
+        if previous is None:
+            self.streak = 0
+            return False
+        overlap = complex(np.vdot(previous, state))
+        self.fidelity = abs(overlap)
+        phase_step = np.angle(overlap)
+        if self.phase_step is None:
+            self.phase_drift = None
+        else:
+            # Wrap the change of the phase step to [-pi, pi)
+            self.phase_drift = abs((phase_step - self.phase_step + np.pi) % (2 * np.pi) - np.pi)
+        self.phase_step = phase_step
+        steady = (
+            self.fidelity >= self.min_fidelity
+            and self.phase_drift is not None
+            and self.phase_drift <= self.phase_tol
+        )
+        self.streak = self.streak + 1 if steady else 0
+        self.converged = self.streak >= self.window and self.repeats >= self.window
+        return self.converged
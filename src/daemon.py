@@ -0,0 +1,304 @@
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from src.config import CONFIG
+from src.fields import fields_cache_key, load_fields
+from src.simulation import Unified6DTOE
+from src.sweep import resolve_config, state_summary
+from src.telemetry import start_log_listener
+
+
+def default_socket_path():
+    """Return the per-user socket path, in ``$XDG_RUNTIME_DIR`` when it is set."""
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"tvle-{os.getuid()}.sock")
+
+
+def parse_pubkey(value):
+    """Return a ``target_pubkey`` tuple from an integer or a hex string."""
+    return (value if isinstance(value, int) else int(value, 16), None)
+
+
+class _EventRecorder:
+    """Run recorder that streams the candidate of every ``every``-th iteration to a client."""
+
+    def __init__(self, send, sim, every):
+        self.send = send
+        self.sim = sim
+        self.every = every
+        self.start = time.perf_counter()
+
+    def record(self, iteration, state):
+        if iteration % self.every:
+            return
+        self.send({
+            "event": "iteration",
+            "iteration": iteration,
+            "key": hex(self.sim.last_candidate),
+            "elapsed": time.perf_counter() - self.start,
+        })
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON request per line and writes JSON event lines back."""
+
+    def send(self, event):
+        self.wfile.write((json.dumps(event, separators=(",", ":")) + "\n").encode())
+        self.wfile.flush()
+
+    def handle(self):
+        daemon = self.server.simulation_daemon
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                command = request.get("command", "run")
+                if command == "ping":
+                    self.send({"event": "pong", "jobs": daemon.jobs, "cached_fields": len(daemon.fields)})
+                elif command == "shutdown":
+                    self.send({"event": "bye"})
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                elif command == "run":
+                    daemon.run_job(request, self.send)
+                else:
+                    raise ValueError(f"Unknown command: {command}")
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            except Exception as e:
+                daemon.logger.error(f"Request failed: {e}")
+                try:
+                    self.send({"event": "error", "message": str(e)})
+                except OSError:
+                    return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        # Create the socket file accessible to its owner only; changing the mode after
+        # bind() would leave a window in which other users could connect
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+
+class SimulationDaemon:
+    """
+    Long-lived local process that runs ``Unified6DTOE`` jobs submitted over a Unix socket.
+
+    Short runs are dominated by interpreter startup, imports and the setup in
+    ``send_pubkey_through_wormhole``. The daemon pays those once: the simulation
+    modules stay imported, the compiled kinetic operators stay in the operator
+    cache, and the wormhole fields of the last ``max_fields`` targets and
+    configurations are kept in memory and reused by later jobs. Clients send one
+    JSON request per line (see ``DaemonClient``) and read JSON event lines back: an
+    "iteration" event with the current key candidate every ``report_every``
+    iterations, then a "result" or "error" event. Connections are served
+    concurrently, but jobs run one at a time, since each already uses the CPU fully.
+    A job stops early when its client disconnects.
+    """
+
+    def __init__(self, socket_path, logger, base_config=None, max_fields=8):
+        """
+        Args:
+            socket_path (str): Unix socket to listen on
+            logger (logging.Logger): Logger instance
+            base_config (dict, optional): Configuration job overrides apply to;
+                defaults to the global CONFIG
+            max_fields (int): Number of field sets kept in memory
+        """
+        self.socket_path = socket_path
+        self.logger = logger
+        self.base_config = CONFIG if base_config is None else base_config
+        self.max_fields = max_fields
+        self.fields = OrderedDict()
+        self.jobs = 0
+        self._job_lock = threading.Lock()
+        self._server = None
+
+    def get_fields(self, config, target_pubkey):
+        """
+        Return the wormhole fields for a configuration and target, computing them once.
+
+        Args:
+            config (dict): Resolved configuration
+            target_pubkey (tuple): Target public key, first element an integer
+
+        Returns:
+            dict: ``V``, ``wormhole_state`` and ``scalar_field`` arrays, read-only
+        """
+        key = fields_cache_key(config["grid_size"], config["dx"], target_pubkey, config)
+        if key in self.fields:
+            self.fields.move_to_end(key)
+            return self.fields[key]
+        fields = load_fields(config["grid_size"], config["dx"], target_pubkey, logger=self.logger, config=config)
+        for array in fields.values():
+            array.setflags(write=False)
+        self.fields[key] = fields
+        if len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return fields
+
+    def run_job(self, request, send):
+        """
+        Run one simulation request and stream its events through ``send``.
+
+        Args:
+            request (dict): ``target_address``, ``target_pubkey`` (integer or hex
+                string) and ``iterations``; optionally ``seed``, ``config`` overrides
+                and ``report_every``
+            send (callable): Writes one event dictionary to the client
+        """
+        config = resolve_config(request.get("config", {}), self.base_config)
+        target_pubkey = parse_pubkey(request["target_pubkey"])
+        iterations = int(request["iterations"])
+        seed = request.get("seed")
+        with self._job_lock:
+            self.jobs += 1
+            start = time.perf_counter()
+            sim = Unified6DTOE(request["target_address"], target_pubkey, self.logger,
+                               rng=np.random.default_rng(seed), fields=self.get_fields(config, target_pubkey),
+                               config=config)
+            setup_time = time.perf_counter() - start
+            send({"event": "started", "job": self.jobs, "setup_time": setup_time})
+            recorder = _EventRecorder(send, sim, max(int(request.get("report_every", 10)), 1))
+            sim.run_simulation(iterations, progress=False, recorder=recorder)
+            if sim.error is not None:
+                # The run failed or the client went away; report the cause the run recorded
+                raise RuntimeError(f"Job {self.jobs} failed: {sim.error}")
+            if not sim.running:
+                raise RuntimeError(f"Job {self.jobs} stopped at iteration {sim.stop_iteration}")
+            result = {
+                "event": "result",
+                "iterations": sim.stop_iteration,
+                "wall_time": time.perf_counter() - start,
+                "setup_time": setup_time,
+                "key_found": sim.predicted_key is not None,
+                "predicted_key": sim.predicted_key,
+                "converged_at": sim.converged_at,
+            }
+            result.update(state_summary(sim.quantum_state.state))
+        send(result)
+
+    def serve_forever(self):
+        """Listen on ``socket_path`` until a client sends the "shutdown" command."""
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Left behind by a daemon that did not shut down cleanly
+                os.unlink(self.socket_path)
+            finally:
+                probe.close()
+        self._server = _Server(self.socket_path, _RequestHandler)
+        self._server.simulation_daemon = self
+        self.logger.info(f"Simulation daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self.logger.info("Simulation daemon stopped")
+
+
+class DaemonClient:
+    """Submits jobs to a ``SimulationDaemon`` and reads back its events."""
+
+    def __init__(self, socket_path=None, timeout=None):
+        """
+        Args:
+            socket_path (str, optional): Daemon socket; defaults to ``default_socket_path()``
+            timeout (float, optional): Socket timeout in seconds
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def _request(self, request):
+        """Send one request and yield the events of its reply."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall((json.dumps(request) + "\n").encode())
+            with sock.makefile("rb") as reader:
+                for line in reader:
+                    event = json.loads(line)
+                    yield event
+                    if event["event"] in ("result", "error", "pong", "bye"):
+                        return
+
+    def submit(self, target_address, target_pubkey, iterations, seed=None, config=None, report_every=10):
+        """
+        Run a job on the daemon and yield its events as they arrive.
+
+        Args:
+            target_address (str): Target Bitcoin address
+            target_pubkey (tuple): Target public key, first element an integer
+            iterations (int): Number of iterations
+            seed (int, optional): Seed of the run's random generator
+            config (dict, optional): CONFIG overrides for this job
+            report_every (int): Iterations between "iteration" events
+
+        Yields:
+            dict: "started", "iteration" and finally "result" or "error" events
+        """
+        yield from self._request({
+            "command": "run",
+            "target_address": target_address,
+            "target_pubkey": hex(target_pubkey[0]),
+            "iterations": iterations,
+            "seed": seed,
+            "config": config or {},
+            "report_every": report_every,
+        })
+
+    def run(self, *args, **kwargs):
+        """Like ``submit``, but return only the final event."""
+        event = None
+        for event in self.submit(*args, **kwargs):
+            pass
+        return event
+
+    def ping(self):
+        """Return the daemon's "pong" event with its job and field cache counts."""
+        return next(self._request({"command": "ping"}))
+
+    def shutdown(self):
+        """Ask the daemon to stop."""
+        return next(self._request({"command": "shutdown"}))
+
+
+def main(argv=None):
+    """Console entry point ``tvle-daemon``."""
+    parser = argparse.ArgumentParser(description="Serve Unified6DTOE jobs over a Unix socket.")
+    parser.add_argument("--socket", default=default_socket_path(), help="Unix socket path")
+    parser.add_argument("--log-file", default="tvle_daemon.log", help="Log file")
+    parser.add_argument("--max-fields", type=int, default=8, help="Field sets kept in memory")
+    args = parser.parse_args(argv)
+
+    handler = logging.FileHandler(args.log_file)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    listener = start_log_listener([handler], level=logging.INFO)
+    try:
+        SimulationDaemon(args.socket, logging.getLogger("TVLE_Daemon"), max_fields=args.max_fields).serve_forever()
+    finally:
+        listener.stop()
+
+
+if __name__ == "__main__":
+    main()
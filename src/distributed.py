@@ -0,0 +1,397 @@
+import logging
+import multiprocessing
+from threading import BrokenBarrierError
+import numpy as np
+from src.config import CONFIG
+from src.hamiltonian import CompiledHamiltonian
+from src.integrators import build_integrator
+from src.quantum_state import random_phase_state
+from src.shared import SharedArray
+from src.utils import precision_dtypes
+
+# Layout of the shared control block: command, CTC history flag, dt, global norm
+_COMMAND, _HAS_HISTORY, _DT, _NORM = range(4)
+_STOP, _STEP = 0.0, 1.0
+# Integrators whose steps need no global error norm
+DISTRIBUTED_INTEGRATORS = ("rk4", "dopri5")
+
+
+def default_process_grid(grid_size, n_workers):
+    """
+    Choose how many slabs to cut along each axis for ``n_workers`` workers.
+
+    Prime factors of ``n_workers`` are assigned, largest first, to the axis with the
+    longest local extent that can still be divided, so the slabs stay as thick as
+    possible and the halo surface small.
+
+    Args:
+        grid_size (tuple): 6D grid dimensions
+        n_workers (int): Number of worker processes
+
+    Returns:
+        tuple: Number of slabs per axis, with product ``n_workers``
+    """
+    factors = []
+    n, p = int(n_workers), 2
+    while n > 1:
+        while n % p == 0:
+            factors.append(p)
+            n //= p
+        p += 1
+    process_grid = [1] * len(grid_size)
+    for factor in sorted(factors, reverse=True):
+        candidates = [axis for axis, size in enumerate(grid_size) if process_grid[axis] * factor <= size]
+        if not candidates:
+            raise ValueError(f"Cannot split grid {tuple(grid_size)} among {n_workers} workers")
+        axis = max(candidates, key=lambda a: (grid_size[a] / process_grid[a], -a))
+        process_grid[axis] *= factor
+    return tuple(process_grid)
+
+
+def slab_slices(grid_size, process_grid, coords):
+    """Return the index of the slab at process-grid position ``coords``."""
+    return tuple(
+        slice(size * c // parts, size * (c + 1) // parts)
+        for size, parts, c in zip(grid_size, process_grid, coords)
+    )
+
+
+class HaloExchange:
+    """
+    Collective operations of one worker.
+
+    Faces and partial sums are written to a double-buffered board in shared memory,
+    followed by one barrier, after which every worker reads its neighbours' faces
+    into its ghost cells and sums the partials in rank order, so all workers obtain
+    bit-identical totals. Alternating between the two buffers means a worker can
+    only overwrite a buffer after every worker has passed the barrier that follows
+    the last read of it. A barrier that is not reached by every worker within
+    ``timeout`` seconds breaks and raises ``BrokenBarrierError`` in all of them.
+    """
+
+    def __init__(self, rank, process_grid, faces, partials, barrier, timeout=None):
+        self.rank = rank
+        self.faces = faces
+        self.partials = partials
+        self.barrier = barrier
+        self.timeout = timeout
+        self.split_axes = [axis for axis, parts in enumerate(process_grid) if parts > 1]
+        coords = np.unravel_index(rank, process_grid)
+        self.neighbours = []
+        for axis in self.split_axes:
+            ranks = []
+            for offset in (-1, 1):
+                neighbour = list(coords)
+                neighbour[axis] = (neighbour[axis] + offset) % process_grid[axis]
+                ranks.append(int(np.ravel_multi_index(neighbour, process_grid)))
+            self.neighbours.append(tuple(ranks))
+        self._round = 0
+
+    def _index(self, axis, position):
+        """Padded-array index of ``position`` along ``axis`` and the interior elsewhere."""
+        index = [slice(None)] * len(self.padded_shape)
+        for split in self.split_axes:
+            index[split] = slice(1, -1)
+        index[axis] = position
+        return tuple(index)
+
+    def bind(self, padded_shape):
+        """Precompute face and ghost indices for a padded slab of ``padded_shape``."""
+        self.padded_shape = padded_shape
+        self._faces = [(self._index(axis, 1), self._index(axis, -2)) for axis in self.split_axes]
+        self._ghosts = [(self._index(axis, 0), self._index(axis, -1)) for axis in self.split_axes]
+
+    def _next_buffer(self):
+        buffer = self._round % 2
+        self._round += 1
+        return buffer
+
+    def exchange(self, padded, partial):
+        """
+        Fill the ghost cells of ``padded`` from the neighbours and sum ``partial``.
+
+        Args:
+            padded (np.ndarray): Slab with one ghost layer on each side of every split axis
+            partial (complex): This worker's contribution to the reduction
+
+        Returns:
+            complex: Sum of all workers' partials
+        """
+        buffer = self._next_buffer()
+        board = self.faces[buffer, self.rank]
+        for i, (low, high) in enumerate(self._faces):
+            face = padded[low]
+            board[i, 0, :face.size] = face.ravel()
+            board[i, 1, :face.size] = padded[high].ravel()
+        self.partials[buffer, self.rank] = partial
+        self.barrier.wait(self.timeout)
+        for i, (low, high) in enumerate(self._ghosts):
+            low_rank, high_rank = self.neighbours[i]
+            ghost = padded[low]
+            # The low ghost is the low neighbour's high face, and vice versa
+            ghost[...] = self.faces[buffer, low_rank, i, 1, :ghost.size].reshape(ghost.shape)
+            ghost = padded[high]
+            ghost[...] = self.faces[buffer, high_rank, i, 0, :ghost.size].reshape(ghost.shape)
+        return self.partials[buffer].sum()
+
+    def allreduce(self, partial):
+        """Return the sum of every worker's ``partial``."""
+        buffer = self._next_buffer()
+        self.partials[buffer, self.rank] = partial
+        self.barrier.wait(self.timeout)
+        return self.partials[buffer].sum()
+
+
+class SlabHamiltonian(CompiledHamiltonian):
+    """
+    Compiled Hamiltonian restricted to one worker's slab of the lattice.
+
+    Neighbours along split axes come from the ghost layers filled by the halo
+    exchange; along the other axes the slab spans the whole period and uses the
+    compiled periodic shifts. The wormhole overlap is reduced over all workers in
+    the same collective as the halo exchange, so each evaluation costs one barrier.
+    """
+
+    supports_batch = False
+
+    def __init__(self, slab_shape, dx, V, wormhole_state, logger, halo, precision=None, config=None):
+        super().__init__(slab_shape, dx, V, wormhole_state, logger, precision, config)
+        self.halo = halo
+        padded_shape = tuple(n + 2 if axis in halo.split_axes else n for axis, n in enumerate(self.grid_size))
+        self.padded = np.zeros(padded_shape, dtype=self.dtype)
+        halo.bind(padded_shape)
+        self._interior = tuple(slice(1, -1) if axis in halo.split_axes else slice(None)
+                               for axis in range(len(self.grid_size)))
+        self._ghost_neighbours = {}
+        for axis in halo.split_axes:
+            plus = list(self._interior)
+            minus = list(self._interior)
+            plus[axis] = slice(0, -2)
+            minus[axis] = slice(2, None)
+            self._ghost_neighbours[axis] = (self.padded[tuple(plus)], self.padded[tuple(minus)])
+        self._overlap = None
+
+    def _neighbours(self, y_grid, axis, ws):
+        if axis in self._ghost_neighbours:
+            return self._ghost_neighbours[axis]
+        return super()._neighbours(y_grid, axis, ws)
+
+    def _wormhole_overlap(self, y):
+        return self.dtype(self._overlap)
+
+    def __call__(self, t, y, state_history, temporal_entanglement, out=None, linear=True):
+        self.padded[self._interior] = y.reshape(self.grid_size)
+        self._overlap = self.halo.exchange(self.padded, self._wormhole_conj.dot(y))
+        return super().__call__(t, y, state_history, temporal_entanglement, out=out, linear=linear)
+
+
+def _worker_main(rank, process_grid, grid_size, specs, config, integrator_name, substeps,
+                 sync, barrier, logger_name):
+    """Evolve one slab on every step command until told to stop."""
+    logger = logging.getLogger(logger_name)
+    timeout = config["distributed_timeout"]
+    shared = {name: SharedArray.attach(spec, writeable=name != "V" and name != "wormhole_state")
+              for name, spec in specs.items()}
+    try:
+        control = shared["control"].array
+        slab = slab_slices(grid_size, process_grid, np.unravel_index(rank, process_grid))
+        state_grid = shared["state"].array.reshape(grid_size)
+        history_grid = shared["history"].array.reshape(grid_size)
+        V = shared["V"].array.reshape(grid_size)[slab].ravel()
+        wormhole_state = shared["wormhole_state"].array.reshape(grid_size)[slab].ravel()
+        halo = HaloExchange(rank, process_grid, shared["faces"].array, shared["partials"].array, barrier,
+                             timeout)
+        hamiltonian = SlabHamiltonian(state_grid[slab].shape, config["dx"], V, wormhole_state, logger, halo,
+                                      config=config)
+        integrator = build_integrator(integrator_name, substeps=substeps, config=config)
+        real = np.dtype(hamiltonian.real_dtype).type
+        y = np.empty(V.size, dtype=hamiltonian.dtype)
+        while True:
+            sync.wait(timeout)
+            if control[_COMMAND] == _STOP:
+                break
+            y[...] = state_grid[slab].ravel()
+            # The CTC reference is the last state of the history, normally the state the step starts from
+            history = [history_grid[slab].ravel()] if control[_HAS_HISTORY] else []
+
+            def rhs(t, state, out=None, linear=True):
+                return hamiltonian(t, state, history, None, out=out, linear=linear)
+
+            integrator.step(rhs, y, control[_DT], config["rtol"], config["atol"])
+            norm = np.sqrt(halo.allreduce(np.sum(np.square(y.view(hamiltonian.real_dtype), dtype=np.float64))).real)
+            if norm > 0:
+                y /= real(norm)
+            state_grid[slab] = y.reshape(state_grid[slab].shape)
+            history_grid[slab] = state_grid[slab]
+            if rank == 0:
+                control[_NORM] = norm
+            sync.wait(timeout)
+    except BrokenBarrierError:
+        # A peer failed or a barrier timed out; wake everyone still waiting
+        sync.abort()
+        barrier.abort()
+    except Exception:
+        logger.exception(f"Distributed worker {rank} failed")
+        sync.abort()
+        barrier.abort()
+    finally:
+        for array in shared.values():
+            array.close()
+
+
+class DistributedQuantumState:
+    """
+    Quantum state evolved by a team of local worker processes, one per slab.
+
+    The grid is cut into ``prod(process_grid)`` slabs. Each worker owns one slab plus
+    one periodic ghost layer per split axis, and evaluates the Hamiltonian and the
+    fixed-step integrator on it. Halos, the wormhole overlap and the norm are
+    exchanged through shared memory (see ``HaloExchange``). After every ``evolve``
+    the normalized slabs are gathered in ``state``, a shared array that can be read
+    by ``KeyExtractor`` like a ``QuantumState`` and may be overwritten between steps.
+
+    Only the compiled formulation with ``rk4`` or ``dopri5`` is supported: adaptive
+    ``solve_ivp`` steps would need a global error norm at every stage. Results agree
+    with the single-process compiled path up to the summation order of the reductions.
+
+    Every barrier wait is bounded by ``config["distributed_timeout"]``, including the
+    workers' wait for the next step. When a worker fails, exits or times out, ``evolve``
+    terminates the team, releases the shared memory and raises ``RuntimeError``.
+    """
+
+    def __init__(self, grid_size, V, wormhole_state, logger, n_workers, process_grid=None,
+                 rng=None, state=None, state_history=None, integrator="rk4", substeps=None, config=None):
+        """
+        Args:
+            grid_size (tuple): 6D grid dimensions
+            V (np.ndarray): Potential energy vector
+            wormhole_state (np.ndarray): Normalized wormhole state
+            logger (logging.Logger): Logger instance
+            n_workers (int): Number of worker processes
+            process_grid (tuple, optional): Slabs per axis; chosen by
+                ``default_process_grid`` when omitted
+            rng (np.random.Generator, optional): Source of random phases for the
+                initial state and zero-norm resets; defaults to ``np.random``
+            state (np.ndarray, optional): Initial state to adopt instead of random phases
+            state_history (list, optional): History of the initial state; its last
+                entry is the CTC reference of the first step
+            integrator (str): "rk4" or "dopri5"
+            substeps (int, optional): Fixed steps per dt; defaults to config["substeps"]
+            config (dict, optional): Simulation configuration; defaults to the global CONFIG
+        """
+        if integrator not in DISTRIBUTED_INTEGRATORS:
+            raise ValueError(f"The distributed mode supports {', '.join(DISTRIBUTED_INTEGRATORS)}, not {integrator}")
+        self.grid_size = tuple(grid_size)
+        self.total_points = int(np.prod(grid_size))
+        self.logger = logger
+        self.config = CONFIG if config is None else config
+        self.rng = rng if rng is not None else np.random
+        self.process_grid = tuple(process_grid) if process_grid else default_process_grid(grid_size, n_workers)
+        if int(np.prod(self.process_grid)) != n_workers or any(
+                parts > size for parts, size in zip(self.process_grid, self.grid_size)):
+            raise ValueError(f"Invalid process grid {self.process_grid} for {n_workers} workers on {self.grid_size}")
+        self.n_workers = n_workers
+        dtype = precision_dtypes(self.config["precision"])[0]
+        if state is None:
+            state = random_phase_state(self.rng, self.total_points, dtype)
+        split_axes = [axis for axis, parts in enumerate(self.process_grid) if parts > 1]
+        # Largest slab extent per axis bounds the faces of every worker
+        extents = [-(-size // parts) for size, parts in zip(self.grid_size, self.process_grid)]
+        max_face = max([int(np.prod(extents)) // extents[axis] for axis in split_axes] or [0])
+        self._shared = {
+            "state": SharedArray.create(np.asarray(state, dtype=dtype)),
+            "history": SharedArray.create(np.asarray(state_history[-1] if state_history else state, dtype=dtype)),
+            "V": SharedArray.create(V),
+            "wormhole_state": SharedArray.create(wormhole_state),
+            "faces": SharedArray.create(np.zeros((2, n_workers, len(split_axes), 2, max_face), dtype=dtype)),
+            "partials": SharedArray.create(np.zeros((2, n_workers), dtype=np.complex128)),
+            "control": SharedArray.create(np.zeros(4)),
+        }
+        self.state = self._shared["state"].array
+        self._control = self._shared["control"].array
+        self._history = self._shared["history"].array
+        self._has_history = bool(state_history)
+        self._timeout = self.config["distributed_timeout"]
+        context = multiprocessing.get_context()
+        self._sync = context.Barrier(n_workers + 1)
+        barrier = context.Barrier(n_workers)
+        specs = {name: array.spec for name, array in self._shared.items()}
+        self._workers = [
+            context.Process(
+                target=_worker_main,
+                args=(rank, self.process_grid, self.grid_size, specs, dict(self.config), integrator,
+                      substeps or self.config["substeps"], self._sync, barrier, logger.name),
+                daemon=True,
+            )
+            for rank in range(n_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        self.logger.info(f"Started {n_workers} distributed workers with process grid {self.process_grid}")
+
+    def evolve(self, dt, rtol=None, atol=None):
+        """
+        Advance the state by one time step on the workers and gather the result.
+
+        Args:
+            dt (float): Time step
+            rtol (float): Unused; the distributed integrators use fixed steps
+            atol (float): Unused; the distributed integrators use fixed steps
+        """
+        self._control[_COMMAND] = _STEP
+        self._control[_HAS_HISTORY] = self._has_history
+        self._control[_DT] = dt
+        try:
+            # A worker killed at a barrier can leave its lock held, so dead workers
+            # are detected before the barrier is used
+            if not all(worker.is_alive() for worker in self._workers):
+                raise BrokenBarrierError
+            self._sync.wait(self._timeout)
+            self._sync.wait(self._timeout)
+        except BrokenBarrierError:
+            self.logger.error("Quantum state evolution failed; stopping the distributed workers")
+            self._release(terminate=True)
+            raise RuntimeError("A distributed worker failed, exited or timed out") from None
+        if not self._control[_NORM] > 0:
+            self.logger.warning("Quantum state norm is zero; resetting")
+            self.state[...] = random_phase_state(self.rng, self.total_points, self.state.dtype)
+            self._history[...] = self.state
+        self._has_history = True
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if self._workers:
+            terminate = not all(worker.is_alive() for worker in self._workers)
+            if not terminate:
+                self._control[_COMMAND] = _STOP
+                try:
+                    self._sync.wait(self._timeout)
+                except BrokenBarrierError:
+                    terminate = True
+            self._release(terminate)
+
+    def _release(self, terminate=False):
+        """
+        Join the workers and release the shared memory.
+
+        Args:
+            terminate (bool): Terminate the workers instead of waiting for them to
+                exit; used when the team is broken
+        """
+        for worker in self._workers:
+            if terminate:
+                worker.terminate()
+            worker.join(self._timeout)
+            if worker.is_alive():
+                worker.kill()
+                worker.join()
+        self._workers = []
+        self.state = self.state.copy()
+        for array in self._shared.values():
+            array.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
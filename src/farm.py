@@ -0,0 +1,170 @@
+import logging
+import multiprocessing
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from src.config import CONFIG
+from src.fields import load_fields
+from src.shared import SharedArray
+from src.simulation import Unified6DTOE
+
+RunResult = namedtuple(
+    "RunResult",
+    ["run_index", "spawn_key", "stop_iteration", "key_found", "predicted_key", "elapsed", "cancelled", "candidate"],
+)
+RunResult.__doc__ = """
+Outcome of one farmed run, streamed back as soon as the run finishes.
+
+``spawn_key`` identifies the run's child ``SeedSequence``; ``cancelled`` is set when
+the run stopped before ``iterations`` without finding the key. ``candidate`` is the
+key candidate of the run's last iteration, or None if it did not iterate.
+"""
+
+# Per-worker state installed by the pool initializer
+_WORKER = {}
+
+
+def _init_worker(specs, cancel_event, config):
+    """Pool initializer: attach the shared setup arrays once per worker process."""
+    shared = {name: SharedArray.attach(spec) for name, spec in specs.items()}
+    _WORKER["shared"] = shared
+    _WORKER["fields"] = {name: array.array for name, array in shared.items()}
+    _WORKER["cancel"] = cancel_event
+    _WORKER["config"] = config
+
+
+def _watch_cancel(cancel_event, sim, done):
+    """Forward a farm-wide cancellation to the simulation's shutdown mechanism."""
+    while not done.is_set():
+        if cancel_event.wait(0.05):
+            sim.shutdown()
+            return
+
+
+def _run_one(run_index, seed_sequence, target_address, target_pubkey, iterations, logger_name):
+    """Execute one run inside a worker process."""
+    cancel_event = _WORKER["cancel"]
+    if cancel_event.is_set():
+        return RunResult(run_index, seed_sequence.spawn_key, 0, False, None, 0.0, True, None)
+    logger = logging.getLogger(logger_name)
+    sim = Unified6DTOE(
+        target_address,
+        target_pubkey,
+        logger,
+        rng=np.random.default_rng(seed_sequence),
+        fields=_WORKER["fields"],
+        config=_WORKER["config"],
+    )
+    done = threading.Event()
+    watcher = threading.Thread(target=_watch_cancel, args=(cancel_event, sim, done), daemon=True)
+    watcher.start()
+    start = time.perf_counter()
+    try:
+        sim.run_simulation(iterations, progress=False)
+    finally:
+        done.set()
+        watcher.join()
+    elapsed = time.perf_counter() - start
+    found = sim.predicted_key is not None
+    cancelled = not found and sim.stop_iteration < iterations
+    return RunResult(run_index, seed_sequence.spawn_key, sim.stop_iteration, found, sim.predicted_key, elapsed, cancelled,
+                     sim.last_candidate)
+
+
+class RunFarm:
+    """
+    Fans independent ``Unified6DTOE`` runs for one target out over a process pool.
+
+    The read-only setup arrays (``V``, ``wormhole_state``, ``scalar_field``) are built
+    once in the parent and published to the workers through shared memory. Each run
+    draws its phases from a generator seeded by a child of one ``SeedSequence``, so a
+    farm is reproducible from its seed, whatever the number of workers. Setting the
+    farm's cancel event, either via ``shutdown`` or because a run found the key, calls
+    ``shutdown`` on every running simulation.
+    """
+
+    def __init__(self, target_address, target_pubkey, logger, max_workers=None, seed=None, config=None, fields=None):
+        """
+        Args:
+            target_address (str): Target Bitcoin address
+            target_pubkey (tuple): Target public key, first element an integer
+            logger (logging.Logger): Logger instance
+            max_workers (int, optional): Worker processes; defaults to the CPU count
+            seed (int, optional): Entropy of the farm's ``SeedSequence``
+            config (dict, optional): Simulation configuration of every run; defaults
+                to the global CONFIG
+            fields (dict, optional): Precomputed wormhole arrays (see ``src.fields``)
+                to share instead of loading them
+        """
+        self.config = CONFIG if config is None else config
+        self.fields = fields
+        self.target_address = target_address
+        self.target_pubkey = target_pubkey
+        self.logger = logger
+        self.max_workers = max_workers
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.key_found = threading.Event()
+        self.predicted_key = None
+        self._context = multiprocessing.get_context()
+        self._cancel = self._context.Event()
+
+    def run(self, n_runs, iterations=None):
+        """
+        Execute ``n_runs`` runs and yield their results as they finish.
+
+        Args:
+            n_runs (int): Number of independent runs
+            iterations (int, optional): Iterations per run; defaults to config["max_iterations"]
+
+        Yields:
+            RunResult: One result per run, in completion order
+        """
+        iterations = iterations if iterations is not None else self.config["max_iterations"]
+        self._cancel.clear()
+        self.key_found.clear()
+        fields = self.fields
+        if fields is None:
+            fields = load_fields(self.config["grid_size"], self.config["dx"], self.target_pubkey, logger=self.logger,
+                                 config=self.config)
+        shared = {name: SharedArray.create(array) for name, array in fields.items()}
+        specs = {name: array.spec for name, array in shared.items()}
+        self.logger.info(f"Starting run farm: {n_runs} runs of {iterations} iterations")
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(specs, self._cancel, self.config),
+            ) as pool:
+                futures = [
+                    pool.submit(_run_one, index, child, self.target_address, self.target_pubkey,
+                                iterations, self.logger.name)
+                    for index, child in enumerate(self.seed_sequence.spawn(n_runs))
+                ]
+                finished = False
+                try:
+                    for future in as_completed(futures):
+                        result = future.result()
+                        if result.key_found and not self.key_found.is_set():
+                            self.predicted_key = result.predicted_key
+                            self.key_found.set()
+                            self._cancel.set()
+                            self.logger.info(f"Run {result.run_index} found the key; cancelling remaining runs")
+                        yield result
+                    finished = True
+                finally:
+                    if not finished:
+                        # Stop outstanding work if the consumer stops iterating early
+                        for future in futures:
+                            future.cancel()
+                        self._cancel.set()
+        finally:
+            for array in shared.values():
+                array.close()
+
+    def shutdown(self):
+        """Cancel all pending and running runs."""
+        self._cancel.set()
+        self.logger.info("Run farm shutdown initiated")
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import numpy as np
+from src.config import CONFIG, G, m_n, e, epsilon_0, v_higgs, INV_LAMBDA_SQ
+from src.utils import stable_hash
+
+FIELD_NAMES = ("V", "wormhole_state", "scalar_field")
+
+# Bump when the field formulas change so stale cache entries are not reused
+FIELD_CACHE_VERSION = 1
+
+
+def wormhole_fields(grid_size, dx, target_pubkey, config=None):
+    """
+    Compute the public-key-dependent arrays used by the simulation.
+
+    Coordinates are kept as open (broadcastable) 1D grids, so only the arrays that
+    are genuinely six-dimensional are materialized.
+
+    Args:
+        grid_size (tuple): 6D grid dimensions
+        dx (float): Spatial step
+        target_pubkey (tuple): Public key, first element an integer
+        config (dict, optional): Simulation configuration; defaults to the global CONFIG
+
+    Returns:
+        dict: ``V`` (potential energy vector), ``wormhole_state`` (normalized
+        distributed wormhole state) and ``scalar_field`` (public key bit pattern)
+    """
+    if not target_pubkey or not isinstance(target_pubkey[0], int):
+        raise ValueError("Invalid target public key")
+    config = CONFIG if config is None else config
+    grid_size = tuple(grid_size)
+    # Convert public key to binary string; the first 256 bits are repeated across the grid
+    pubkey_binary = bin(target_pubkey[0])[2:].zfill(256)
+    pubkey_bits = np.array([int(bit) for bit in pubkey_binary[:256]], dtype=np.float64)
+    N = int(np.prod(grid_size))
+    scalar_field = pubkey_bits[np.arange(N) % 256]
+    # Compute potential energy vector
+    ranges = [np.linspace(0, (gs-1)*dx, gs) for gs in grid_size]
+    coords = np.meshgrid(*ranges, indexing='ij', sparse=True)
+    weights = config["anisotropic_weights"]
+    r_6d_sq = sum(w * c**2 for w, c in zip(weights, coords))
+    r_6d = np.sqrt(r_6d_sq) + 1e-10  # Avoid division by zero
+    V_grav = -G * m_n / (r_6d**4) * INV_LAMBDA_SQ
+    V_em = config["em_strength"] * e**2 / (4 * np.pi * epsilon_0 * r_6d**4)
+    V_higgs = v_higgs * config["flux_coupling"] / r_6d
+    phi_6d = scalar_field.reshape(grid_size)
+    V_phi = config["scalar_coupling"] * phi_6d
+    V = (V_grav + V_em + V_higgs + V_phi).reshape(-1)
+    # Compute distributed wormhole state
+    center = [gs // 2 * dx for gs in grid_size]  # Center of the grid
+    r_6d = np.sqrt(sum((c - cent)**2 for c, cent in zip(coords, center)))
+    z_to_w1_weight = 1.0 + 2.0 * (coords[2] - center[2]) * (coords[4] - center[4])
+    sigma = dx * 5  # Spread over several grid points
+    psi_wormhole = np.exp(-r_6d**2 / (2 * sigma**2)) * z_to_w1_weight
+    psi_wormhole = psi_wormhole * phi_6d
+    wormhole_state = psi_wormhole.reshape(-1)
+    norm = np.linalg.norm(wormhole_state)
+    if norm > 0:
+        wormhole_state /= norm
+    return {"V": V, "wormhole_state": wormhole_state, "scalar_field": scalar_field}
+
+
+def fields_cache_key(grid_size, dx, target_pubkey, config=None):
+    """
+    Return the cache key for a set of wormhole fields.
+
+    The key covers everything ``wormhole_fields`` depends on: the grid, dx, the
+    couplings read from the configuration and the public key.
+    """
+    config = CONFIG if config is None else config
+    return stable_hash({
+        "version": FIELD_CACHE_VERSION,
+        "grid_size": [int(n) for n in grid_size],
+        "dx": float(dx),
+        "anisotropic_weights": [float(w) for w in config["anisotropic_weights"]],
+        "em_strength": float(config["em_strength"]),
+        "flux_coupling": float(config["flux_coupling"]),
+        "scalar_coupling": float(config["scalar_coupling"]),
+        "pubkey": str(target_pubkey[0]),
+    })
+
+
+def load_fields(grid_size, dx, target_pubkey, cache_dir=None, logger=None, config=None):
+    """
+    Return the wormhole fields, from the on-disk cache when one is configured.
+
+    Cached fields are stored as ``.npy`` files in ``<cache_dir>/<key>/`` and loaded
+    memory-mapped read-only, so processes sharing a cache share the page cache too.
+
+    Args:
+        grid_size (tuple): 6D grid dimensions
+        dx (float): Spatial step
+        target_pubkey (tuple): Public key, first element an integer
+        cache_dir (str, optional): Cache directory; defaults to config["field_cache_dir"].
+            When neither is set the fields are computed in memory.
+        logger (logging.Logger, optional): Logger for cache hits and misses
+        config (dict, optional): Simulation configuration; defaults to the global CONFIG
+
+    Returns:
+        dict: ``V``, ``wormhole_state`` and ``scalar_field`` arrays
+    """
+    config = CONFIG if config is None else config
+    cache_dir = cache_dir or config["field_cache_dir"]
+    if not cache_dir:
+        return wormhole_fields(grid_size, dx, target_pubkey, config)
+    cache_dir = os.path.expanduser(cache_dir)
+    entry = os.path.join(cache_dir, fields_cache_key(grid_size, dx, target_pubkey, config))
+    if os.path.isdir(entry):
+        if logger:
+            logger.debug(f"Loading wormhole fields from cache {entry}")
+        return {name: np.load(os.path.join(entry, f"{name}.npy"), mmap_mode="r") for name in FIELD_NAMES}
+    fields = wormhole_fields(grid_size, dx, target_pubkey, config)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write into a private directory and rename it into place so readers never see
+    # a partially written entry
+    staging = tempfile.mkdtemp(dir=cache_dir, prefix=".staging-")
+    for name in FIELD_NAMES:
+        np.save(os.path.join(staging, f"{name}.npy"), fields[name])
+    try:
+        os.rename(staging, entry)
+    except OSError:
+        # Another process populated the entry first
+        for name in FIELD_NAMES:
+            os.remove(os.path.join(staging, f"{name}.npy"))
+        os.rmdir(staging)
+    if logger:
+        logger.debug(f"Stored wormhole fields in cache {entry}")
+    return {name: np.load(os.path.join(entry, f"{name}.npy"), mmap_mode="r") for name in FIELD_NAMES}
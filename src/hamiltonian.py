@@ -1,18 +1,30 @@
+from time import perf_counter
 import numpy as np
-from src.config import CONFIG, G, m_n, e, epsilon_0, v_higgs, INV_LAMBDA_SQ, TEMPORAL_CONSTANT, hbar
+from src.config import CONFIG, G, m_n, e, epsilon_0, v_higgs, INV_LAMBDA_SQ, hbar, t_p
+from src.operators import KINETIC_SCALE, kinetic_potential_operators
+from src.utils import precision_dtypes
 
 class Hamiltonian:
     """Defines the Hamiltonian for the 6D TOE simulation."""
 
-    def __init__(self, grid_size, dx, V, wormhole_state, logger):
+    supports_batch = False
+    # Whether the backend can run with CONFIG["precision"] = "single"
+    supports_single = False
+    # Per-term ``src.profiling.Profiler``; honoured by the compiled backends only
+    profiler = None
+
+    def __init__(self, grid_size, dx, V, wormhole_state, logger, config=None):
         self.grid_size = grid_size
         self.total_points = np.prod(grid_size)
         self.dx = dx
         self.V = V
         self.wormhole_state = wormhole_state
         self.logger = logger
+        self.config = CONFIG if config is None else config
+        # Temporal constant for Maxwell's Demon (scaled by dt)
+        self.temporal_constant = t_p / self.config["dt"]
 
-    def __call__(self, t, y, state_history, temporal_entanglement):
+    def __call__(self, t, y, state_history, temporal_entanglement, out=None, linear=True):
         """
         Compute the time derivative of the quantum state.
 
@@ -21,6 +33,8 @@ class Hamiltonian:
             y (np.ndarray): Current quantum state
             state_history (list): History of quantum states for CTC feedback
             temporal_entanglement (np.ndarray): Temporal entanglement vector
+            out (np.ndarray, optional): Buffer to write the derivative into
+            linear (bool): Include the kinetic and potential terms
 
         Returns:
             np.ndarray: Derivative of the quantum state
@@ -37,31 +51,350 @@ class Hamiltonian:
             # Entanglement term: couple neighboring grid points with time-dependent coupling
             shift_plus = np.roll(y_grid, 1, axis=axis)
             shift_minus = np.roll(y_grid, -1, axis=axis)
-            coupling = CONFIG["entanglement_coupling"] * (1 + np.sin(t))
+            coupling = self.config["entanglement_coupling"] * (1 + np.sin(t))
             entanglement_term += coupling * (shift_plus - y_grid) * np.conj(shift_minus - y_grid)
         laplacian = laplacian.flatten()
         entanglement_term = entanglement_term.flatten()
         # Kinetic term: -hbar^2 / (2m) * Laplacian
-        kinetic_scale = 1e30  # Adjusted scaling for balance
-        kinetic = -hbar**2 / (2 * m_n) * kinetic_scale * laplacian
+        kinetic = -hbar**2 / (2 * m_n) * KINETIC_SCALE * laplacian
         # Potential term with time-dependent perturbation
         potential = self.V * y * (1 + 2.0 * np.sin(t))
         # Entanglement term
         entanglement = entanglement_term
         # Hamiltonian applied to state: Hψ = kinetic + potential + entanglement
-        H_psi = kinetic + potential + entanglement
+        H_psi = kinetic + potential + entanglement if linear else entanglement
         H_psi = -1j * H_psi / hbar
         # Wormhole term with time-dependent phase for quantum tunneling (3rd to 5th dimension)
         phase_factor = np.exp(1j * 2 * t)
-        wormhole_term = CONFIG["wormhole_coupling"] * phase_factor * (self.wormhole_state.conj().dot(y)) * self.wormhole_state
+        wormhole_term = self.config["wormhole_coupling"] * phase_factor * (self.wormhole_state.conj().dot(y)) * self.wormhole_state
         # CTC spin network feedback along 4th dimension (time)
         ctc_term = np.zeros_like(y, dtype=np.complex128)
         if len(state_history) > 0:
             past_state = state_history[-1]
             phase_diff = np.angle(y) - np.angle(past_state)
             # Maxwell's Demon sorting via temporal constant
-            demon_sorting = TEMPORAL_CONSTANT * np.tanh(phase_diff)
-            ctc_term = CONFIG["ctc_feedback_factor"] * np.exp(1j * demon_sorting) * np.abs(y)
+            demon_sorting = self.temporal_constant * np.tanh(phase_diff)
+            ctc_term = self.config["ctc_feedback_factor"] * np.exp(1j * demon_sorting) * np.abs(y)
         total_deriv = H_psi + wormhole_term + ctc_term
-        total_deriv = np.clip(total_deriv, -CONFIG["field_clamp_max"], CONFIG["field_clamp_max"])
+        total_deriv = np.clip(total_deriv, -self.config["field_clamp_max"], self.config["field_clamp_max"], out=out)
         return total_deriv
+
+
+class _Workspace:
+    """Preallocated buffers for one batch shape of a compiled Hamiltonian."""
+
+    def __init__(self, batch_shape, grid_size, dtype=np.complex128, real_dtype=np.float64):
+        grid_shape = tuple(batch_shape) + tuple(grid_size)
+        flat_shape = tuple(batch_shape) + (int(np.prod(grid_size)),)
+        self.two_y = np.empty(grid_shape, dtype=dtype)
+        self.shift_plus = np.empty(grid_shape, dtype=dtype)
+        self.shift_minus = np.empty(grid_shape, dtype=dtype)
+        self.work_a = np.empty(grid_shape, dtype=dtype)
+        self.work_b = np.empty(grid_shape, dtype=dtype)
+        self.laplacian = np.empty(grid_shape, dtype=dtype)
+        self.entanglement = np.empty(grid_shape, dtype=dtype)
+        self.H_psi = np.empty(flat_shape, dtype=dtype)
+        self.term = np.empty(flat_shape, dtype=dtype)
+        self.phase = np.empty(flat_shape, dtype=real_dtype)
+        self.magnitude = np.empty(flat_shape, dtype=real_dtype)
+
+
+class CompiledHamiltonian(Hamiltonian):
+    """
+    Hamiltonian precompiled for a fixed grid and potential.
+
+    The time-independent parts of the operator (kinetic prefactor, complex potential,
+    conjugated wormhole vector) are computed once, and the periodic neighbour shifts
+    are written into preallocated workspaces by slicing instead of ``np.roll``. Every
+    floating-point operation is applied in the same order as in ``Hamiltonian``, so the
+    derivative is numerically identical to the reference path.
+
+    States may also be passed as an ``(M, N)`` batch, in which case all M members are
+    evaluated in one call; each row sees its own row of the CTC reference state.
+
+    Setting ``profiler`` to a ``src.profiling.Profiler`` times each term (neighbour
+    shifts, Laplacian, entanglement, kinetic/potential, wormhole, CTC, clip) per call.
+
+    With ``precision="single"`` the operator, scalars and workspaces are complex64 /
+    float32 and states must be complex64. Potentials beyond the float32 range are
+    stored as inf; the affected terms then overflow to inf, which the clamp maps to
+    the same ±CONFIG["field_clamp_max"] as the finite double-precision values.
+    """
+
+    supports_batch = True
+    supports_single = True
+
+    def __init__(self, grid_size, dx, V, wormhole_state, logger, precision=None, config=None):
+        super().__init__(grid_size, dx, V, wormhole_state, logger, config)
+        self.grid_size = tuple(grid_size)
+        self.dtype, self.real_dtype = precision_dtypes(precision or self.config["precision"])
+        self._real = np.dtype(self.real_dtype).type
+        self._stencil_laplacian = True
+        self._dx2 = self._real(self.dx**2)
+        self._kinetic_prefactor = self._real(-hbar**2 / (2 * m_n) * KINETIC_SCALE)
+        self._inv_hbar = self._real(1.0 / hbar)
+        with np.errstate(over="ignore"):
+            self._V = np.asarray(V).astype(self.dtype)
+        overflowed = np.count_nonzero(np.isinf(self._V)) - np.count_nonzero(np.isinf(V))
+        if overflowed:
+            self.logger.warning(f"{overflowed} of {self._V.size} potential values exceed the {self.real_dtype.__name__} "
+                                f"range and are stored as inf; their derivative components are clipped")
+        self._wormhole = wormhole_state.astype(
+            self.dtype if np.iscomplexobj(wormhole_state) else self.real_dtype, copy=False
+        )
+        self._wormhole_conj = self._wormhole.conj()
+        # Slices implementing np.roll(y, +1) and np.roll(y, -1) along each grid axis,
+        # with a leading Ellipsis so they also apply to batched states
+        self._shift_slices = []
+        for axis in range(len(self.grid_size)):
+            def sl(s, axis=axis):
+                index = [slice(None)] * len(self.grid_size)
+                index[axis] = s
+                return (Ellipsis,) + tuple(index)
+            plus = ((sl(slice(1, None)), sl(slice(None, -1))), (sl(slice(0, 1)), sl(slice(-1, None))))
+            minus = ((sl(slice(None, -1)), sl(slice(1, None))), (sl(slice(-1, None)), sl(slice(0, 1))))
+            self._shift_slices.append((plus, minus))
+        # Workspaces reused across calls, keyed on the batch shape
+        self._workspaces = {}
+        # Phase of the CTC reference state, cached while it stays the same object
+        self._past_state = None
+        self._past_phase = None
+
+    def _workspace(self, batch_shape):
+        if batch_shape not in self._workspaces:
+            self._workspaces[batch_shape] = _Workspace(batch_shape, self.grid_size, self.dtype, self.real_dtype)
+        return self._workspaces[batch_shape]
+
+    def _neighbours(self, y_grid, axis, ws):
+        """Return the periodic neighbours y[i - 1] and y[i + 1] along ``axis``."""
+        plus, minus = self._shift_slices[axis]
+        return self._shift(y_grid, plus, ws.shift_plus), self._shift(y_grid, minus, ws.shift_minus)
+
+    def _wormhole_overlap(self, y):
+        """Return <wormhole|y> for a state, or one overlap per member of a batch."""
+        if y.ndim == 1:
+            return self._wormhole_conj.dot(y)
+        # Batched rank-1 projection: one matrix-vector product for all members
+        return y @ self._wormhole_conj
+
+    @staticmethod
+    def _shift(src, slices, out):
+        """Write a periodic shift of ``src`` into ``out`` using precomputed slices."""
+        (body_dst, body_src), (wrap_dst, wrap_src) = slices
+        out[body_dst] = src[body_src]
+        out[wrap_dst] = src[wrap_src]
+        return out
+
+    def _stencil_terms(self, t, y_grid, ws, with_laplacian=True):
+        """
+        Accumulate the stencil Laplacian (into ``ws.laplacian``) and return the
+        entanglement term, sharing the neighbour shifts between the two.
+        """
+        two_y = np.multiply(y_grid, 2, out=ws.two_y)
+        work_a, work_b = ws.work_a, ws.work_b
+        laplacian, entanglement_term = ws.laplacian, ws.entanglement
+        laplacian.fill(0)
+        entanglement_term.fill(0)
+        coupling = self._real(self.config["entanglement_coupling"] * (1 + np.sin(t)))
+        prof = self.profiler
+        if prof is not None:
+            # Accumulate per axis and report once per call
+            elapsed = {"shift": 0.0, "laplacian": 0.0, "entanglement": 0.0}
+            mark = perf_counter()
+        for axis in range(len(self.grid_size)):
+            shift_plus, shift_minus = self._neighbours(y_grid, axis, ws)
+            if prof is not None:
+                now = perf_counter()
+                elapsed["shift"] += now - mark
+                mark = now
+            if with_laplacian:
+                # Laplacian for kinetic term
+                np.add(shift_plus, shift_minus, out=work_a)
+                work_a -= two_y
+                work_a /= self._dx2
+                laplacian += work_a
+                if prof is not None:
+                    now = perf_counter()
+                    elapsed["laplacian"] += now - mark
+                    mark = now
+            # Entanglement term: couple neighboring grid points with time-dependent coupling
+            np.subtract(shift_plus, y_grid, out=work_a)
+            np.multiply(coupling, work_a, out=work_a)
+            np.subtract(shift_minus, y_grid, out=work_b)
+            np.conj(work_b, out=work_b)
+            work_a *= work_b
+            entanglement_term += work_a
+            if prof is not None:
+                now = perf_counter()
+                elapsed["entanglement"] += now - mark
+                mark = now
+        if prof is not None:
+            for name, seconds in elapsed.items():
+                if name != "laplacian" or with_laplacian:
+                    prof.add(name, seconds)
+        return entanglement_term
+
+    def _kinetic_potential(self, t, y, ws):
+        """Write the kinetic plus time-modulated potential terms into ``ws.H_psi``."""
+        out = np.multiply(self._kinetic_prefactor, ws.laplacian.reshape(y.shape), out=ws.H_psi)
+        term = np.multiply(self._V, y, out=ws.term)
+        self._scale(term, 1 + 2.0 * np.sin(t))
+        out += term
+        return out
+
+    def _scale(self, z, factor):
+        """
+        Multiply the complex array ``z`` in place by the real scalar ``factor``.
+
+        Scales the real and imaginary parts as reals: equal to ``z *= factor`` for
+        finite values, but an overflowed part times the zero imaginary part of the
+        factor never forms 0 * inf.
+        """
+        z.view(self.real_dtype)[...] *= self._real(factor)
+        return z
+
+    def _rotate(self, H_psi, ws):
+        """Overwrite ``H_psi`` with -i H_psi / hbar, swapping parts instead of multiplying by -1j."""
+        with np.errstate(over="ignore"):
+            self._scale(H_psi, self._inv_hbar)
+        np.negative(H_psi.real, out=ws.phase)
+        H_psi.real = H_psi.imag
+        H_psi.imag = ws.phase
+        return H_psi
+
+    def _past_angle(self, past_state):
+        if past_state is not self._past_state:
+            self._past_state = past_state
+            self._past_phase = np.angle(past_state)
+        return self._past_phase
+
+    def __call__(self, t, y, state_history, temporal_entanglement, out=None, linear=True):
+        """
+        Compute the time derivative of the quantum state without full-grid temporaries.
+
+        Args:
+            t (float): Current time
+            y (np.ndarray): Current quantum state, shape (N,) or (M, N)
+            state_history (list): History of quantum states (same shape as ``y``) for CTC feedback
+            temporal_entanglement (np.ndarray): Temporal entanglement vector
+            out (np.ndarray, optional): Buffer to write the derivative into
+            linear (bool): Include the kinetic and potential terms; split-step
+                integrators pass False and apply those terms exactly themselves
+
+        Returns:
+            np.ndarray: Derivative of the quantum state
+        """
+        prof = self.profiler
+        ws = self._workspace(y.shape[:-1])
+        y_grid = y.reshape(y.shape[:-1] + self.grid_size)
+        entanglement_term = self._stencil_terms(t, y_grid, ws, with_laplacian=linear and self._stencil_laplacian)
+        if prof is not None:
+            mark = perf_counter()
+        # Hψ = kinetic + potential + entanglement, then -i/hbar
+        if linear:
+            H_psi = self._kinetic_potential(t, y, ws)
+            H_psi += entanglement_term.reshape(y.shape)
+        else:
+            H_psi = ws.H_psi
+            H_psi[...] = entanglement_term.reshape(y.shape)
+        self._rotate(H_psi, ws)
+        if prof is not None:
+            now = perf_counter()
+            prof.add("kinetic_potential", now - mark)
+            mark = now
+        # Wormhole term with time-dependent phase for quantum tunneling
+        phase_factor = np.exp(1j * 2 * t)
+        coupling = self.dtype(self.config["wormhole_coupling"] * phase_factor)
+        term = ws.term
+        overlap = coupling * self._wormhole_overlap(y)
+        if y.ndim == 1:
+            H_psi += np.multiply(overlap, self._wormhole, out=term)
+        else:
+            H_psi += np.multiply(overlap[:, None], self._wormhole, out=term)
+        if prof is not None:
+            now = perf_counter()
+            prof.add("wormhole", now - mark)
+            mark = now
+        # CTC spin network feedback along 4th dimension (time)
+        if len(state_history) > 0:
+            phase = np.arctan2(y.imag, y.real, out=ws.phase)
+            phase -= self._past_angle(state_history[-1])
+            np.tanh(phase, out=phase)
+            np.multiply(self.temporal_constant, phase, out=phase)
+            np.multiply(1j, phase, out=term)
+            np.exp(term, out=term)
+            np.multiply(self.config["ctc_feedback_factor"], term, out=term)
+            term *= np.abs(y, out=ws.magnitude)
+            H_psi += term
+            if prof is not None:
+                now = perf_counter()
+                prof.add("ctc", now - mark)
+                mark = now
+        result = np.clip(H_psi, -self.config["field_clamp_max"], self.config["field_clamp_max"], out=out)
+        if prof is not None:
+            prof.add("clip", perf_counter() - mark)
+        return result
+
+
+class SparseHamiltonian(CompiledHamiltonian):
+    """
+    Hamiltonian applying the kinetic and potential terms as cached CSR operators.
+
+    The Laplacian and diag(V) are assembled once per (grid shape, dx, V) and shared
+    through the operator cache in ``src.operators``; only the scalar (1 + 2 sin t)
+    modulation changes between calls. The nonlinear terms use the compiled stencil.
+    Results agree with the reference path up to floating-point summation order.
+    """
+
+    def __init__(self, grid_size, dx, V, wormhole_state, logger, precision=None, config=None):
+        super().__init__(grid_size, dx, V, wormhole_state, logger, precision, config)
+        self._stencil_laplacian = False
+        self.kinetic_operator, self.potential_operator = kinetic_potential_operators(
+            self.grid_size, dx, V, dtype=self.real_dtype
+        )
+
+    def _kinetic_potential(self, t, y, ws):
+        """Write the kinetic plus time-modulated potential terms into ``ws.H_psi``."""
+        out = ws.H_psi
+        if y.ndim == 1:
+            out[:] = self.kinetic_operator @ y
+            out += self._scale(self.potential_operator @ y, 1 + 2.0 * np.sin(t))
+        else:
+            out[:] = (self.kinetic_operator @ y.T).T
+            out += self._scale(self.potential_operator @ y.T, 1 + 2.0 * np.sin(t)).T
+        return out
+
+
+HAMILTONIAN_BACKENDS = {
+    "reference": Hamiltonian,
+    "compiled": CompiledHamiltonian,
+    "sparse": SparseHamiltonian,
+}
+
+
+def build_hamiltonian(grid_size, dx, V, wormhole_state, logger, backend=None, config=None):
+    """
+    Construct the Hamiltonian for the configured backend.
+
+    Args:
+        grid_size (tuple): 6D grid dimensions
+        dx (float): Spatial step
+        V (np.ndarray): Potential energy vector
+        wormhole_state (np.ndarray): Normalized wormhole state
+        logger (logging.Logger): Logger instance
+        backend (str, optional): Backend name; defaults to config["hamiltonian_backend"]
+        config (dict, optional): Simulation configuration; defaults to the global CONFIG
+
+    Returns:
+        Hamiltonian: Callable computing the state derivative
+    """
+    config = CONFIG if config is None else config
+    backend = backend or config["hamiltonian_backend"]
+    if backend not in HAMILTONIAN_BACKENDS:
+        raise ValueError(f"Unknown Hamiltonian backend: {backend}")
+    cls = HAMILTONIAN_BACKENDS[backend]
+    if precision_dtypes(config["precision"])[0] != np.complex128:
+        if not cls.supports_single:
+            raise ValueError(f"The {backend} Hamiltonian backend only supports double precision")
+        return cls(grid_size, dx, V, wormhole_state, logger, precision=config["precision"], config=config)
+    return cls(grid_size, dx, V, wormhole_state, logger, config=config)
@@ -0,0 +1,338 @@
+import numpy as np
+import scipy.fft
+from scipy.integrate import solve_ivp
+from src.config import CONFIG, hbar, m_n
+from src.operators import KINETIC_SCALE
+from src.profiling import solve_ivp_stats
+from src.jacobian import IMPLICIT_METHODS, REAL_METHODS, SparseJacobian, real_jacobian, stiffness_ratio, select_ode_method
+
+
+class SolveIVPIntegrator:
+    """
+    Reference integrator: a fresh adaptive ``scipy.integrate.solve_ivp`` call per step.
+
+    With a ``SparseJacobian``, the implicit methods (BDF, Radau) receive its sparse
+    part as ``jac`` instead of building a dense finite-difference Jacobian. The
+    rank-1 wormhole part is left to the Newton iteration, since adding it would make
+    the factorized matrix dense. Radau does not support complex states, so complex
+    states are integrated as interleaved real and imaginary parts with the
+    equivalent real Jacobian. With ``method="auto"`` the first step measures
+    the stiffness ratio (see ``src.jacobian.stiffness_ratio``) of the state it
+    starts from and fixes ``method`` to ``explicit_method`` or ``implicit_method``
+    for the rest of the run.
+    """
+
+    def __init__(self, method="RK45", jacobian=None, explicit_method="RK45", implicit_method="Radau",
+                 stiffness_threshold=1000.0):
+        if method == "auto" and jacobian is None:
+            raise ValueError("The auto ODE method requires a Jacobian")
+        self.method = method
+        self.jacobian = jacobian
+        self.explicit_method = explicit_method
+        self.implicit_method = implicit_method
+        self.stiffness_threshold = stiffness_threshold
+        self.stiffness = None
+        self.nfev = 0
+        self.last_stats = None
+
+    def _select_method(self, fun, y, dt, state_history):
+        """Resolve ``method="auto"`` from the stiffness ratio at the current state."""
+        derivative = fun(0.0, y)
+        self.nfev += 1
+        self.stiffness = stiffness_ratio(self.jacobian, 0.0, y, state_history, derivative, dt)
+        self.method = select_ode_method(self.stiffness, self.explicit_method, self.implicit_method,
+                                        self.stiffness_threshold)
+
+    def step(self, fun, y, dt, rtol, atol, state_history=None):
+        """
+        Advance ``y`` in place from t=0 to t=dt.
+
+        Args:
+            fun (callable): Right-hand side ``fun(t, y, out=None)``
+            y (np.ndarray): State, overwritten with the result
+            dt (float): Time step
+            rtol (float): Relative tolerance for ODE solver
+            atol (float): Absolute tolerance for ODE solver
+            state_history (list, optional): CTC reference states seen by ``fun``,
+                used to linearize the CTC term of the Jacobian
+
+        Returns:
+            bool: Whether the solver succeeded
+        """
+        history = state_history if state_history is not None else []
+        if self.method == "auto":
+            self._select_method(fun, y, dt, history)
+        rhs, y0 = fun, y.copy()
+        real = np.iscomplexobj(y) and self.method in REAL_METHODS
+        if real:
+            # Integrate the interleaved real and imaginary parts as a real system
+            def rhs(t, x):
+                return np.ascontiguousarray(fun(t, np.ascontiguousarray(x).view(y.dtype))).view(x.dtype)
+            y0 = y0.view(y.real.dtype)
+        options = {}
+        if self.jacobian is not None and self.method in IMPLICIT_METHODS:
+            def jac(t, state):
+                if real:
+                    state = np.ascontiguousarray(state).view(y.dtype)
+                # The derivative marks the rows saturated by the clamp
+                matrix = self.jacobian(t, state, history, fun(t, state))
+                return real_jacobian(matrix) if real else matrix
+            options["jac"] = jac
+        sol = solve_ivp(
+            rhs,
+            [0, dt],
+            y0,
+            method=self.method,
+            rtol=rtol,
+            atol=atol,
+            **options
+        )
+        self.last_stats = solve_ivp_stats(sol, self.method)
+        if options:
+            self.last_stats["nfev"] += sol.njev
+        self.nfev += self.last_stats["nfev"]
+        if sol.success:
+            result = np.ascontiguousarray(sol.y[:, -1])
+            y[...] = result.view(y.dtype) if real else result
+        return sol.success
+
+
+class ExplicitRungeKutta:
+    """
+    Fixed-step explicit Runge-Kutta integrator with persistent stage buffers.
+
+    Subclasses provide the Butcher tableau. Stage vectors and the scratch state are
+    allocated once per state shape and dtype and reused across steps, and the state
+    is advanced in place using ``substeps`` equal steps per ``dt``. Tolerances are
+    ignored.
+    """
+
+    A = None
+    B = None
+    C = None
+
+    def __init__(self, substeps=1):
+        if substeps < 1:
+            raise ValueError("substeps must be at least 1")
+        self.substeps = int(substeps)
+        self.nfev = 0
+        self.last_stats = None
+        self._buffers = {}
+        self._A = np.asarray(self.A, dtype=np.float64)
+        self._B = np.asarray(self.B, dtype=np.float64)
+        self._C = np.asarray(self.C, dtype=np.float64)
+
+    def _workspace(self, y):
+        key = (y.shape, y.dtype)
+        if key not in self._buffers:
+            stages = np.empty((len(self._B),) + y.shape, dtype=y.dtype)
+            self._buffers[key] = (stages, np.empty_like(y))
+        return self._buffers[key]
+
+    def step(self, fun, y, dt, rtol=None, atol=None, t0=0.0, state_history=None):
+        """
+        Advance ``y`` in place from t=t0 to t=t0+dt.
+
+        Args:
+            fun (callable): Right-hand side ``fun(t, y, out=None)``
+            y (np.ndarray): State, overwritten with the result
+            dt (float): Time step
+            rtol (float): Unused; kept for interface compatibility
+            atol (float): Unused; kept for interface compatibility
+            t0 (float): Start time
+            state_history (list, optional): Unused; kept for interface compatibility
+
+        Returns:
+            bool: Always True; non-finite states are handled by the caller's normalization
+        """
+        K, y_stage = self._workspace(y)
+        n_stages = len(self._B)
+        flat_K = K.reshape(n_stages, -1)
+        flat_stage = y_stage.reshape(-1)
+        h = dt / self.substeps
+        a_h = (h * self._A).astype(y.dtype)
+        b_h = (h * self._B).astype(y.dtype)
+        for substep in range(self.substeps):
+            t = t0 + substep * h
+            for i in range(n_stages):
+                if i == 0:
+                    fun(t, y, out=K[0])
+                    continue
+                np.dot(a_h[i, :i], flat_K[:i], out=flat_stage)
+                y_stage += y
+                fun(t + self._C[i] * h, y_stage, out=K[i])
+            np.dot(b_h, flat_K, out=flat_stage)
+            y += y_stage
+        self.nfev += self.substeps * n_stages
+        self.last_stats = {"nfev": self.substeps * n_stages, "accepted": self.substeps, "rejected": 0}
+        return True
+
+
+class RK4Integrator(ExplicitRungeKutta):
+    """Classic fourth-order Runge-Kutta."""
+
+    A = [[0, 0, 0, 0],
+         [1 / 2, 0, 0, 0],
+         [0, 1 / 2, 0, 0],
+         [0, 0, 1, 0]]
+    B = [1 / 6, 1 / 3, 1 / 3, 1 / 6]
+    C = [0, 1 / 2, 1 / 2, 1]
+
+
+class DormandPrinceIntegrator(ExplicitRungeKutta):
+    """Dormand-Prince 5(4) tableau used as a fixed-step fifth-order method."""
+
+    A = [[0, 0, 0, 0, 0, 0],
+         [1 / 5, 0, 0, 0, 0, 0],
+         [3 / 40, 9 / 40, 0, 0, 0, 0],
+         [44 / 45, -56 / 15, 32 / 9, 0, 0, 0],
+         [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0, 0],
+         [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656, 0]]
+    B = [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]
+    C = [0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1]
+
+
+def laplacian_eigenvalues(grid_size, dx):
+    """
+    Eigenvalues of the periodic 6D discrete Laplacian on the FFT frequency grid.
+
+    Args:
+        grid_size (tuple): Grid dimensions
+        dx (float): Spatial step
+
+    Returns:
+        np.ndarray: Real eigenvalues with shape ``grid_size``
+    """
+    eigenvalues = np.zeros(grid_size)
+    for axis, n in enumerate(grid_size):
+        shape = [1] * len(grid_size)
+        shape[axis] = n
+        k = np.arange(n)
+        eigenvalues = eigenvalues + ((2 * np.cos(2 * np.pi * k / n) - 2) / dx**2).reshape(shape)
+    return eigenvalues
+
+
+class SplitStepIntegrator:
+    """
+    Strang split-step integrator applying the linear part of the Hamiltonian exactly.
+
+    The periodic kinetic operator is diagonal in Fourier space and the potential is
+    diagonal in position space, with the (1 + 2 sin t) modulation integrated in closed
+    form, so both are applied as pure phase factors regardless of their magnitude.
+    Each substep is P(h/2) K(h/2) N(h) K(h/2) P(h/2), where the nonlinear entanglement,
+    wormhole and CTC terms N are advanced by one explicit RK4 step of
+    ``fun(t, y, out=out, linear=False)``. The clamp at CONFIG["field_clamp_max"] then
+    only applies to the nonlinear derivative.
+    """
+
+    def __init__(self, grid_size, dx, V, substeps=1):
+        if substeps < 1:
+            raise ValueError("substeps must be at least 1")
+        self.grid_size = tuple(grid_size)
+        self.substeps = int(substeps)
+        self.nfev = 0
+        self.last_stats = None
+        kinetic_prefactor = -hbar**2 / (2 * m_n) * KINETIC_SCALE
+        self._kinetic_frequency = kinetic_prefactor * laplacian_eigenvalues(self.grid_size, dx) / hbar
+        self._potential_frequency = np.asarray(V, dtype=np.float64) / hbar
+        self._kinetic_phases = {}
+        self._nonlinear = RK4Integrator()
+        self._axes = tuple(range(-len(self.grid_size), 0))
+
+    def _half_kinetic(self, y, h):
+        """Apply exp(-i K h / (2 hbar)) in Fourier space."""
+        if h not in self._kinetic_phases:
+            self._kinetic_phases = {h: np.exp(-0.5j * h * self._kinetic_frequency)}
+        y_grid = y.reshape(y.shape[:-1] + self.grid_size)
+        spectrum = scipy.fft.fftn(y_grid, axes=self._axes, overwrite_x=False)
+        spectrum *= self._kinetic_phases[h]
+        y_grid[...] = scipy.fft.ifftn(spectrum, axes=self._axes, overwrite_x=True)
+
+    def _potential(self, y, t_start, t_end):
+        """Apply the exact propagator of V (1 + 2 sin t) over [t_start, t_end]."""
+        modulation = (t_end - t_start) - 2.0 * (np.cos(t_end) - np.cos(t_start))
+        y *= np.exp(-1j * modulation * self._potential_frequency)
+
+    def step(self, fun, y, dt, rtol=None, atol=None, state_history=None):
+        """
+        Advance ``y`` in place from t=0 to t=dt.
+
+        Args:
+            fun (callable): Right-hand side ``fun(t, y, out=None, linear=True)``
+            y (np.ndarray): State, overwritten with the result
+            dt (float): Time step
+            rtol (float): Unused; kept for interface compatibility
+            atol (float): Unused; kept for interface compatibility
+            state_history (list, optional): Unused; kept for interface compatibility
+
+        Returns:
+            bool: Always True
+        """
+        def nonlinear(t, state, out=None):
+            return fun(t, state, out=out, linear=False)
+
+        h = dt / self.substeps
+        for substep in range(self.substeps):
+            t = substep * h
+            self._potential(y, t, t + h / 2)
+            self._half_kinetic(y, h)
+            self._nonlinear.step(nonlinear, y, h, t0=t)
+            self._half_kinetic(y, h)
+            self._potential(y, t + h / 2, t + h)
+        self.last_stats = {
+            "nfev": self._nonlinear.nfev - self.nfev,
+            "accepted": self.substeps,
+            "rejected": 0,
+        }
+        self.nfev = self._nonlinear.nfev
+        return True
+
+
+INTEGRATORS = {
+    "solve_ivp": SolveIVPIntegrator,
+    "rk4": RK4Integrator,
+    "dopri5": DormandPrinceIntegrator,
+    "split_step": SplitStepIntegrator,
+}
+
+
+def build_integrator(name=None, substeps=None, method=None, hamiltonian=None, config=None):
+    """
+    Construct the configured integrator.
+
+    Args:
+        name (str, optional): Integrator name; defaults to config["integrator"]
+        substeps (int, optional): Fixed steps per dt; defaults to config["substeps"]
+        method (str, optional): solve_ivp method or "auto"; defaults to config["ode_method"]
+        hamiltonian (Hamiltonian, optional): Hamiltonian being integrated; required by
+            "split_step", which needs its grid, dx and potential, and by the "auto"
+            method. With BDF or Radau it supplies the analytic sparse Jacobian.
+        config (dict, optional): Simulation configuration; defaults to the global CONFIG
+
+    Returns:
+        object: Integrator exposing ``step(fun, y, dt, rtol, atol)`` and, after each
+        step, ``last_stats`` with its RHS evaluations and accepted/rejected steps
+    """
+    config = CONFIG if config is None else config
+    name = name or config["integrator"]
+    if name not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator: {name}")
+    if config["precision"] != "double" and name in ("solve_ivp", "split_step"):
+        # solve_ivp promotes the state to complex128, and the split-step phases of
+        # V / hbar overflow float32
+        raise ValueError(f"The {name} integrator only supports double precision; use rk4 or dopri5")
+    if name == "solve_ivp":
+        method = method or config["ode_method"]
+        jacobian = None
+        if method == "auto" or method in IMPLICIT_METHODS:
+            if hamiltonian is not None:
+                jacobian = SparseJacobian(hamiltonian)
+            elif method == "auto":
+                raise ValueError("The auto ODE method requires the Hamiltonian")
+        return SolveIVPIntegrator(method, jacobian, implicit_method=config["implicit_method"],
+                                  stiffness_threshold=config["stiffness_threshold"])
+    if name == "split_step":
+        if hamiltonian is None:
+            raise ValueError("The split_step integrator requires the Hamiltonian")
+        return SplitStepIntegrator(hamiltonian.grid_size, hamiltonian.dx, hamiltonian.V, substeps or config["substeps"])
+    return INTEGRATORS[name](substeps or config["substeps"])
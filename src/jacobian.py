@@ -0,0 +1,186 @@
+import numpy as np
+import scipy.sparse as sp
+from src.config import hbar
+from src.operators import kinetic_potential_operators, periodic_shift_matrix
+
+# solve_ivp methods that use the Jacobian
+IMPLICIT_METHODS = ("BDF", "Radau")
+# solve_ivp methods that only integrate real states
+REAL_METHODS = ("Radau", "LSODA")
+
+# d(u + i v)' = A (du + i dv) as a real 2x2 block per complex entry of A
+_REAL_PART = sp.csr_matrix(np.eye(2))
+_IMAG_PART = sp.csr_matrix(np.array([[0.0, -1.0], [1.0, 0.0]]))
+
+
+class SparseJacobian:
+    """
+    Analytic Jacobian d(dpsi/dt)/dpsi of a Hamiltonian's right-hand side.
+
+    The derivative is split into a sparse part and a rank-1 part. The sparse part
+    holds the banded 6D stencil of the kinetic term, the diagonal of the potential,
+    the linearized entanglement and CTC terms, and the rank-1 part is the wormhole
+    coupling ``u v^H`` with ``u = wormhole_coupling * exp(2 i t) * w`` and
+    ``v = w``. The right-hand side is not holomorphic: the entanglement term
+    conjugates the backward differences and the CTC term uses |psi| and the phase
+    of psi. Those terms are linearized by their complex (Wirtinger) derivative
+    d/dpsi, which is the part a complex-valued Newton iteration can use. Rows whose
+    derivative is saturated at ±config["field_clamp_max"] are zero.
+    """
+
+    def __init__(self, hamiltonian):
+        """
+        Args:
+            hamiltonian (Hamiltonian): Hamiltonian whose grid, potential, wormhole
+                state and configuration define the right-hand side
+        """
+        self.grid_size = tuple(hamiltonian.grid_size)
+        self.config = hamiltonian.config
+        self.temporal_constant = hamiltonian.temporal_constant
+        self.V = np.asarray(hamiltonian.V, dtype=np.float64)
+        self.wormhole_state = np.asarray(hamiltonian.wormhole_state, dtype=np.complex128)
+        self._kinetic = kinetic_potential_operators(self.grid_size, hamiltonian.dx, self.V)[0]
+        identity = sp.identity(self.V.size, format="csr")
+        # (S_+ - I) for every axis, where S_+ y = roll(y, 1, axis)
+        self._forward = [(periodic_shift_matrix(self.grid_size, axis, 1) - identity).tocsr()
+                         for axis in range(len(self.grid_size))]
+
+    def saturated(self, derivative):
+        """Return the mask of components clipped to ±config["field_clamp_max"]."""
+        clamp = self.config["field_clamp_max"]
+        return (derivative == clamp) | (derivative == -clamp)
+
+    def __call__(self, t, y, state_history, derivative=None):
+        """
+        Assemble the sparse part of the Jacobian at (t, y).
+
+        Args:
+            t (float): Current time
+            y (np.ndarray): Current quantum state
+            state_history (list): History of quantum states for CTC feedback
+            derivative (np.ndarray, optional): Right-hand side at (t, y); its
+                saturated components select the zero rows
+
+        Returns:
+            scipy.sparse.csr_matrix: (N, N) complex matrix
+        """
+        y = np.asarray(y, dtype=np.complex128)
+        y_grid = y.reshape(self.grid_size)
+        coupling = self.config["entanglement_coupling"] * (1 + np.sin(t))
+        # H psi = K psi + V (1 + 2 sin t) psi + sum_a c (S_+ psi - psi) conj(S_- psi - psi)
+        hamiltonian = self._kinetic + sp.diags(self.V * (1 + 2.0 * np.sin(t)), format="csr")
+        for axis, forward in enumerate(self._forward):
+            backward = np.conj(np.roll(y_grid, -1, axis=axis) - y_grid).ravel()
+            hamiltonian = hamiltonian + sp.diags(coupling * backward) @ forward
+        jacobian = (-1j / hbar) * hamiltonian
+        if len(state_history) > 0:
+            jacobian = jacobian + sp.diags(self._ctc_diagonal(y, state_history[-1]))
+        if derivative is not None:
+            active = (~self.saturated(derivative)).astype(np.float64)
+            jacobian = sp.diags(active) @ jacobian
+        return jacobian.tocsr()
+
+    def _ctc_diagonal(self, y, past_state):
+        """
+        Wirtinger derivative of F exp(i D) |psi| with D = T tanh(arg psi - arg psi_past).
+
+        d|psi|/dpsi = |psi| / (2 psi) and d(arg psi)/dpsi = 1 / (2 i psi), so the
+        derivative is F exp(i D) |psi| / (2 psi) (1 + T sech^2(arg psi - arg psi_past)).
+        """
+        phase_diff = np.angle(y) - np.angle(past_state)
+        demon_sorting = self.temporal_constant * np.tanh(phase_diff)
+        magnitude = np.abs(y)
+        ratio = np.divide(magnitude, 2 * y, out=np.zeros_like(y), where=magnitude > 0)
+        sech_sq = 1.0 / np.cosh(phase_diff)**2
+        return (self.config["ctc_feedback_factor"] * np.exp(1j * demon_sorting) * ratio
+                * (1 + self.temporal_constant * sech_sq))
+
+    def low_rank(self, t, derivative=None):
+        """
+        Return the rank-1 wormhole part of the Jacobian as factors (u, v), J_w = u v^H.
+
+        Args:
+            t (float): Current time
+            derivative (np.ndarray, optional): Right-hand side at (t, y); saturated
+                components of ``u`` are zero
+
+        Returns:
+            tuple: (u, v) complex vectors
+        """
+        u = self.config["wormhole_coupling"] * np.exp(1j * 2 * t) * self.wormhole_state
+        if derivative is not None:
+            u = np.where(self.saturated(derivative), 0, u)
+        return u, self.wormhole_state
+
+    def matvec(self, t, y, state_history, vector, derivative=None):
+        """Apply the full Jacobian, sparse and rank-1 parts, to ``vector``."""
+        u, v = self.low_rank(t, derivative)
+        return self(t, y, state_history, derivative) @ vector + u * np.vdot(v, vector)
+
+    def spectral_bound(self, t, y, state_history, derivative=None):
+        """
+        Gershgorin bound on the spectral radius of the full Jacobian.
+
+        Returns:
+            float: Largest absolute row sum of the sparse part plus |u_i| ||v||_1
+        """
+        rows = np.asarray(abs(self(t, y, state_history, derivative)).sum(axis=1)).ravel()
+        u, v = self.low_rank(t, derivative)
+        return float(np.max(rows + np.abs(u) * np.sum(np.abs(v))))
+
+
+def real_jacobian(matrix):
+    """
+    Return the real form of a complex Jacobian for interleaved real/imaginary parts.
+
+    Args:
+        matrix (scipy.sparse matrix): (N, N) complex Jacobian of a holomorphic map
+
+    Returns:
+        scipy.sparse.csr_matrix: (2N, 2N) real Jacobian of ``z.view(float)``
+    """
+    matrix = sp.csr_matrix(matrix)
+    return (sp.kron(matrix.real, _REAL_PART) + sp.kron(matrix.imag, _IMAG_PART)).tocsr()
+
+
+def stiffness_ratio(jacobian, t, y, state_history, derivative, dt):
+    """
+    Return how far the fastest mode of the Jacobian outpaces the solution.
+
+    The ratio is rho(J) / max(|f| / |y|, 1 / dt): the spectral bound of the
+    Jacobian over the rate at which the state actually changes, or over 1 / dt when
+    it changes more slowly than that. An explicit solver needs steps of order
+    1 / rho(J) to stay stable, while an implicit solver only has to resolve the
+    slower of the two rates, so a large ratio means the explicit solver is limited
+    by stability rather than accuracy.
+
+    Args:
+        jacobian (SparseJacobian): Jacobian of the right-hand side
+        t (float): Current time
+        y (np.ndarray): Current quantum state
+        state_history (list): History of quantum states for CTC feedback
+        derivative (np.ndarray): Right-hand side at (t, y)
+        dt (float): Step the solver has to cover
+
+    Returns:
+        float: Stiffness ratio
+    """
+    norm = np.linalg.norm(y)
+    rate = np.linalg.norm(derivative) / norm if norm > 0 else 0.0
+    return jacobian.spectral_bound(t, y, state_history, derivative) / max(rate, 1.0 / dt)
+
+
+def select_ode_method(ratio, explicit="RK45", implicit="Radau", threshold=1000.0):
+    """
+    Choose the solve_ivp method for a stiffness ratio.
+
+    Args:
+        ratio (float): Result of ``stiffness_ratio``
+        explicit (str): Method used up to the threshold
+        implicit (str): Method used above the threshold
+        threshold (float): Largest ratio integrated explicitly
+
+    Returns:
+        str: solve_ivp method name
+    """
+    return implicit if ratio > threshold else explicit
@@ -2,16 +2,143 @@ import numpy as np
 from src.config import CONFIG, SEARCH_START, SEARCH_END
 from src.utils import validate_key
 
+KEY_BITS = 256
+
+
 class KeyExtractor:
     """Extracts Bitcoin private keys from the quantum state."""
 
+    @staticmethod
+    def combined_signal(states, grid_size, config=None):
+        """
+        Combine magnitude, phase, demon observation and scalar wave for a batch of states.
+
+        Args:
+            states (np.ndarray): Quantum states, shape (M, N)
+            grid_size (tuple): 6D grid dimensions
+            config (dict, optional): Simulation configuration; defaults to the global CONFIG
+
+        Returns:
+            np.ndarray: Complex combined signal, shape (M, N)
+        """
+        config = CONFIG if config is None else config
+        states = np.asarray(states)
+        n_members = states.shape[0]
+        # Magnitude and phase are computed once and reused for the scalar wave
+        state_magnitude = np.abs(states)
+        state_phase = np.angle(states)
+        # Project state along 6th dimension (w2, index 5) for demon observer
+        state_6d = states.reshape((n_members,) + tuple(grid_size))
+        demon_observation = np.sum(state_6d, axis=(1, 2, 3, 4, 5))  # Shape (M, n_w2)
+        # J-4 scalar longitudinal wave modulation along 6th dimension
+        scalar_wave = np.sin(state_phase)
+        scalar_wave *= config["j4_coupling"]
+        scalar_wave *= 0.1
+        # Combine magnitude, phase, demon observation, and scalar wave. The demon
+        # observation repeats with the w2 index, which is the fastest-varying axis, so
+        # it broadcasts over the grid instead of being tiled to full size.
+        combined = state_phase
+        combined /= np.pi
+        combined *= 0.5
+        combined += state_magnitude
+        combined = combined.reshape(state_6d.shape) + 0.1 * demon_observation[:, None, None, None, None, None, :]
+        combined = combined.reshape(states.shape)
+        combined += scalar_wave
+        return combined
+
+    @staticmethod
+    def upper_half_bits(combined, n_bits=KEY_BITS):
+        """
+        Return, for the first ``n_bits`` points, whether they rank in the upper half.
+
+        Equivalent to sorting each row and setting the bits of the upper half, with
+        ties at the median broken by position (lower index ranks lower) and NaN ranked
+        last, but uses ``np.partition`` to find the median instead of a full sort.
+
+        Args:
+            combined (np.ndarray): Combined signal, shape (M, N)
+            n_bits (int): Number of leading points to classify
+
+        Returns:
+            np.ndarray: uint8 bits, shape (M, n_bits)
+        """
+        n_members, total_points = combined.shape
+        half = total_points // 2
+        bits = np.zeros((n_members, n_bits), dtype=np.uint8)
+        head = combined[:, :n_bits]
+        with np.errstate(invalid="ignore"):
+            for m in range(n_members):
+                row = combined[m]
+                threshold = np.partition(row, half)[half]
+                if np.isnan(threshold):
+                    # More than half the row is NaN: rank explicitly
+                    ranks = np.empty(total_points, dtype=np.intp)
+                    ranks[np.argsort(row, kind="stable")] = np.arange(total_points)
+                    bits[m] = ranks[:n_bits] >= half
+                    continue
+                below = np.count_nonzero(row < threshold)
+                ties = np.flatnonzero(head[m] == threshold)
+                bits[m] = (head[m] > threshold) | np.isnan(head[m])
+                if ties.size:
+                    # Ties take consecutive ranks from ``below`` in index order; ties
+                    # outside the head still occupy ranks before later head ties
+                    tie_rank = below + np.searchsorted(np.flatnonzero(row == threshold), ties)
+                    bits[m, ties] = tie_rank >= half
+        return bits
+
+    @staticmethod
+    def pack_bits(bits):
+        """
+        Pack 256 key bits (most significant first) into a key candidate.
+
+        The original shift loop accumulated into a NumPy int64, so only the low 64 bits
+        survived, as a signed value. That behaviour is kept so candidates stay identical.
+
+        Args:
+            bits (np.ndarray): Bits, shape (256,)
+
+        Returns:
+            int: Packed candidate
+        """
+        packed = np.packbits(bits[:KEY_BITS].astype(np.uint8, copy=False))
+        return int.from_bytes(packed[-8:].tobytes(), "big", signed=True)
+
+    @staticmethod
+    def candidates(states, grid_size, rng=None, config=None):
+        """
+        Compute key candidates for a batch of states without validating them.
+
+        Args:
+            states (np.ndarray): Quantum states, shape (M, N)
+            grid_size (tuple): 6D grid dimensions
+            rng (np.random.Generator or list, optional): Source for the zero-key
+                fallback, or one source per state; defaults to the global ``np.random`` state
+            config (dict, optional): Simulation configuration; defaults to the global CONFIG
+
+        Returns:
+            list: M candidate integers within [SEARCH_START, SEARCH_END]
+        """
+        rngs = rng if isinstance(rng, (list, tuple)) else [rng if rng is not None else np.random] * len(states)
+        combined = KeyExtractor.combined_signal(states, grid_size, config)
+        keys = []
+        for bits, rng in zip(KeyExtractor.upper_half_bits(combined), rngs):
+            key_int = KeyExtractor.pack_bits(bits)
+            # Ensure key_int is within SECP256k1 valid range (1 to n)
+            if key_int == 0:
+                bits = np.zeros(KEY_BITS, dtype=np.uint8)
+                bits[rng.choice(KEY_BITS, KEY_BITS // 2, replace=False)] = 1
+                key_int = KeyExtractor.pack_bits(bits)
+            keys.append(max(SEARCH_START, min(SEARCH_END, key_int)))
+        return keys
+
     @staticmethod
     def extract(state, target_address, total_points, key_prediction_history):
         """
         Extract a private key from the quantum state.
 
         Args:
-            state (QuantumState): The quantum state object
+            state (QuantumState): The quantum state object; its ``config``, when
+                present, is used for the extraction couplings
             target_address (str): Target Bitcoin address
             total_points (int): Total number of lattice points
             key_prediction_history (list): History of predicted keys
@@ -19,35 +146,34 @@ class KeyExtractor:
         Returns:
             tuple: (int, bool, str) - (key integer, success flag, WIF key if successful)
         """
-        # Use magnitude and phase to generate bits
-        state_magnitude = state.get_magnitude()
-        state_phase = state.get_phase()
-        # Project state along 6th dimension (w2, index 5) for demon observer
-        state_6d = state.reshape_to_6d()
-        demon_observation = np.sum(state_6d, axis=(0, 1, 2, 3, 4))  # Sum over all but 6th dimension
-        demon_observation = demon_observation.flatten()  # Shape (3,)
-        # Expand demon observation to full grid size by repeating
-        demon_factor = np.tile(demon_observation, total_points // 3)[:total_points]
-        # J-4 scalar longitudinal wave modulation along 6th dimension
-        scalar_wave = CONFIG["j4_coupling"] * np.sin(state_phase)
-        # Combine magnitude, phase, demon observation, and scalar wave
-        combined = state_magnitude + 0.5 * (state_phase / np.pi) + 0.1 * demon_factor + 0.1 * scalar_wave
-        # Sort combined values and split at the median
-        indices = np.argsort(combined)
-        key_bits = np.zeros_like(combined, dtype=int)
-        key_bits[indices[total_points // 2:]] = 1
-        key_int = 0
-        for bit in key_bits[:256]:  # Extract 256 bits
-            key_int = (key_int << 1) | bit
-        # Ensure key_int is within SECP256k1 valid range (1 to n)
-        if key_int == 0:
-            key_bits = np.zeros(256, dtype=int)
-            key_bits[np.random.choice(256, 128, replace=False)] = 1
-            key_int = 0
-            for bit in key_bits:
-                key_int = (key_int << 1) | bit
-        key_int = max(SEARCH_START, min(SEARCH_END, key_int))
+        key_int = KeyExtractor.candidates(state.state[None, :], state.grid_size, state.rng,
+                                          getattr(state, "config", None))[0]
         success, wif = validate_key(key_int, target_address)
         if success:
             key_prediction_history.append(key_int)
         return key_int, success, wif
+
+    @staticmethod
+    def extract_batch(states, grid_size, target_address, key_prediction_history, rng=None, config=None):
+        """
+        Extract and validate one private key per state in a batch.
+
+        Args:
+            states (np.ndarray): Quantum states, shape (M, N)
+            grid_size (tuple): 6D grid dimensions
+            target_address (str): Target Bitcoin address
+            key_prediction_history (list): History of predicted keys
+            rng (np.random.Generator or list, optional): Source for the zero-key
+                fallback, or one source per state
+            config (dict, optional): Simulation configuration; defaults to the global CONFIG
+
+        Returns:
+            list: M tuples (key integer, success flag, WIF key if successful)
+        """
+        results = []
+        for key_int in KeyExtractor.candidates(states, grid_size, rng, config):
+            success, wif = validate_key(key_int, target_address)
+            if success:
+                key_prediction_history.append(key_int)
+            results.append((key_int, success, wif))
+        return results
@@ -0,0 +1,220 @@
+import multiprocessing
+import os
+import time
+import numpy as np
+from src.shared import SharedArray
+
+AXIS_NAMES = ("x", "y", "z", "t", "w1", "w2")
+
+# Axis of the w2 "demon observation" dimension
+DEMON_AXIS = 5
+
+# Control block layout: seqlock counter and the evolve count of the snapshot
+_SEQUENCE, _ITERATION = 0, 1
+
+
+def marginal(probability, keep):
+    """
+    Sum a 6D probability grid over every axis not in ``keep``.
+
+    Args:
+        probability (np.ndarray): |psi|^2 on the 6D grid
+        keep (tuple): Axes to keep, in increasing order
+
+    Returns:
+        np.ndarray: Marginal over the kept axes
+    """
+    return probability.sum(axis=tuple(axis for axis in range(probability.ndim) if axis not in keep))
+
+
+def projections(state, grid_size, axis_pairs):
+    """
+    Compute the low-dimensional projections shown by the live monitor.
+
+    Args:
+        state (np.ndarray): Quantum state vector
+        grid_size (tuple): 6D grid dimensions
+        axis_pairs (iterable): Pairs of axes for the 2D marginals
+
+    Returns:
+        dict: One 2D marginal of |psi|^2 per pair, keyed like "x-y", and the 1D
+        marginal of the w2 demon observation axis under "w2"
+    """
+    probability = np.abs(np.asarray(state).reshape(grid_size))**2
+    result = {}
+    for pair in axis_pairs:
+        first, second = sorted(pair)
+        result[f"{AXIS_NAMES[first]}-{AXIS_NAMES[second]}"] = marginal(probability, (first, second))
+    result[AXIS_NAMES[DEMON_AXIS]] = marginal(probability, (DEMON_AXIS,))
+    return result
+
+
+def read_snapshot(buffer, control, out, last_sequence=0):
+    """
+    Copy the published state out of the shared buffer without blocking the writer.
+
+    The writer makes the sequence counter odd while it copies and even afterwards,
+    so a copy is consistent when the counter is even and unchanged across it.
+
+    Args:
+        buffer (np.ndarray): Shared state buffer
+        control (np.ndarray): Shared control block
+        out (np.ndarray): Destination for the copy
+        last_sequence (int): Counter of the previous snapshot
+
+    Returns:
+        tuple: (sequence, iteration) of the new snapshot, or None when nothing new
+        was published or the copy overlapped a write
+    """
+    sequence = int(control[_SEQUENCE])
+    if sequence % 2 or sequence == last_sequence:
+        return None
+    iteration = int(control[_ITERATION])
+    out[...] = buffer
+    if int(control[_SEQUENCE]) != sequence:
+        return None
+    return sequence, iteration
+
+
+def _render_main(buffer_spec, control_spec, grid_size, axis_pairs, fps, stop, output):
+    """Draw the projections of new snapshots at no more than ``fps`` frames per second."""
+    import matplotlib
+    if output:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    buffer = SharedArray.attach(buffer_spec)
+    control = SharedArray.attach(control_spec)
+    try:
+        state = np.empty_like(buffer.array)
+        names = [f"{AXIS_NAMES[min(pair)]}-{AXIS_NAMES[max(pair)]}" for pair in axis_pairs]
+        figure, axes = plt.subplots(1, len(names) + 1, figsize=(4 * (len(names) + 1), 4))
+        if not output:
+            plt.ion()
+            plt.show(block=False)
+        sequence = 0
+        interval = 1.0 / fps
+        while not stop.is_set():
+            frame_start = time.monotonic()
+            snapshot = read_snapshot(buffer.array, control.array, state, sequence)
+            if snapshot is not None:
+                sequence, iteration = snapshot
+                views = projections(state, grid_size, axis_pairs)
+                for ax, name in zip(axes, names):
+                    first, second = name.split("-")
+                    ax.clear()
+                    ax.imshow(views[name].T, origin="lower", aspect="auto")
+                    ax.set_xlabel(first)
+                    ax.set_ylabel(second)
+                    ax.set_title(f"|psi|^2 over {name}")
+                demon = axes[-1]
+                demon.clear()
+                demon.bar(np.arange(grid_size[DEMON_AXIS]), views["w2"])
+                demon.set_xlabel("w2")
+                demon.set_title("Demon observation marginal")
+                figure.suptitle(f"Evolve step {iteration}")
+                if output:
+                    # Write next to the destination and rename so viewers never see a partial file
+                    root, ext = os.path.splitext(output)
+                    tmp_path = f"{root}.tmp{ext}"
+                    figure.savefig(tmp_path)
+                    os.replace(tmp_path, output)
+            if not output:
+                figure.canvas.flush_events()
+            stop.wait(max(interval - (time.monotonic() - frame_start), 0.0))
+        plt.close(figure)
+    finally:
+        buffer.close()
+        control.close()
+
+
+class LiveMonitor:
+    """
+    Non-blocking live view of a running simulation.
+
+    ``QuantumState.evolve`` calls ``publish`` after every step while the monitor is
+    attached (see ``Unified6DTOE.run_simulation``), and every ``every``-th state is
+    copied into a shared-memory buffer guarded by a seqlock. A separate renderer
+    process polls the buffer at most ``fps`` times per second. It computes the 2D
+    marginals of |psi|^2 over ``axis_pairs`` and the 1D marginal over the w2 demon
+    observation axis, and draws them to a window or, with ``output``, to an image
+    file. The solver only ever copies the state. It never takes a lock or waits for
+    the renderer, and a snapshot overwritten during a read is simply skipped. When
+    no monitor is attached, ``evolve`` does no extra work.
+    """
+
+    def __init__(self, grid_size, dtype=np.complex128, every=10, axis_pairs=((0, 1), (2, 4)), fps=2.0,
+                 output=None, render=True):
+        """
+        Args:
+            grid_size (tuple): 6D grid dimensions
+            dtype (np.dtype): State dtype
+            every (int): Publish every ``every``-th evolved state
+            axis_pairs (iterable): Axis pairs for the 2D marginals (0-5 for
+                x, y, z, t, w1, w2)
+            fps (float): Maximum frames per second of the renderer
+            output (str, optional): Image file to write frames to instead of a window
+            render (bool): Start the renderer process; without it the buffer can be
+                read with ``read_snapshot``
+        """
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.grid_size = tuple(grid_size)
+        self.every = int(every)
+        self.axis_pairs = tuple(tuple(pair) for pair in axis_pairs)
+        self.published = 0
+        self._calls = 0
+        self._buffer = SharedArray.create(np.zeros(int(np.prod(grid_size)), dtype=dtype))
+        self._control = SharedArray.create(np.zeros(2, dtype=np.int64))
+        self.buffer = self._buffer.array
+        self.control = self._control.array
+        self._process = None
+        self._stop = None
+        if render:
+            context = multiprocessing.get_context()
+            self._stop = context.Event()
+            self._process = context.Process(
+                target=_render_main,
+                args=(self._buffer.spec, self._control.spec, self.grid_size, self.axis_pairs, fps,
+                      self._stop, output),
+                daemon=True,
+            )
+            self._process.start()
+
+    def publish(self, state):
+        """
+        Offer the state after an evolve step; every ``every``-th one is copied.
+
+        Args:
+            state (np.ndarray): Current quantum state
+        """
+        self._calls += 1
+        if self._calls % self.every:
+            return
+        self.control[_SEQUENCE] += 1
+        self.buffer[...] = state
+        self.control[_ITERATION] = self._calls
+        self.control[_SEQUENCE] += 1
+        self.published += 1
+
+    def close(self):
+        """Stop the renderer and release the shared buffer."""
+        if self._process is not None:
+            self._stop.set()
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+            self._process = None
+        if self._buffer is not None:
+            self.buffer = None
+            self.control = None
+            self._buffer.close()
+            self._control.close()
+            self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
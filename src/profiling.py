@@ -0,0 +1,133 @@
+import json
+import time
+from collections import defaultdict
+
+# Number of RHS evaluations per step attempt of the explicit solve_ivp methods
+EXPLICIT_STAGES = {"RK23": 3, "RK45": 6, "DOP853": 12}
+
+
+class Profiler:
+    """Accumulates wall time and call counts per named section."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def add(self, name, seconds):
+        """Record one call of section ``name`` lasting ``seconds``."""
+        self.seconds[name] += seconds
+        self.calls[name] += 1
+
+    def to_dict(self):
+        """Return {section: {"seconds", "calls", "mean_us"}}."""
+        return {
+            name: {
+                "seconds": self.seconds[name],
+                "calls": self.calls[name],
+                "mean_us": 1e6 * self.seconds[name] / self.calls[name],
+            }
+            for name in self.seconds
+        }
+
+
+def solve_ivp_stats(sol, method):
+    """
+    Derive step statistics from a ``solve_ivp`` result.
+
+    Accepted steps are the entries of ``sol.t`` after the start point. For explicit
+    Runge-Kutta methods every attempt costs a fixed number of evaluations after the
+    two spent on the initial derivative and step-size selection, so rejected steps
+    follow from ``sol.nfev``; for other methods they are reported as None.
+
+    Args:
+        sol: Result of ``scipy.integrate.solve_ivp``
+        method (str): Solver method name
+
+    Returns:
+        dict: ``nfev``, ``accepted`` and ``rejected``
+    """
+    accepted = len(sol.t) - 1
+    rejected = None
+    if method in EXPLICIT_STAGES:
+        rejected = max((sol.nfev - 2) // EXPLICIT_STAGES[method] - accepted, 0)
+    return {"nfev": int(sol.nfev), "accepted": accepted, "rejected": rejected}
+
+
+class RunStats:
+    """
+    Opt-in per-run summary of where the evolution loop spends its time.
+
+    Holds the per-term Hamiltonian profiler, solver statistics accumulated over every
+    ``evolve``, per-iteration extraction times and the overall wall time.
+    """
+
+    def __init__(self):
+        self.hamiltonian = Profiler()
+        self.evolve_seconds = 0.0
+        self.evolves = 0
+        self.nfev = 0
+        self.accepted_steps = 0
+        self.rejected_steps = 0
+        self.rejected_unknown = False
+        self.extraction_seconds = []
+        self.iterations = 0
+        self.wall_time = 0.0
+        self._start = time.perf_counter()
+
+    def record_evolve(self, seconds, solver_stats):
+        """Record one ``evolve`` call and the integrator's statistics for it."""
+        self.evolve_seconds += seconds
+        self.evolves += 1
+        self.nfev += solver_stats["nfev"]
+        self.accepted_steps += solver_stats["accepted"]
+        if solver_stats["rejected"] is None:
+            self.rejected_unknown = True
+        else:
+            self.rejected_steps += solver_stats["rejected"]
+
+    def record_extraction(self, seconds):
+        """Record the extraction time of one iteration."""
+        self.extraction_seconds.append(seconds)
+
+    def finish(self, iterations):
+        """Stamp the number of completed iterations and the wall time."""
+        self.iterations = iterations
+        self.wall_time = time.perf_counter() - self._start
+
+    def to_dict(self):
+        """Return the summary as plain JSON-serializable data."""
+        extraction_total = sum(self.extraction_seconds)
+        return {
+            "iterations": self.iterations,
+            "wall_time": self.wall_time,
+            "solver": {
+                "evolves": self.evolves,
+                "seconds": self.evolve_seconds,
+                "nfev": self.nfev,
+                "accepted_steps": self.accepted_steps,
+                "rejected_steps": None if self.rejected_unknown else self.rejected_steps,
+                "nfev_per_evolve": self.nfev / self.evolves if self.evolves else 0.0,
+            },
+            "extraction": {
+                "seconds": extraction_total,
+                "mean_us": 1e6 * extraction_total / len(self.extraction_seconds) if self.extraction_seconds else 0.0,
+                "per_iteration": self.extraction_seconds,
+            },
+            "hamiltonian_terms": self.hamiltonian.to_dict(),
+        }
+
+    def to_json(self, path=None):
+        """
+        Serialize the summary as JSON.
+
+        Args:
+            path (str, optional): File to write the JSON to
+
+        Returns:
+            str: JSON document
+        """
+        document = json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, "w") as f:
+                f.write(document)
+        return document
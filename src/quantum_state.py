@@ -1,21 +1,63 @@
 import numpy as np
-from scipy.integrate import solve_ivp
-from src.config import CONFIG, hbar, m_n, INV_LAMBDA_SQ, TEMPORAL_CONSTANT
+from src.config import CONFIG, hbar, m_n, INV_LAMBDA_SQ
+from src.integrators import SolveIVPIntegrator
+from src.utils import precision_dtypes
+
+
+def state_norm(state):
+    """
+    Return the Euclidean norm of a state as a scalar of its real dtype.
+
+    Single-precision states are accumulated in double so that renormalizing large
+    lattices every iteration does not pick up float32 summation error.
+
+    Args:
+        state (np.ndarray): Complex state vector
+
+    Returns:
+        np.floating: Norm
+    """
+    if state.dtype == np.complex128:
+        return np.linalg.norm(state)
+    parts = state.view(state.real.dtype)
+    return state.real.dtype.type(np.sqrt(np.sum(np.square(parts, dtype=np.float64))))
+
+
+def random_phase_state(rng, total_points, dtype=np.complex128):
+    """Return a normalized state with uniformly random phases drawn from ``rng``."""
+    phases = rng.uniform(0, 2 * np.pi, total_points)
+    return (np.exp(1j * phases) / np.sqrt(total_points)).astype(dtype, copy=False)
+
 
 class QuantumState:
     """Handles the quantum state and its evolution in the 6D grid."""
 
-    def __init__(self, grid_size, logger):
+    # ``src.live_monitor.LiveMonitor`` offered the state after every evolve step
+    monitor = None
+
+    def __init__(self, grid_size, logger, rng=None, state=None, config=None):
+        """
+        Args:
+            grid_size (tuple): 6D grid dimensions
+            logger (logging.Logger): Logger instance
+            rng (np.random.Generator, optional): Source of random phases; defaults to
+                the global ``np.random`` state
+            state (np.ndarray, optional): Initial state to adopt instead of random phases
+            config (dict, optional): Simulation configuration; defaults to the global CONFIG
+        """
         self.grid_size = grid_size
         self.total_points = np.prod(grid_size)
         self.logger = logger
-        # Initialize quantum state with random phases
-        phases = np.random.uniform(0, 2 * np.pi, self.total_points)
-        self.state = np.exp(1j * phases) / np.sqrt(self.total_points)
-        self.temporal_entanglement = np.zeros(self.total_points, dtype=np.complex128)
+        self.config = CONFIG if config is None else config
+        self.rng = rng if rng is not None else np.random
+        if state is None:
+            # Initialize quantum state with random phases
+            state = random_phase_state(self.rng, self.total_points, precision_dtypes(self.config["precision"])[0])
+        self.state = state
+        self.temporal_entanglement = np.zeros(self.total_points, dtype=state.dtype)
         self.state_history = []
 
-    def evolve(self, dt, rtol, atol, hamiltonian):
+    def evolve(self, dt, rtol, atol, hamiltonian, integrator=None):
         """
         Evolve the quantum state using the Schrödinger equation.
 
@@ -23,35 +65,30 @@ class QuantumState:
             dt (float): Time step
             rtol (float): Relative tolerance for ODE solver
             atol (float): Absolute tolerance for ODE solver
-            hamiltonian (callable): Hamiltonian function for evolution
+            hamiltonian (callable): Hamiltonian function ``f(t, y, out=None, linear=True)`` for evolution
+            integrator (object, optional): Integrator from ``src.integrators``; defaults
+                to a fresh ``solve_ivp`` RK45 call
         """
-        state_flat = self.state.copy()
-        # Debug: Confirm CONFIG["entanglement_factor"]
-        self.logger.debug(f"CONFIG['entanglement_factor'] = {CONFIG['entanglement_factor']}")
-        sol = solve_ivp(
-            hamiltonian,
-            [0, dt],
-            state_flat,
-            method='RK45',
-            rtol=rtol,
-            atol=atol
-        )
-        if not sol.success:
+        if integrator is None:
+            integrator = SolveIVPIntegrator()
+        # Debug: Confirm CONFIG["entanglement_factor"]; formatted only if DEBUG is enabled
+        self.logger.debug("CONFIG['entanglement_factor'] = %s", self.config["entanglement_factor"])
+        if not integrator.step(hamiltonian, self.state, dt, rtol, atol, state_history=self.state_history):
             self.logger.error("Quantum state evolution failed")
             raise RuntimeError("ODE solver failed")
-        self.state = sol.y[:, -1]
-        norm = np.linalg.norm(self.state)
+        norm = state_norm(self.state)
         if norm > 0:
             self.state /= norm
         else:
             self.logger.warning("Quantum state norm is zero; resetting")
-            phases = np.random.uniform(0, 2 * np.pi, self.total_points)
-            self.state = np.exp(1j * phases) / np.sqrt(self.total_points)
+            self.state = random_phase_state(self.rng, self.total_points, self.state.dtype)
         self.state_history.append(self.state.copy())
         # Keep only the last state for CTC feedback
         if len(self.state_history) > 1:
             self.state_history = self.state_history[-1:]
-        self.temporal_entanglement = self.state.conj() * CONFIG["entanglement_factor"]
+        self.temporal_entanglement = self.state.conj() * self.config["entanglement_factor"]
+        if self.monitor is not None:
+            self.monitor.publish(self.state)
 
     def get_magnitude(self):
         """Return the magnitude of the quantum state."""
@@ -64,3 +101,96 @@ class QuantumState:
     def reshape_to_6d(self):
         """Reshape the state to 6D grid."""
         return self.state.reshape(self.grid_size)
+
+
+class QuantumStateEnsemble:
+    """
+    Holds M independent quantum state realizations as one (M, N) array.
+
+    With a batch-capable Hamiltonian and a fixed-step integrator all members are
+    advanced in a single batched call. Adaptive ``solve_ivp`` steps are chosen per
+    member, so in that mode members are integrated one at a time. Normalization,
+    zero-norm resets and CTC history are applied per member exactly as M separate
+    ``QuantumState`` objects would.
+    """
+
+    def __init__(self, grid_size, n_members, logger, rngs=None, config=None):
+        """
+        Args:
+            grid_size (tuple): 6D grid dimensions
+            n_members (int): Number of realizations M
+            logger (logging.Logger): Logger instance
+            rngs (list, optional): One random generator per member; defaults to the
+                global ``np.random`` state for every member
+            config (dict, optional): Simulation configuration; defaults to the global CONFIG
+        """
+        self.grid_size = grid_size
+        self.total_points = np.prod(grid_size)
+        self.n_members = n_members
+        self.logger = logger
+        self.config = CONFIG if config is None else config
+        self.rngs = list(rngs) if rngs is not None else [np.random] * n_members
+        if len(self.rngs) != n_members:
+            raise ValueError("Expected one random generator per ensemble member")
+        # Initialize each member with random phases, in member order
+        dtype = precision_dtypes(self.config["precision"])[0]
+        self.state = np.empty((n_members, self.total_points), dtype=dtype)
+        for m, rng in enumerate(self.rngs):
+            self.state[m] = random_phase_state(rng, self.total_points, dtype)
+        self.temporal_entanglement = np.zeros((n_members, self.total_points), dtype=dtype)
+        self.state_history = []
+
+    def evolve(self, dt, rtol, atol, hamiltonian, integrator=None):
+        """
+        Evolve all members using the Schrödinger equation.
+
+        Args:
+            dt (float): Time step
+            rtol (float): Relative tolerance for ODE solver
+            atol (float): Absolute tolerance for ODE solver
+            hamiltonian (Hamiltonian): Hamiltonian instance, called with the ensemble's
+                state, history and temporal entanglement
+            integrator (object, optional): Integrator from ``src.integrators``; defaults
+                to a fresh ``solve_ivp`` RK45 call per member
+        """
+        if integrator is None:
+            integrator = SolveIVPIntegrator()
+        self.logger.debug("CONFIG['entanglement_factor'] = %s", self.config["entanglement_factor"])
+        if isinstance(integrator, SolveIVPIntegrator) or not hamiltonian.supports_batch:
+            for m in range(self.n_members):
+                history = [self.state_history[-1][m]] if self.state_history else []
+                entanglement = self.temporal_entanglement[m]
+
+                def rhs(t, y, out=None, linear=True, history=history, entanglement=entanglement):
+                    return hamiltonian(t, y, history, entanglement, out=out, linear=linear)
+
+                if not integrator.step(rhs, self.state[m], dt, rtol, atol, state_history=history):
+                    self.logger.error(f"Quantum state evolution failed for member {m}")
+                    raise RuntimeError("ODE solver failed")
+        else:
+            def rhs(t, y, out=None, linear=True):
+                return hamiltonian(t, y, self.state_history, self.temporal_entanglement, out=out, linear=linear)
+
+            if not integrator.step(rhs, self.state, dt, rtol, atol, state_history=self.state_history):
+                self.logger.error("Quantum state evolution failed")
+                raise RuntimeError("ODE solver failed")
+        for m in range(self.n_members):
+            norm = state_norm(self.state[m])
+            if norm > 0:
+                self.state[m] /= norm
+            else:
+                self.logger.warning(f"Quantum state norm is zero for member {m}; resetting")
+                self.state[m] = random_phase_state(self.rngs[m], self.total_points, self.state.dtype)
+        self.state_history.append(self.state.copy())
+        # Keep only the last state for CTC feedback
+        if len(self.state_history) > 1:
+            self.state_history = self.state_history[-1:]
+        self.temporal_entanglement = self.state.conj() * self.config["entanglement_factor"]
+
+    def member(self, m):
+        """Return a ``QuantumState`` view of member ``m`` sharing the ensemble's memory."""
+        member = QuantumState(self.grid_size, self.logger, rng=self.rngs[m], state=self.state[m], config=self.config)
+        if self.state_history:
+            member.state_history = [self.state_history[-1][m]]
+        member.temporal_entanglement = self.temporal_entanglement[m]
+        return member
@@ -0,0 +1,54 @@
+import multiprocessing
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+
+
+class SharedArray:
+    """A NumPy array backed by a named ``multiprocessing.shared_memory`` block."""
+
+    def __init__(self, shm, shape, dtype, owner, creator_pid=None):
+        self.shm = shm
+        self.owner = owner
+        self.creator_pid = os.getpid() if creator_pid is None else creator_pid
+        self.array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, source):
+        """Copy ``source`` into a new shared memory block owned by this process."""
+        source = np.ascontiguousarray(source)
+        shm = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+        shared = cls(shm, source.shape, source.dtype, owner=True)
+        shared.array[...] = source
+        return shared
+
+    @classmethod
+    def attach(cls, spec, writeable=False):
+        """Attach to a block described by ``spec`` from another process, read-only by default."""
+        name, shape, dtype, creator_pid = spec
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            if os.getpid() != creator_pid and multiprocessing.parent_process() is None:
+                # Attaching registered the block with this process's own resource
+                # tracker, which would unlink it on exit; the creator owns its lifetime.
+                # The creator and its multiprocessing children share one tracker, where
+                # the registration is a no-op and unregistering would drop the creator's.
+                resource_tracker.unregister(shm._name, "shared_memory")
+        shared = cls(shm, shape, dtype, owner=False, creator_pid=creator_pid)
+        shared.array.flags.writeable = writeable
+        return shared
+
+    @property
+    def spec(self):
+        """Picklable (name, shape, dtype, creator pid) description for ``attach``."""
+        return self.shm.name, self.array.shape, self.array.dtype.str, self.creator_pid
+
+    def close(self):
+        """Release the mapping, and the block itself if this process created it."""
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -1,119 +1,348 @@
-from src.quantum_state import QuantumState
-from src.hamiltonian import Hamiltonian
+import threading
+from time import perf_counter
+import numpy as np
+from src.quantum_state import QuantumState, QuantumStateEnsemble
+from src.distributed import DistributedQuantumState
+from src.hamiltonian import build_hamiltonian
+from src.integrators import build_integrator
 from src.key_extraction import KeyExtractor
 from src.config import CONFIG
-from tqdm import tqdm
+from src.fields import load_fields
+from src.checkpoint import save_checkpoint, load_checkpoint, set_rng_state
+from src.utils import config_hash
+from src.profiling import RunStats
+from src.convergence import ConvergenceMonitor
+from src.telemetry import MetricRing, TelemetryWriter, Progress
 
 class Unified6DTOE:
     """
     A unified 6D Theory of Everything simulation for TVLE-based key prediction.
     """
 
-    def __init__(self, target_address, target_pubkey, logger):
+    def __init__(self, target_address, target_pubkey, logger, rng=None, fields=None, config=None):
+        """
+        Args:
+            target_address (str): Target Bitcoin address
+            target_pubkey (tuple): Target public key, first element an integer
+            logger (logging.Logger): Logger instance
+            rng (np.random.Generator, optional): Random generator for the initial and
+                reset phases; defaults to the global ``np.random`` state
+            fields (dict, optional): Precomputed wormhole arrays (see ``src.fields``)
+            config (dict, optional): Simulation configuration; defaults to the global CONFIG
+        """
         self.target_address = target_address
         self.target_pubkey = target_pubkey
         self.logger = logger
-        self.grid_size = CONFIG["grid_size"]
+        self.config = CONFIG if config is None else config
+        self.grid_size = self.config["grid_size"]
         self.total_points = np.prod(self.grid_size)
-        self.dx = CONFIG["dx"]
-        self.dt = CONFIG["dt"]
+        self.dx = self.config["dx"]
+        self.dt = self.config["dt"]
         self.running = True
+        self.error = None
         self.key_found = threading.Event()
         self.key_prediction_history = []
         self.predicted_key = None
-        self.quantum_state = QuantumState(self.grid_size, logger)
+        self.last_candidate = None
+        self.stop_iteration = 0
+        self.run_stats = None
+        self.converged_at = None
+        self.rng = rng
+        self.quantum_state = QuantumState(self.grid_size, logger, rng=rng, config=self.config)
+        self.ensemble = None
         self.wormhole_state = None
         self.V = None
-        self.send_pubkey_through_wormhole()
+        self.scalar_field = None
+        self.send_pubkey_through_wormhole(fields)
 
-    def send_pubkey_through_wormhole(self):
+    def send_pubkey_through_wormhole(self, fields=None):
         """
         Inject the target public key into the quantum state via a distributed wormhole.
+
+        Args:
+            fields (dict, optional): Precomputed ``V``, ``wormhole_state`` and
+                ``scalar_field`` arrays (see ``src.fields``) to adopt instead of
+                loading or recomputing them
         """
-        if not self.target_pubkey or not isinstance(self.target_pubkey[0], int):
-            raise ValueError("Invalid target public key")
-        # Convert public key to binary string (256 bits)
-        pubkey_binary = bin(self.target_pubkey[0])[2:].zfill(256)
-        pubkey_bits = [int(bit) for bit in pubkey_binary]
-        # Initialize scalar field based on public key
-        N = self.total_points
-        self.scalar_field = np.zeros(N)
-        for i in range(N):
-            self.scalar_field[i] = pubkey_bits[i % 256]  # Repeat 256-bit pattern across grid
-        # Compute potential energy vector
-        ranges = [np.linspace(0, (gs-1)*self.dx, gs) for gs in self.grid_size]
-        coords = np.meshgrid(*ranges, indexing='ij')
-        weights = CONFIG["anisotropic_weights"]
-        r_6d_sq = sum(w * c**2 for w, c in zip(weights, coords))
-        r_6d = np.sqrt(r_6d_sq) + 1e-10  # Avoid division by zero
-        V_grav = -G * m_n / (r_6d**4) * INV_LAMBDA_SQ
-        V_em = CONFIG["em_strength"] * e**2 / (4 * np.pi * epsilon_0 * r_6d**4)
-        V_higgs = v_higgs * CONFIG["flux_coupling"] / r_6d
-        phi_6d = self.scalar_field.reshape(self.grid_size)
-        V_phi = CONFIG["scalar_coupling"] * phi_6d
-        self.V = (V_grav + V_em + V_higgs + V_phi).flatten()
-        # Compute distributed wormhole state
-        center = [gs // 2 * self.dx for gs in self.grid_size]  # Center of the grid
-        r_6d = np.sqrt(sum((c - cent)**2 for c, cent in zip(coords, center)))
-        z_to_w1_weight = 1.0 + 2.0 * (coords[2] - center[2]) * (coords[4] - center[4])
-        sigma = self.dx * 5  # Spread over several grid points
-        psi_wormhole = np.exp(-r_6d**2 / (2 * sigma**2)) * z_to_w1_weight
-        for i in range(len(psi_wormhole.flat)):
-            psi_wormhole.flat[i] *= pubkey_bits[i % 256]
-        self.wormhole_state = psi_wormhole.flatten()
-        norm = np.linalg.norm(self.wormhole_state)
-        if norm > 0:
-            self.wormhole_state /= norm
+        if fields is None:
+            fields = load_fields(self.grid_size, self.dx, self.target_pubkey, logger=self.logger, config=self.config)
+        self.V = fields["V"]
+        self.wormhole_state = fields["wormhole_state"]
+        self.scalar_field = fields["scalar_field"]
         self.logger.info("Public key injected via distributed wormhole")
 
     def start(self):
         """
         Start the simulation by running it for the specified number of iterations.
         """
-        self.run_simulation(CONFIG["max_iterations"])
+        self.run_simulation(self.config["max_iterations"])
+
+    def save_checkpoint(self, path, iteration):
+        """
+        Save the quantum state, CTC history, iteration counter and RNG state.
+
+        Args:
+            path (str): Checkpoint file
+            iteration (int): Number of completed iterations
+        """
+        save_checkpoint(path, self.quantum_state, iteration, config_hash(self.config))
+        self.logger.info(f"Checkpoint written to {path} at iteration {iteration}")
+
+    def restore_checkpoint(self, path):
+        """
+        Restore the state saved by ``save_checkpoint``.
+
+        Args:
+            path (str): Checkpoint file
+
+        Returns:
+            int: Number of iterations completed before the checkpoint
+        """
+        checkpoint = load_checkpoint(path)
+        if checkpoint["config_hash"] != config_hash(self.config):
+            raise ValueError(f"Checkpoint {path} was written with a different configuration")
+        self.quantum_state.state = checkpoint["state"]
+        self.quantum_state.state_history = checkpoint["state_history"]
+        self.quantum_state.temporal_entanglement = self.quantum_state.state.conj() * self.config["entanglement_factor"]
+        set_rng_state(self.quantum_state.rng, checkpoint["rng_state"])
+        self.stop_iteration = checkpoint["iteration"]
+        self.logger.info(f"Resumed from checkpoint {path} at iteration {self.stop_iteration}")
+        return self.stop_iteration
 
-    def run_simulation(self, iterations):
+    def run_simulation(self, iterations, progress=True, resume_from=None, recorder=None, monitor=None):
         """
         Run the 6D TOE simulation for a specified number of iterations.
 
+        The number of completed iterations is recorded in ``stop_iteration`` and the
+        key candidate of the latest iteration in ``last_candidate``. When
+        config["checkpoint_path"] is set, a checkpoint is written every
+        config["checkpoint_every"] iterations. When config["profiling"] is enabled, a
+        ``RunStats`` summary of Hamiltonian terms, solver steps and extraction times
+        is left in ``run_stats``. When config["telemetry_path"] is set, the iteration,
+        elapsed time, iteration time and cumulative RHS evaluations of every iteration
+        go into a ``MetricRing`` that a ``TelemetryWriter`` thread writes out in
+        batches. When config["convergence_window"] is set, a
+        ``ConvergenceMonitor`` watches for a steady state; once it is reached, the
+        iteration is stored in ``converged_at`` and the run either stops or, with
+        config["convergence_action"] = "hold", keeps the converged state and only
+        extracts, records and checkpoints for the remaining iterations.
+
         Args:
-            iterations (int): Number of iterations to run
+            iterations (int): Total number of iterations, including resumed ones
+            progress (bool): Whether to display a progress bar
+            resume_from (str, optional): Checkpoint to resume from
+            recorder (TrajectoryRecorder, optional): Receives the state after every iteration
+            monitor (LiveMonitor, optional): Live view fed by ``QuantumState.evolve``
+                for the duration of the run
         """
+        start = self.restore_checkpoint(resume_from) if resume_from else 0
+        self.stop_iteration = start
+        self.quantum_state.monitor = monitor
+        checkpoint_path = self.config["checkpoint_path"]
+        checkpoint_every = self.config["checkpoint_every"]
         self.logger.info(f"Starting 6D TOE simulation for {iterations} iterations")
-        hamiltonian = Hamiltonian(self.grid_size, self.dx, self.V, self.wormhole_state, self.logger)
-        for i in tqdm(range(iterations), desc="Simulation Progress"):
+        hamiltonian = build_hamiltonian(self.grid_size, self.dx, self.V, self.wormhole_state, self.logger,
+                                        config=self.config)
+        integrator = build_integrator(hamiltonian=hamiltonian, config=self.config)
+        stats = RunStats() if self.config["profiling"] else None
+        self.run_stats = stats
+        hamiltonian.profiler = stats.hamiltonian if stats is not None else None
+        convergence = ConvergenceMonitor.from_config(self.config)
+        holding = False
+        self.converged_at = None
+        telemetry = None
+        if self.config["telemetry_path"]:
+            ring = MetricRing()
+            telemetry = TelemetryWriter(ring, self.config["telemetry_path"], self.config["telemetry_format"],
+                                        self.config["telemetry_interval"])
+            run_start = last = perf_counter()
+
+        def rhs(t, y, out=None, linear=True):
+            return hamiltonian(t, y, self.quantum_state.state_history, self.quantum_state.temporal_entanglement,
+                               out=out, linear=linear)
+
+        try:
+            for i in Progress(range(start, iterations), desc="Simulation Progress", disable=not progress,
+                              initial=start, total=iterations, min_interval=self.config["progress_interval"]):
+                if not self.running or self.key_found.is_set():
+                    self.logger.info("Simulation stopped at iteration %d", i)
+                    break
+                try:
+                    history = self.quantum_state.state_history
+                    previous = history[-1] if history else None
+                    if stats is not None:
+                        mark = perf_counter()
+                    if not holding:
+                        self.quantum_state.evolve(
+                            self.dt,
+                            self.config["rtol"],
+                            self.config["atol"],
+                            rhs,
+                            integrator
+                        )
+                    if stats is not None:
+                        now = perf_counter()
+                        if not holding:
+                            stats.record_evolve(now - mark, integrator.last_stats)
+                        mark = now
+                    key_int, success, wif = KeyExtractor.extract(
+                        self.quantum_state,
+                        self.target_address,
+                        self.total_points,
+                        self.key_prediction_history
+                    )
+                    if stats is not None:
+                        stats.record_extraction(perf_counter() - mark)
+                    self.last_candidate = key_int
+                    self.stop_iteration = i + 1
+                    if recorder is not None:
+                        recorder.record(i, self.quantum_state.state)
+                    if telemetry is not None:
+                        now = perf_counter()
+                        ring.record(i, now - run_start, now - last, integrator.nfev)
+                        last = now
+                    if checkpoint_path and checkpoint_every and self.stop_iteration % checkpoint_every == 0:
+                        self.save_checkpoint(checkpoint_path, self.stop_iteration)
+                    if success:
+                        self.predicted_key = wif
+                        self.key_found.set()
+                        self.logger.info(f"Simulation succeeded at iteration {i}")
+                        break
+                    if i % 10 == 0:  # Log every 10 iterations
+                        self.logger.info("Iteration %d: Predicted Key = %#x", i, key_int)
+                    if (convergence is not None and not holding
+                            and convergence.update(previous, self.quantum_state.state, key_int)):
+                        self.converged_at = self.stop_iteration
+                        self.logger.info(f"Converged at iteration {i}: fidelity {convergence.fidelity:.12f}, "
+                                         f"candidate {hex(key_int)} repeated {convergence.repeats} times")
+                        if convergence.action == "stop":
+                            break
+                        holding = True
+                except Exception as e:
+                    self.error = f"Error at iteration {i}: {e}"
+                    self.logger.error(self.error)
+                    self.running = False
+                    break
+        finally:
+            # Also on KeyboardInterrupt, so the writer thread and telemetry file are released
+            self.quantum_state.monitor = None
+            if telemetry is not None:
+                telemetry.close()
+                if ring.dropped:
+                    self.logger.warning(f"Telemetry dropped {ring.dropped} iterations; increase the writer rate")
+        if stats is not None:
+            stats.finish(self.stop_iteration - start)
+            self.logger.info(f"Run statistics: {stats.evolves} evolves, {stats.nfev} RHS evaluations, "
+                             f"{stats.wall_time:.3f} s wall time")
+        if not self.key_found.is_set():
+            self.logger.info("Simulation completed without finding the key")
+
+    def run_ensemble_simulation(self, iterations, n_members, rngs=None):
+        """
+        Run several realizations of the simulation at once as a batched ensemble.
+
+        Each member starts from its own random phases and behaves like an independent
+        ``run_simulation``; the first member to produce the target key ends the run.
+
+        Args:
+            iterations (int): Number of iterations to run
+            n_members (int): Number of realizations
+            rngs (list, optional): One random generator per member
+        """
+        self.logger.info(f"Starting 6D TOE ensemble simulation of {n_members} members for {iterations} iterations")
+        hamiltonian = build_hamiltonian(self.grid_size, self.dx, self.V, self.wormhole_state, self.logger,
+                                        config=self.config)
+        integrator = build_integrator(hamiltonian=hamiltonian, config=self.config)
+        self.ensemble = QuantumStateEnsemble(self.grid_size, n_members, self.logger, rngs, config=self.config)
+        for i in Progress(range(iterations), desc="Ensemble Progress", min_interval=self.config["progress_interval"]):
             if not self.running or self.key_found.is_set():
-                self.logger.info(f"Simulation stopped at iteration {i}")
+                self.logger.info("Simulation stopped at iteration %d", i)
                 break
             try:
-                self.quantum_state.evolve(
-                    self.dt,
-                    CONFIG["rtol"],
-                    CONFIG["atol"],
-                    lambda t, y: hamiltonian(t, y, self.quantum_state.state_history, self.quantum_state.temporal_entanglement)
-                )
-                key_int, success, wif = KeyExtractor.extract(
-                    self.quantum_state,
+                self.ensemble.evolve(self.dt, self.config["rtol"], self.config["atol"], hamiltonian, integrator)
+                results = KeyExtractor.extract_batch(
+                    self.ensemble.state,
+                    self.grid_size,
                     self.target_address,
-                    self.total_points,
-                    self.key_prediction_history
+                    self.key_prediction_history,
+                    self.ensemble.rngs,
+                    config=self.config
                 )
-                if success:
-                    self.predicted_key = wif
-                    self.key_found.set()
-                    self.logger.info(f"Simulation succeeded at iteration {i}")
+                keys = [key_int for key_int, _, _ in results]
+                for m, (key_int, success, wif) in enumerate(results):
+                    if success:
+                        self.predicted_key = wif
+                        self.key_found.set()
+                        self.logger.info(f"Simulation succeeded at iteration {i} (member {m})")
+                        break
+                if self.key_found.is_set():
                     break
                 if i % 10 == 0:  # Log every 10 iterations
-                    self.logger.info(f"Iteration {i}: Predicted Key = {hex(key_int)}")
+                    self.logger.info("Iteration %d: Predicted Keys = %s", i, [hex(k) for k in keys])
             except Exception as e:
-                self.logger.error(f"Error at iteration {i}: {e}")
+                self.error = f"Error at iteration {i}: {e}"
+                self.logger.error(self.error)
                 self.running = False
                 break
         if not self.key_found.is_set():
             self.logger.info("Simulation completed without finding the key")
 
+    def run_distributed_simulation(self, iterations, n_workers, process_grid=None, integrator="rk4"):
+        """
+        Run the simulation with the lattice split across local worker processes.
+
+        Starts from the current ``quantum_state`` and its CTC history and behaves like
+        ``run_simulation`` with a fixed-step integrator; the gathered state is copied
+        back into ``quantum_state`` when the run ends.
+
+        Args:
+            iterations (int): Number of iterations to run
+            n_workers (int): Number of worker processes
+            process_grid (tuple, optional): Slabs per axis (see ``src.distributed``)
+            integrator (str): "rk4" or "dopri5"
+        """
+        self.logger.info(f"Starting distributed 6D TOE simulation on {n_workers} workers for {iterations} iterations")
+        self.stop_iteration = 0
+        with DistributedQuantumState(self.grid_size, self.V, self.wormhole_state, self.logger, n_workers,
+                                     process_grid=process_grid, rng=self.quantum_state.rng,
+                                     state=self.quantum_state.state, state_history=self.quantum_state.state_history,
+                                     integrator=integrator, config=self.config) as state:
+            for i in Progress(range(iterations), desc="Distributed Progress",
+                              min_interval=self.config["progress_interval"]):
+                if not self.running or self.key_found.is_set():
+                    self.logger.info("Simulation stopped at iteration %d", i)
+                    break
+                try:
+                    state.evolve(self.dt)
+                    key_int, success, wif = KeyExtractor.extract(
+                        state,
+                        self.target_address,
+                        self.total_points,
+                        self.key_prediction_history
+                    )
+                    self.stop_iteration = i + 1
+                    if success:
+                        self.predicted_key = wif
+                        self.key_found.set()
+                        self.logger.info(f"Simulation succeeded at iteration {i}")
+                        break
+                    if i % 10 == 0:  # Log every 10 iterations
+                        self.logger.info("Iteration %d: Predicted Key = %#x", i, key_int)
+                except Exception as e:
+                    self.error = f"Error at iteration {i}: {e}"
+                    self.logger.error(self.error)
+                    self.running = False
+                    break
+            self.quantum_state.state = state.state.copy()
+        if self.stop_iteration:
+            self.quantum_state.state_history = [self.quantum_state.state.copy()]
+            self.quantum_state.temporal_entanglement = self.quantum_state.state.conj() * self.config["entanglement_factor"]
+        if not self.key_found.is_set():
+            self.logger.info("Simulation completed without finding the key")
+
     def shutdown(self):
         """Gracefully shut down the simulation."""
         self.running = False
         self.key_found.set()
         self.logger.info("Simulation shutdown initiated")
+
@@ -0,0 +1,322 @@
+import glob
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from src.config import CONFIG, RUNTIME_KEYS
+from src.quantum_state import state_norm
+from src.simulation import Unified6DTOE
+from src.utils import config_hash, stable_hash
+
+# Bump when the run or summary semantics change so stale store entries are not reused
+SWEEP_VERSION = 2
+
+SweepResult = namedtuple("SweepResult", ["key", "params", "seed", "summary", "cached"])
+SweepResult.__doc__ = """
+Outcome of one sweep point: the overrides and seed it ran with, its summary record
+and whether it was read from the result store instead of being run.
+"""
+
+
+def expand_grid(grid):
+    """
+    Expand a parameter grid into a list of override dictionaries.
+
+    Args:
+        grid (dict or list): Either a mapping from CONFIG key to a list of values,
+            expanded as a Cartesian product in key order, or an explicit list of
+            override dictionaries
+
+    Returns:
+        list: One dictionary of overrides per point
+    """
+    if isinstance(grid, dict):
+        names = list(grid)
+        return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    return [dict(point) for point in grid]
+
+
+def resolve_config(overrides, base=None):
+    """
+    Return a copy of ``base`` with ``overrides`` applied.
+
+    Args:
+        overrides (dict): CONFIG keys and their values for this run
+        base (dict, optional): Configuration to start from; defaults to the global CONFIG
+
+    Returns:
+        dict: New configuration; ``base`` is not modified
+    """
+    base = CONFIG if base is None else base
+    unknown = sorted(set(overrides) - set(base))
+    if unknown:
+        raise ValueError(f"Unknown configuration keys: {', '.join(unknown)}")
+    config = dict(base)
+    for name, value in overrides.items():
+        # Values read from JSON arrive as lists; keep tuple-valued settings tuples
+        config[name] = tuple(value) if isinstance(base[name], tuple) else value
+    return config
+
+
+def run_key(config, seed, iterations, target_address, target_pubkey):
+    """
+    Return the content address of a sweep run.
+
+    The key covers the trajectory-relevant configuration (``RUNTIME_KEYS`` are
+    ignored), the seed, the number of iterations and the target.
+
+    Args:
+        config (dict): Resolved configuration
+        seed (int): Seed of the run's random generator
+        iterations (int): Number of iterations
+        target_address (str): Target Bitcoin address
+        target_pubkey (tuple): Target public key, first element an integer
+
+    Returns:
+        str: Hex digest
+    """
+    return stable_hash({
+        "version": SWEEP_VERSION,
+        "config": {name: value for name, value in config.items() if name not in RUNTIME_KEYS},
+        "seed": int(seed),
+        "iterations": int(iterations),
+        "target_address": target_address,
+        "pubkey": str(target_pubkey[0]),
+    })
+
+
+def state_summary(state):
+    """
+    Summary statistics of a final quantum state.
+
+    Args:
+        state (np.ndarray): State vector
+
+    Returns:
+        dict: ``norm``, ``max_abs``, ``mean_abs`` and ``std_abs`` of the amplitudes
+        and the ``participation_ratio`` 1 / sum(p**2) of the probabilities p
+    """
+    magnitude = np.abs(state).astype(np.float64)
+    probability = magnitude**2
+    total = probability.sum()
+    participation = float(total**2 / np.sum(probability**2)) if total > 0 else 0.0
+    return {
+        "norm": float(state_norm(state)),
+        "max_abs": float(magnitude.max()),
+        "mean_abs": float(magnitude.mean()),
+        "std_abs": float(magnitude.std()),
+        "participation_ratio": participation,
+    }
+
+
+class ResultStore:
+    """
+    Local content-addressed store of sweep summaries.
+
+    Each record is a JSON file ``<directory>/<key[:2]>/<key>.json``, written to a
+    temporary file and renamed into place so concurrent readers never see a partial
+    record.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.expanduser(directory)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        """Return the record stored under ``key``, or None."""
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, record):
+        """Store ``record`` under ``key``, replacing any previous record."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(record, f, sort_keys=True, indent=2)
+        os.replace(tmp_path, path)
+
+    def records(self):
+        """Yield every stored record."""
+        for path in sorted(glob.glob(os.path.join(self.directory, "*", "*.json"))):
+            with open(path) as f:
+                yield json.load(f)
+
+    def query(self, base_config=None, **params):
+        """
+        Return the stored records whose parameters match.
+
+        Args:
+            base_config (dict, optional): Only return runs whose overrides were
+                applied to this configuration (compared by ``config_hash``)
+            **params: CONFIG keys with the value to match, taken from the run's
+                overrides or otherwise its resolved configuration, or ``seed`` and
+                ``iterations``
+
+        Returns:
+            list: Matching records, each with ``key``, ``params``, ``seed``,
+            ``iterations``, ``target_address``, the resolved ``config``, its
+            ``base_hash`` and ``summary``
+        """
+        base_hash = config_hash(base_config) if base_config is not None else None
+        # Stored values went through JSON, so tuples are compared as lists
+        params = json.loads(json.dumps(params))
+        matches = []
+        for record in self.records():
+            if base_hash is not None and record.get("base_hash") != base_hash:
+                continue
+            fields = dict(record.get("config", {}), **record["params"])
+            fields.update(seed=record["seed"], iterations=record["iterations"])
+            if all(name in fields and fields[name] == value for name, value in params.items()):
+                matches.append(record)
+        return matches
+
+
+def _run_sweep_point(config, seed, iterations, target_address, target_pubkey, logger_name):
+    """Execute one sweep run inside a worker process and summarize it."""
+    logger = logging.getLogger(logger_name)
+    start = time.perf_counter()
+    sim = Unified6DTOE(target_address, target_pubkey, logger, rng=np.random.default_rng(seed), config=config)
+    setup_time = time.perf_counter() - start
+    sim.run_simulation(iterations, progress=False)
+    summary = {
+        "status": "ok" if sim.error is None else "failed",
+        "error": sim.error,
+        "iterations": sim.stop_iteration,
+        "wall_time": time.perf_counter() - start,
+        "setup_time": setup_time,
+        "key_found": sim.predicted_key is not None,
+        "predicted_key": sim.predicted_key,
+    }
+    summary.update(state_summary(sim.quantum_state.state))
+    return summary
+
+
+class Sweep:
+    """
+    Runs a parameter sweep of ``Unified6DTOE`` for one target.
+
+    Every point of the grid is combined with every seed, resolved against the base
+    configuration and addressed by ``run_key``. Points whose key is already in the
+    store are returned from it; the rest run in a process pool, each with its own
+    configuration dictionary, and their summaries are stored as they finish. Runs that
+    stop on an error are yielded with ``status`` "failed" and the ``error`` message
+    but not stored, so a later sweep runs them again. The global CONFIG is never
+    modified.
+    """
+
+    def __init__(self, target_address, target_pubkey, logger, store, base_config=None, max_workers=None):
+        """
+        Args:
+            target_address (str): Target Bitcoin address
+            target_pubkey (tuple): Target public key, first element an integer
+            logger (logging.Logger): Logger instance
+            store (ResultStore or str): Result store, or its directory
+            base_config (dict, optional): Configuration the overrides apply to;
+                defaults to the global CONFIG
+            max_workers (int, optional): Worker processes; defaults to the CPU count
+        """
+        self.target_address = target_address
+        self.target_pubkey = target_pubkey
+        self.logger = logger
+        self.store = store if isinstance(store, ResultStore) else ResultStore(store)
+        self.base_config = dict(CONFIG if base_config is None else base_config)
+        self.max_workers = max_workers
+        self.base_hash = config_hash(self.base_config)
+        self._context = multiprocessing.get_context()
+
+    def points(self, grid, seeds=(0,), iterations=None):
+        """
+        Expand a grid into distinct runs.
+
+        Args:
+            grid (dict or list): Parameter grid (see ``expand_grid``)
+            seeds (iterable): Seeds run for every grid point
+            iterations (int, optional): Iterations per run; defaults to each
+                resolved config["max_iterations"]
+
+        Returns:
+            list: ``(key, params, seed, iterations, config)`` tuples, without
+            duplicate keys
+        """
+        runs = []
+        seen = set()
+        for params in expand_grid(grid):
+            config = resolve_config(params, self.base_config)
+            n_iterations = iterations if iterations is not None else config["max_iterations"]
+            for seed in seeds:
+                key = run_key(config, seed, n_iterations, self.target_address, self.target_pubkey)
+                if key not in seen:
+                    seen.add(key)
+                    runs.append((key, params, int(seed), int(n_iterations), config))
+        return runs
+
+    def query(self, **params):
+        """Return the stored records of runs resolved against this sweep's base configuration."""
+        return self.store.query(base_config=self.base_config, **params)
+
+    def run(self, grid, seeds=(0,), iterations=None):
+        """
+        Execute the sweep and yield a result per distinct run.
+
+        Cached results are yielded first, then the new runs in completion order.
+
+        Args:
+            grid (dict or list): Parameter grid (see ``expand_grid``)
+            seeds (iterable): Seeds run for every grid point
+            iterations (int, optional): Iterations per run
+
+        Yields:
+            SweepResult: One result per run
+        """
+        pending = []
+        for key, params, seed, n_iterations, config in self.points(grid, seeds, iterations):
+            record = self.store.get(key)
+            if record is not None:
+                yield SweepResult(key, params, seed, record["summary"], True)
+            else:
+                pending.append((key, params, seed, n_iterations, config))
+        self.logger.info(f"Starting sweep: {len(pending)} runs to execute")
+        if not pending:
+            return
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context) as pool:
+            futures = {
+                pool.submit(_run_sweep_point, config, seed, n_iterations, self.target_address,
+                            self.target_pubkey, self.logger.name): (key, params, seed, n_iterations, config)
+                for key, params, seed, n_iterations, config in pending
+            }
+            for future in as_completed(futures):
+                key, params, seed, n_iterations, config = futures[future]
+                summary = future.result()
+                if summary["status"] != "ok":
+                    # Not stored, so the point is run again by the next sweep
+                    self.logger.error(f"Sweep run {key[:12]} {params} seed {seed} failed: {summary['error']}")
+                    yield SweepResult(key, params, seed, summary, False)
+                    continue
+                self.store.put(key, {
+                    "key": key,
+                    "params": params,
+                    "seed": seed,
+                    "iterations": n_iterations,
+                    "target_address": self.target_address,
+                    "config": {name: value for name, value in config.items() if name not in RUNTIME_KEYS},
+                    "base_hash": self.base_hash,
+                    "summary": summary,
+                })
+                self.logger.info(f"Sweep run {key[:12]} {params} seed {seed}: {summary['iterations']} iterations "
+                                 f"in {summary['wall_time']:.3f} s")
+                yield SweepResult(key, params, seed, summary, False)
@@ -0,0 +1,234 @@
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+import numpy as np
+
+# Per-iteration metrics recorded by Unified6DTOE.run_simulation
+ITERATION_FIELDS = ("iteration", "elapsed", "step_seconds", "nfev")
+
+TELEMETRY_FORMATS = ("jsonl", "binary")
+
+
+class MetricRing:
+    """
+    Preallocated ring buffer of numeric per-iteration metrics.
+
+    Rows are written in place into a structured array, so recording allocates
+    nothing and formats nothing. One thread records and another drains; rows that
+    are overwritten before they are drained are counted in ``dropped``.
+    """
+
+    def __init__(self, fields=ITERATION_FIELDS, capacity=4096):
+        """
+        Args:
+            fields (tuple): Metric names; every metric is stored as float64
+            capacity (int): Number of rows kept between drains
+        """
+        self.dtype = np.dtype([(name, np.float64) for name in fields])
+        self.capacity = int(capacity)
+        self.rows = np.zeros(self.capacity, dtype=self.dtype)
+        self._flat = self.rows.view(np.float64).reshape(self.capacity, len(fields))
+        self.written = 0
+        self.drained = 0
+        self.dropped = 0
+
+    def record(self, *values):
+        """Append one row; ``values`` follow the order of ``fields``."""
+        self._flat[self.written % self.capacity] = values
+        self.written += 1
+
+    def drain(self):
+        """
+        Return the rows recorded since the previous drain, oldest first.
+
+        Returns:
+            np.ndarray: Structured array of the new rows
+        """
+        end = self.written
+        start = max(self.drained, end - self.capacity)
+        indices = np.arange(start, end) % self.capacity
+        batch = self.rows[indices]
+        # Rows overwritten while they were copied are stale as well
+        overwritten = max(self.written - self.capacity - start, 0)
+        if overwritten:
+            batch = batch[overwritten:]
+        self.dropped += start - self.drained + overwritten
+        self.drained = end
+        return batch
+
+
+class TelemetryWriter:
+    """
+    Background thread that drains a ``MetricRing`` to a file in batches.
+
+    Every ``interval`` seconds the new rows are appended as JSON lines (one object
+    per row) or, in the "binary" format, as raw float64 records after a one-line
+    JSON header naming the fields. The recording thread never waits on the file.
+    """
+
+    def __init__(self, ring, path, fmt="jsonl", interval=1.0):
+        """
+        Args:
+            ring (MetricRing): Ring to drain
+            path (str): Output file, truncated on start
+            fmt (str): "jsonl" or "binary"
+            interval (float): Seconds between batches
+        """
+        if fmt not in TELEMETRY_FORMATS:
+            raise ValueError(f"Unknown telemetry format: {fmt}")
+        self.ring = ring
+        self.path = path
+        self.fmt = fmt
+        self.interval = interval
+        self._stop = threading.Event()
+        self._file = open(path, "wb")
+        if fmt == "binary":
+            header = {"fields": list(ring.dtype.names), "dtype": "<f8"}
+            self._file.write((json.dumps(header) + "\n").encode())
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def _write(self, batch):
+        if not len(batch):
+            return
+        if self.fmt == "binary":
+            self._file.write(batch.astype(batch.dtype.newbyteorder("<"), copy=False).tobytes())
+        else:
+            names = batch.dtype.names
+            lines = [json.dumps(dict(zip(names, row.tolist())), separators=(",", ":")) for row in batch]
+            self._file.write(("\n".join(lines) + "\n").encode())
+        self._file.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._write(self.ring.drain())
+
+    def close(self):
+        """Write the remaining rows and close the file."""
+        self._stop.set()
+        self._thread.join()
+        self._write(self.ring.drain())
+        self._file.close()
+
+
+def read_telemetry(path):
+    """
+    Load a file written by ``TelemetryWriter``.
+
+    Args:
+        path (str): Telemetry file in either format
+
+    Returns:
+        np.ndarray: Structured float64 array with one row per recorded iteration
+    """
+    with open(path, "rb") as f:
+        first = f.readline()
+        if not first:
+            return np.zeros(0, dtype=[(name, np.float64) for name in ITERATION_FIELDS])
+        record = json.loads(first)
+        if "dtype" in record:
+            dtype = np.dtype([(name, record["dtype"]) for name in record["fields"]])
+            return np.frombuffer(f.read(), dtype=dtype).astype([(name, np.float64) for name in record["fields"]])
+        rows = [record] + [json.loads(line) for line in f if line.strip()]
+    names = list(rows[0])
+    return np.array([tuple(row[name] for name in names) for row in rows],
+                    dtype=[(name, np.float64) for name in names])
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    ``QueueHandler`` that defers all message formatting to the listener thread.
+
+    The stock handler merges the arguments into the message before queueing. This
+    one enqueues the record untouched, so the emitting thread only builds the record.
+    The queue must stay within the process, since records keep their arguments
+    and exception info unpickled.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def start_log_listener(handlers, level=logging.DEBUG, logger=None):
+    """
+    Route a logger through an in-process queue to handlers served by a background thread.
+
+    Args:
+        handlers (list): Handlers, e.g. a ``FileHandler``, run by the listener thread
+        level (int): Level of the logger
+        logger (logging.Logger, optional): Logger to configure; defaults to the root logger
+
+    Returns:
+        logging.handlers.QueueListener: Started listener; call ``stop()`` to flush it
+    """
+    log_queue = queue.SimpleQueue()
+    logger = logger if logger is not None else logging.getLogger()
+    logger.setLevel(level)
+    logger.addHandler(LazyQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+class Progress:
+    """
+    Iteration progress line redrawn at most once per ``min_interval`` seconds.
+
+    Iterating yields the items of ``iterable``; each step costs one clock read, and
+    the line is only formatted and written when the interval has elapsed and once
+    more when the iteration ends.
+    """
+
+    def __init__(self, iterable, desc="", total=None, initial=0, min_interval=0.5, disable=False,
+                 stream=None):
+        """
+        Args:
+            iterable (iterable): Items to iterate over
+            desc (str): Label shown before the counter
+            total (int, optional): Expected number of items; defaults to ``len(iterable)``
+            initial (int): Count to start from, e.g. resumed iterations
+            min_interval (float): Minimum seconds between redraws
+            disable (bool): Iterate without drawing anything
+            stream (file, optional): Output stream; defaults to ``sys.stderr``
+        """
+        self.iterable = iterable
+        self.desc = desc
+        self.total = total if total is not None else (len(iterable) if hasattr(iterable, "__len__") else None)
+        self.initial = initial
+        self.n = initial
+        self.min_interval = min_interval
+        self.disable = disable
+        self.stream = stream if stream is not None else sys.stderr
+
+    def _draw(self, elapsed, final=False):
+        done = self.n - self.initial
+        rate = done / elapsed if elapsed > 0 else 0.0
+        if self.total:
+            line = f"\r{self.desc}: {self.n}/{self.total} ({100 * self.n / self.total:.0f}%) {rate:.1f} it/s"
+            if rate > 0 and not final:
+                line += f" ETA {(self.total - self.n) / rate:.0f} s"
+        else:
+            line = f"\r{self.desc}: {self.n} {rate:.1f} it/s"
+        self.stream.write(line + ("\n" if final else ""))
+        self.stream.flush()
+
+    def __iter__(self):
+        if self.disable:
+            yield from self.iterable
+            return
+        start = time.monotonic()
+        next_draw = start
+        try:
+            for item in self.iterable:
+                now = time.monotonic()
+                if now >= next_draw:
+                    self._draw(now - start)
+                    next_draw = now + self.min_interval
+                yield item
+                self.n += 1
+        finally:
+            self._draw(time.monotonic() - start, final=True)
@@ -1,7 +1,6 @@
 import hashlib
-import base58
-import ecdsa
-from src.config import SECP256k1_CURVE
+import json
+from src.config import CONFIG, RUNTIME_KEYS, PRECISION_DTYPES
 
 def validate_key(key, target_address):
     """
@@ -14,6 +13,10 @@ def validate_key(key, target_address):
     Returns:
         tuple: (bool, str) - (success flag, WIF private key if successful)
     """
+    # Imported here so that importing the package does not load the curve libraries
+    import base58
+    import ecdsa
+    from src.config import SECP256k1_CURVE
     try:
         private_key = ecdsa.SigningKey.from_secret_exponent(key, curve=SECP256k1_CURVE)
         public_key = private_key.get_verifying_key().to_string("compressed")
@@ -28,3 +31,48 @@ def validate_key(key, target_address):
         return False, ""
     except Exception as e:
         return False, ""
+
+
+def stable_hash(obj):
+    """
+    Return a SHA-256 hex digest of a JSON-serializable object, independent of key order.
+
+    Args:
+        obj: JSON-serializable object (dicts, lists, strings, numbers)
+
+    Returns:
+        str: Hex digest
+    """
+    payload = json.dumps(obj, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def config_hash(config):
+    """
+    Return the stable hash of the trajectory-relevant part of a configuration.
+
+    Keys listed in ``RUNTIME_KEYS`` are ignored.
+
+    Args:
+        config (dict): Configuration, e.g. ``CONFIG``
+
+    Returns:
+        str: Hex digest
+    """
+    return stable_hash({key: value for key, value in config.items() if key not in RUNTIME_KEYS})
+
+
+def precision_dtypes(precision=None):
+    """
+    Return the state and real dtypes of a precision mode.
+
+    Args:
+        precision (str, optional): "double" or "single"; defaults to CONFIG["precision"]
+
+    Returns:
+        tuple: (complex dtype, real dtype) NumPy scalar types
+    """
+    precision = precision or CONFIG["precision"]
+    if precision not in PRECISION_DTYPES:
+        raise ValueError(f"Unknown precision: {precision}")
+    return PRECISION_DTYPES[precision]
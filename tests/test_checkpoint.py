@@ -0,0 +1,63 @@
+import unittest
+import logging
+import os
+import tempfile
+import numpy as np
+from src.config import CONFIG
+from src.checkpoint import TrajectoryRecorder
+from src.simulation import Unified6DTOE
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "run.npz")
+        self.saved = dict(CONFIG)
+
+    def tearDown(self):
+        CONFIG.clear()
+        CONFIG.update(self.saved)
+        self.tmp.cleanup()
+
+    def _sim(self, seed):
+        return Unified6DTOE("1TestAddress", (0x123456789, None), self.logger, rng=np.random.default_rng(seed))
+
+    def test_resume_matches_uninterrupted_run(self):
+        straight = self._sim(5)
+        straight.run_simulation(6, progress=False)
+        CONFIG["checkpoint_path"] = self.path
+        CONFIG["checkpoint_every"] = 3
+        interrupted = self._sim(5)
+        interrupted.run_simulation(3, progress=False)
+        CONFIG["checkpoint_path"] = None
+        resumed = self._sim(99)
+        resumed.run_simulation(6, progress=False, resume_from=self.path)
+        self.assertEqual(resumed.stop_iteration, 6)
+        np.testing.assert_array_equal(resumed.quantum_state.state, straight.quantum_state.state)
+        self.assertEqual(resumed.rng.bit_generator.state, straight.rng.bit_generator.state)
+
+    def test_resume_rejects_changed_config(self):
+        CONFIG["checkpoint_path"] = self.path
+        CONFIG["checkpoint_every"] = 1
+        self._sim(1).run_simulation(1, progress=False)
+        original = CONFIG["wormhole_coupling"]
+        CONFIG["wormhole_coupling"] = original + 1
+        try:
+            with self.assertRaises(ValueError):
+                self._sim(1).run_simulation(2, progress=False, resume_from=self.path)
+        finally:
+            CONFIG["wormhole_coupling"] = original
+
+    def test_trajectory_recorder(self):
+        sim = self._sim(2)
+        path = os.path.join(self.tmp.name, "trajectory.npy")
+        recorder = TrajectoryRecorder(path, sim.total_points, n_frames=3, every=2)
+        sim.run_simulation(5, progress=False, recorder=recorder)
+        recorder.close()
+        frames = np.load(path, mmap_mode="r")
+        self.assertEqual(frames.shape, (3, sim.total_points))
+        np.testing.assert_array_equal(frames[2], sim.quantum_state.state)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import logging
+import numpy as np
+from src.config import CONFIG
+from src.convergence import ConvergenceMonitor
+from src.key_extraction import KeyExtractor
+from src.simulation import Unified6DTOE
+
+class TestConvergenceMonitor(unittest.TestCase):
+    def test_steady_rotation_converges(self):
+        rng = np.random.default_rng(0)
+        state = np.exp(1j * rng.uniform(0, 2 * np.pi, 100)) / 10
+        monitor = ConvergenceMonitor(window=3)
+        previous = None
+        results = []
+        for _ in range(6):
+            results.append(monitor.update(previous, state, 42))
+            previous = state
+            state = state * np.exp(0.01j)
+        self.assertEqual(results, [False, False, False, False, True, True])
+        self.assertAlmostEqual(monitor.fidelity, 1.0)
+        self.assertAlmostEqual(monitor.phase_step, 0.01)
+
+    def test_changing_candidate_resets(self):
+        state = np.full(16, 0.25, dtype=np.complex128)
+        monitor = ConvergenceMonitor(window=2)
+        for candidate in [1, 1, 1, 2]:
+            converged = monitor.update(state, state, candidate)
+        self.assertFalse(converged)
+        self.assertEqual(monitor.repeats, 1)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(ConvergenceMonitor.from_config(CONFIG))
+        with self.assertRaises(ValueError):
+            ConvergenceMonitor(window=2, action="pause")
+
+class TestEarlyTermination(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+
+    def run_simulation(self, iterations, **overrides):
+        config = dict(CONFIG, integrator="rk4", **overrides)
+        sim = Unified6DTOE("1TestAddress", (0x123456789, None), self.logger,
+                           rng=np.random.default_rng(0), config=config)
+        sim.run_simulation(iterations, progress=False)
+        return sim
+
+    def test_stop_and_hold(self):
+        full = self.run_simulation(60)
+        self.assertIsNone(full.converged_at)
+        stopped = self.run_simulation(60, convergence_window=10)
+        self.assertIsNotNone(stopped.converged_at)
+        self.assertEqual(stopped.stop_iteration, stopped.converged_at)
+        self.assertLess(stopped.stop_iteration, 60)
+
+        held = self.run_simulation(60, convergence_window=10, convergence_action="hold")
+        self.assertEqual(held.converged_at, stopped.converged_at)
+        self.assertEqual(held.stop_iteration, 60)
+        self.assertEqual(len(held.quantum_state.state_history), 1)
+        self.assertGreater(abs(np.vdot(held.quantum_state.state, full.quantum_state.state)), 1 - 1e-3)
+        self.assertEqual(KeyExtractor.candidates(held.quantum_state.state[None, :], held.grid_size),
+                         KeyExtractor.candidates(full.quantum_state.state[None, :], full.grid_size))
+
+if __name__ == "__main__":
+    unittest.main()
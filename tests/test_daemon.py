@@ -0,0 +1,70 @@
+import unittest
+import logging
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import numpy as np
+from src.daemon import DaemonClient, SimulationDaemon
+from src.simulation import Unified6DTOE
+from src.sweep import state_summary
+
+class TestSimulationDaemon(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+
+    def test_lazy_package_import(self):
+        code = ("import sys, src; loaded = [m for m in ('scipy', 'ecdsa', 'base58', 'src.simulation') "
+                "if m in sys.modules]; assert not loaded, loaded; "
+                "import ecdsa; assert src.SECP256k1_CURVE is ecdsa.SECP256k1; "
+                "assert src.SECP256k1_N == ecdsa.SECP256k1.order; "
+                "assert src.SECP256k1_P == ecdsa.SECP256k1.curve.p(); "
+                "assert src.Unified6DTOE.__module__ == 'src.simulation'")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+    def test_jobs_match_direct_runs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tvle.sock")
+            daemon = SimulationDaemon(path, self.logger)
+            server = threading.Thread(target=daemon.serve_forever, daemon=True)
+            server.start()
+            deadline = time.monotonic() + 30
+            while not os.path.exists(path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+            client = DaemonClient(path, timeout=60)
+            try:
+                for _ in range(2):
+                    events = list(client.submit("1TestAddress", (0x123456789, None), 6, seed=3, report_every=2))
+                    self.assertEqual([event["event"] for event in events],
+                                     ["started", "iteration", "iteration", "iteration", "result"])
+                self.assertEqual(client.ping(), {"event": "pong", "jobs": 2, "cached_fields": 1})
+
+                sim = Unified6DTOE("1TestAddress", (0x123456789, None), self.logger, rng=np.random.default_rng(3))
+                sim.run_simulation(6, progress=False)
+                result = events[-1]
+                self.assertEqual(result["iterations"], 6)
+                self.assertEqual(events[-2]["key"], hex(sim.last_candidate))
+                for name, value in state_summary(sim.quantum_state.state).items():
+                    self.assertEqual(result[name], value)
+
+                error = client.run("1TestAddress", (0x123456789, None), 2, config={"no_such_key": 1})
+                self.assertEqual(error["event"], "error")
+                self.assertIn("no_such_key", error["message"])
+
+                failed = client.run("1TestAddress", (0x123456789, None), 2, config={"ode_method": "NoSuchMethod"})
+                self.assertEqual(failed["event"], "error")
+                self.assertIn("Error at iteration 0", failed["message"])
+                self.assertIn("`method` must be one of", failed["message"])
+            finally:
+                self.assertEqual(client.shutdown(), {"event": "bye"})
+                server.join(timeout=30)
+            self.assertFalse(os.path.exists(path))
+
+if __name__ == "__main__":
+    unittest.main()
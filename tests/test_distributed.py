@@ -0,0 +1,105 @@
+import logging
+import multiprocessing
+import time
+import unittest
+from unittest import mock
+import numpy as np
+from src.distributed import DistributedQuantumState, SlabHamiltonian, default_process_grid
+from src.hamiltonian import build_hamiltonian
+from src.integrators import build_integrator
+from src.key_extraction import KeyExtractor
+from src.simulation import Unified6DTOE
+from tests.unsaturated import max_derivative, unsaturated_config, unsaturated_fields
+
+class TestDistributed(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestDistributed")
+        # The default potential saturates every component; compare where the terms matter
+        self.config = unsaturated_config((4, 3, 3, 3, 3, 4))
+        self.sim = Unified6DTOE("1TestAddress", (0x123456789, None), self.logger, rng=np.random.default_rng(3),
+                                fields=unsaturated_fields(self.config), config=self.config)
+
+    def test_default_process_grid(self):
+        self.assertEqual(default_process_grid((5, 5, 5, 5, 3, 3), 1), (1, 1, 1, 1, 1, 1))
+        self.assertEqual(default_process_grid((8, 8, 4, 4, 4, 4), 4), (2, 2, 1, 1, 1, 1))
+        self.assertEqual(default_process_grid((16, 16, 16, 16, 8, 8), 6), (3, 2, 1, 1, 1, 1))
+        with self.assertRaises(ValueError):
+            default_process_grid((2, 2, 1, 1, 1, 1), 8)
+
+    def test_matches_single_process_evolution(self):
+        reference = self.sim.quantum_state
+        initial = reference.state.copy()
+        # A CTC reference other than the initial state, as left by an earlier run
+        reference.state_history = [np.roll(initial, 5)]
+        past = list(reference.state_history)
+        hamiltonian = build_hamiltonian(self.sim.grid_size, self.sim.dx, self.sim.V, self.sim.wormhole_state,
+                                        self.logger, "compiled", config=self.config)
+        self.assertLess(max_derivative(hamiltonian, initial, [initial]), 1e-3 * self.config["field_clamp_max"])
+        integrator = build_integrator("rk4", config=self.config)
+
+        def rhs(t, y, out=None, linear=True):
+            return hamiltonian(t, y, reference.state_history, None, out=out, linear=linear)
+
+        for _ in range(3):
+            reference.evolve(self.sim.dt, self.config["rtol"], self.config["atol"], rhs, integrator)
+        self.assertGreater(np.abs(reference.state - initial).max(), 1e-2)
+        # Two split axes, including uneven slabs along the first
+        with DistributedQuantumState(self.sim.grid_size, self.sim.V, self.sim.wormhole_state, self.logger, 6,
+                                     process_grid=(3, 1, 1, 1, 1, 2), state=initial, state_history=past,
+                                     config=self.config) as state:
+            for _ in range(3):
+                state.evolve(self.sim.dt)
+            # Only the summation order of the overlap and norm reductions differs
+            np.testing.assert_allclose(state.state, reference.state, rtol=0, atol=1e-16)
+            self.assertEqual(KeyExtractor.candidates(state.state[None, :], self.sim.grid_size),
+                             KeyExtractor.candidates(reference.state[None, :], self.sim.grid_size))
+
+    def test_run_distributed_simulation(self):
+        self.sim.run_distributed_simulation(3, 2)
+        self.assertEqual(self.sim.stop_iteration, 3)
+        self.sim.run_distributed_simulation(0, 2)
+        self.assertEqual(self.sim.stop_iteration, 0)
+        self.assertAlmostEqual(np.linalg.norm(self.sim.quantum_state.state), 1.0)
+
+    def assert_team_stopped(self, state, workers, step):
+        start = time.monotonic()
+        with self.assertRaises(RuntimeError):
+            step()
+        self.assertLess(time.monotonic() - start, 4 * state._timeout)
+        self.assertFalse(any(worker.is_alive() for worker in workers))
+        self.assertEqual(state._workers, [])
+        self.assertEqual(state.state.shape, (self.sim.total_points,))
+
+    def test_dead_worker_stops_the_team(self):
+        config = dict(self.config, distributed_timeout=2.0)
+        with DistributedQuantumState(self.sim.grid_size, self.sim.V, self.sim.wormhole_state, self.logger, 2,
+                                     config=config) as state:
+            workers = list(state._workers)
+            state.evolve(self.sim.dt)
+            workers[0].kill()
+            workers[0].join()
+            self.assert_team_stopped(state, workers, lambda: state.evolve(self.sim.dt))
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == "fork", "the hang is patched into forked workers")
+    def test_hung_worker_times_out(self):
+        config = dict(self.config, distributed_timeout=1.0)
+        call = SlabHamiltonian.__call__
+
+        def hang_on_rank_one(hamiltonian, *args, **kwargs):
+            if hamiltonian.halo.rank == 1:
+                time.sleep(3600)
+            return call(hamiltonian, *args, **kwargs)
+
+        with mock.patch.object(SlabHamiltonian, "__call__", hang_on_rank_one):
+            state = DistributedQuantumState(self.sim.grid_size, self.sim.V, self.sim.wormhole_state, self.logger, 2,
+                                            config=config)
+        with state:
+            self.assert_team_stopped(state, list(state._workers), lambda: state.evolve(self.sim.dt))
+
+    def test_adaptive_integrator_rejected(self):
+        with self.assertRaises(ValueError):
+            DistributedQuantumState(self.sim.grid_size, self.sim.V, self.sim.wormhole_state, self.logger, 2,
+                                    integrator="solve_ivp")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import logging
+import numpy as np
+from src.config import CONFIG
+from src.simulation import Unified6DTOE
+from src.hamiltonian import CompiledHamiltonian
+from src.integrators import RK4Integrator, build_integrator
+from src.quantum_state import QuantumState, QuantumStateEnsemble
+from tests.unsaturated import unsaturated_config, unsaturated_fields
+
+class TestQuantumStateEnsemble(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+        self.sim = Unified6DTOE(
+            target_address="1TestAddress",
+            target_pubkey=(0x123456789, None),
+            logger=self.logger
+        )
+        # Batched and per-member evolution are compared where no component is clipped
+        self.config = unsaturated_config(CONFIG["grid_size"])
+        fields = unsaturated_fields(self.config)
+        self.hamiltonian = CompiledHamiltonian(self.sim.grid_size, self.config["dx"], fields["V"],
+                                               fields["wormhole_state"], self.logger, config=self.config)
+
+    def _members(self, n):
+        return [QuantumState(self.sim.grid_size, self.logger, rng=np.random.default_rng(seed), config=self.config)
+                for seed in range(n)]
+
+    def test_matches_independent_states(self):
+        members = self._members(3)
+        ensemble = QuantumStateEnsemble(self.sim.grid_size, 3, self.logger,
+                                        [np.random.default_rng(seed) for seed in range(3)], config=self.config)
+        np.testing.assert_array_equal(ensemble.state, np.array([m.state for m in members]))
+        initial = ensemble.state.copy()
+        dt = self.config["dt"]
+        for _ in range(3):
+            ensemble.evolve(dt, CONFIG["rtol"], CONFIG["atol"], self.hamiltonian, RK4Integrator())
+            for m in members:
+                m.evolve(dt, CONFIG["rtol"], CONFIG["atol"],
+                         lambda t, y, out=None, m=m: self.hamiltonian(t, y, m.state_history, m.temporal_entanglement, out=out),
+                         RK4Integrator())
+        expected = np.array([m.state for m in members])
+        self.assertGreater(np.abs(expected - initial).max(axis=1).min(), 1e-3)
+        np.testing.assert_allclose(ensemble.state, expected, rtol=1e-12, atol=1e-15)
+        np.testing.assert_allclose(np.linalg.norm(ensemble.state, axis=1), 1.0)
+        self.assertEqual(len(ensemble.state_history), 1)
+
+    def test_bdf_jacobian_sees_member_history(self):
+        # The analytic Jacobian linearizes the CTC term around each member's history
+        grid_size = (4, 3, 3, 2, 2, 2)
+        config = unsaturated_config(grid_size)
+        fields = unsaturated_fields(config)
+        hamiltonian = CompiledHamiltonian(grid_size, config["dx"], fields["V"], fields["wormhole_state"], self.logger,
+                                          config=config)
+        members = [QuantumState(grid_size, self.logger, rng=np.random.default_rng(seed), config=config)
+                   for seed in range(2)]
+        ensemble = QuantumStateEnsemble(grid_size, 2, self.logger, [np.random.default_rng(seed) for seed in range(2)],
+                                        config=config)
+        integrator = build_integrator("solve_ivp", method="BDF", hamiltonian=hamiltonian, config=config)
+        for _ in range(3):
+            ensemble.evolve(config["dt"], config["rtol"], config["atol"], hamiltonian, integrator)
+            for m in members:
+                m.evolve(config["dt"], config["rtol"], config["atol"],
+                         lambda t, y, out=None, linear=True, m=m: hamiltonian(
+                             t, y, m.state_history, m.temporal_entanglement, out=out, linear=linear),
+                         integrator)
+        np.testing.assert_array_equal(ensemble.state, np.array([m.state for m in members]))
+
+    def test_zero_norm_member_is_reset(self):
+        ensemble = QuantumStateEnsemble(self.sim.grid_size, 2, self.logger, [np.random.default_rng(seed) for seed in range(2)])
+        static = lambda t, y, history, entanglement, out=None, linear=True: np.multiply(y, 0, out=out)
+        static.supports_batch = False
+        survivor = ensemble.state[0].copy()
+        ensemble.state[1] = 0
+        ensemble.evolve(CONFIG["dt"], CONFIG["rtol"], CONFIG["atol"], static, RK4Integrator())
+        np.testing.assert_allclose(ensemble.state[0], survivor)
+        self.assertAlmostEqual(np.linalg.norm(ensemble.state[1]), 1.0)
+
+    def test_run_ensemble_simulation(self):
+        self.sim.run_ensemble_simulation(iterations=3, n_members=2)
+        self.assertEqual(self.sim.ensemble.state.shape, (2, self.sim.total_points))
+        self.assertFalse(self.sim.key_found.is_set())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import logging
+import os
+import subprocess
+import sys
+import threading
+import numpy as np
+from src.farm import RunFarm
+from src.shared import SharedArray
+from tests.unsaturated import unsaturated_config, unsaturated_fields
+
+class TestRunFarm(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+
+    def test_runs_stream_back(self):
+        farm = RunFarm("1TestAddress", (0x123456789, None), self.logger, max_workers=2, seed=1234)
+        results = list(farm.run(n_runs=3, iterations=3))
+        self.assertEqual(sorted(r.run_index for r in results), [0, 1, 2])
+        self.assertEqual(len({r.spawn_key for r in results}), 3)
+        for result in results:
+            self.assertEqual(result.stop_iteration, 3)
+            self.assertFalse(result.key_found)
+            self.assertFalse(result.cancelled)
+
+    def test_shutdown_cancels_running_runs(self):
+        farm = RunFarm("1TestAddress", (0x123456789, None), self.logger, max_workers=2, seed=1)
+        timer = threading.Timer(1.0, farm.shutdown)
+        timer.start()
+        results = list(farm.run(n_runs=2, iterations=100000))
+        timer.join()
+        self.assertTrue(all(r.cancelled and r.stop_iteration < 100000 for r in results))
+
+    def test_reproducible_from_seed(self):
+        # Unclipped regime, where the candidates depend on the initial phases
+        config = unsaturated_config((3, 3, 3, 3, 3, 4), integrator="rk4")
+        fields = unsaturated_fields(config)
+
+        def candidates(seed, max_workers):
+            farm = RunFarm("1TestAddress", (0x123456789, None), self.logger, max_workers=max_workers, seed=seed,
+                           config=config, fields=fields)
+            results = sorted(farm.run(n_runs=3, iterations=4), key=lambda r: r.run_index)
+            self.assertTrue(all(r.stop_iteration == 4 for r in results))
+            return [(r.spawn_key, r.candidate) for r in results]
+
+        first = candidates(42, 1)
+        self.assertEqual(candidates(42, 1), first)
+        self.assertEqual(candidates(42, 3), first)
+        self.assertGreater(len({candidate for _, candidate in first}), 1)
+        self.assertNotEqual(candidates(43, 2), first)
+
+    def test_shared_array_survives_unrelated_process(self):
+        shared = SharedArray.create(np.arange(6.0))
+        try:
+            code = ("from src.shared import SharedArray; "
+                    f"attached = SharedArray.attach({shared.spec!r}); print(attached.array.sum()); attached.close()")
+            root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+            self.assertEqual(output.stdout.strip(), "15.0")
+            attached = SharedArray.attach(shared.spec)
+            np.testing.assert_array_equal(attached.array, np.arange(6.0))
+            attached.close()
+        finally:
+            shared.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import logging
+import tempfile
+import numpy as np
+from src.config import CONFIG
+from src.fields import wormhole_fields, load_fields, fields_cache_key
+
+GRID_SIZE = (5, 5, 5, 5, 3, 3)
+PUBKEY = (0x123456789, None)
+
+class TestFields(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+
+    def test_scalar_field_and_wormhole_pattern(self):
+        fields = wormhole_fields(GRID_SIZE, CONFIG["dx"], PUBKEY)
+        bits = [int(b) for b in bin(PUBKEY[0])[2:].zfill(256)]
+        expected = np.array([bits[i % 256] for i in range(fields["V"].size)], dtype=float)
+        np.testing.assert_array_equal(fields["scalar_field"], expected)
+        self.assertTrue(np.all(fields["wormhole_state"][expected == 0] == 0))
+        self.assertAlmostEqual(np.linalg.norm(fields["wormhole_state"]), 1.0)
+
+    def test_cache_roundtrip_is_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            computed = wormhole_fields(GRID_SIZE, CONFIG["dx"], PUBKEY)
+            first = load_fields(GRID_SIZE, CONFIG["dx"], PUBKEY, cache_dir=cache_dir, logger=self.logger)
+            second = load_fields(GRID_SIZE, CONFIG["dx"], PUBKEY, cache_dir=cache_dir, logger=self.logger)
+            for name, array in computed.items():
+                self.assertIsInstance(second[name], np.memmap)
+                np.testing.assert_array_equal(first[name], array)
+                np.testing.assert_array_equal(second[name], array)
+
+    def test_cache_key_tracks_couplings(self):
+        key = fields_cache_key(GRID_SIZE, CONFIG["dx"], PUBKEY)
+        original = CONFIG["em_strength"]
+        CONFIG["em_strength"] = original * 2
+        try:
+            self.assertNotEqual(fields_cache_key(GRID_SIZE, CONFIG["dx"], PUBKEY), key)
+        finally:
+            CONFIG["em_strength"] = original
+        self.assertNotEqual(fields_cache_key(GRID_SIZE, CONFIG["dx"], (0x987654321, None)), key)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Golden-trajectory regression checks.
+
+``tests/golden/trajectory.npz`` holds a seeded run of the reference Hamiltonian with
+the reference solve_ivp integrator: the state and the extracted key candidate after
+each iteration. The run uses the unsaturated regime of ``tests/unsaturated.py``, so
+every term of the Hamiltonian shapes the trajectory; with the default configuration
+every derivative component is clipped and the states would only reflect the clamp.
+Every backend and integrator listed in ``GOLDEN_TOLERANCES`` must reproduce it;
+regenerate the fixture with ``python scripts/make_golden.py`` only when a change to
+the trajectory is intended.
+"""
+import logging
+import os
+import unittest
+import numpy as np
+from src.hamiltonian import build_hamiltonian
+from src.integrators import build_integrator
+from src.key_extraction import KeyExtractor
+from src.simulation import Unified6DTOE
+from tests.unsaturated import unsaturated_config, unsaturated_fields
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "trajectory.npz")
+GOLDEN_GRID = (3, 3, 3, 3, 3, 4)
+GOLDEN_SEED = 2024
+GOLDEN_ITERATIONS = 8
+GOLDEN_TARGET = ("1TestAddress", (0x123456789, None))
+# Tight solve_ivp tolerances, so the fixture is close to the exact trajectory
+GOLDEN_OVERRIDES = {"rtol": 1e-10, "atol": 1e-12}
+# Fixed steps per dt for rk4, dopri5 and split_step
+GOLDEN_SUBSTEPS = 4
+
+# Largest allowed |psi - psi_golden| per (backend, integrator), about twice the
+# measured deviation (amplitudes are about 0.06). The solve_ivp entries differ only
+# in summation order (measured <= 1.1e-16). The fixed-step entries are bounded by
+# their truncation error at GOLDEN_SUBSTEPS steps per dt: rk4 1.9e-6, dopri5 2.0e-7
+# and the second-order split_step 2.5e-5. Dropping the entanglement term moves the
+# states by 3.4e-2. Candidates must match exactly.
+GOLDEN_TOLERANCES = {
+    ("reference", "solve_ivp"): 1e-13,
+    ("compiled", "solve_ivp"): 1e-13,
+    ("sparse", "solve_ivp"): 1e-13,
+    ("compiled", "rk4"): 4e-6,
+    ("compiled", "dopri5"): 4e-7,
+    ("sparse", "rk4"): 4e-6,
+    ("compiled", "split_step"): 5e-5,
+}
+
+
+def golden_trajectory(backend="reference", integrator="solve_ivp"):
+    """
+    Run the golden scenario and return its states and key candidates.
+
+    Args:
+        backend (str): Hamiltonian backend
+        integrator (str): Integrator name
+
+    Returns:
+        tuple: (states of shape (GOLDEN_ITERATIONS, N), int64 candidates)
+    """
+    config = unsaturated_config(GOLDEN_GRID, **GOLDEN_OVERRIDES)
+    logger = logging.getLogger("TestGolden")
+    sim = Unified6DTOE(*GOLDEN_TARGET, logger, rng=np.random.default_rng(GOLDEN_SEED),
+                       fields=unsaturated_fields(config, GOLDEN_TARGET[1]), config=config)
+    hamiltonian = build_hamiltonian(sim.grid_size, sim.dx, sim.V, sim.wormhole_state, logger, backend=backend,
+                                    config=config)
+    stepper = build_integrator(integrator, substeps=GOLDEN_SUBSTEPS, method="RK45", hamiltonian=hamiltonian,
+                               config=config)
+    state = sim.quantum_state
+
+    def rhs(t, y, out=None, linear=True):
+        return hamiltonian(t, y, state.state_history, state.temporal_entanglement, out=out, linear=linear)
+
+    states, keys = [], []
+    for _ in range(GOLDEN_ITERATIONS):
+        state.evolve(sim.dt, config["rtol"], config["atol"], rhs, stepper)
+        states.append(state.state.copy())
+        keys.append(KeyExtractor.extract(state, sim.target_address, sim.total_points, [])[0])
+    return np.array(states), np.array(keys, dtype=np.int64)
+
+
+class TestGoldenTrajectory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with np.load(GOLDEN_PATH) as golden:
+            cls.states = golden["states"]
+            cls.keys = golden["keys"]
+
+    def test_fixture_matches_scenario(self):
+        self.assertEqual(self.states.shape, (GOLDEN_ITERATIONS, int(np.prod(GOLDEN_GRID))))
+
+    def test_backends_and_integrators_match_golden(self):
+        for (backend, integrator), tolerance in GOLDEN_TOLERANCES.items():
+            with self.subTest(backend=backend, integrator=integrator):
+                states, keys = golden_trajectory(backend, integrator)
+                np.testing.assert_allclose(states, self.states, rtol=0, atol=tolerance)
+                np.testing.assert_array_equal(keys, self.keys)
+
+if __name__ == "__main__":
+    unittest.main()
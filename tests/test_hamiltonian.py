@@ -0,0 +1,71 @@
+import unittest
+import logging
+import numpy as np
+from src.config import CONFIG
+from src.simulation import Unified6DTOE
+from src.hamiltonian import Hamiltonian, CompiledHamiltonian, SparseHamiltonian
+from src.operators import laplacian_matrix
+from tests.unsaturated import max_derivative, unsaturated_config, unsaturated_fields
+
+class HamiltonianTestCase(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+        # The default potential saturates every component; compare where the terms matter
+        self.config = unsaturated_config(CONFIG["grid_size"])
+        self.sim = Unified6DTOE(
+            target_address="1TestAddress",
+            target_pubkey=(0x123456789, None),
+            logger=self.logger,
+            fields=unsaturated_fields(self.config),
+            config=self.config
+        )
+        self.args = (self.sim.grid_size, self.sim.dx, self.sim.V, self.sim.wormhole_state, self.logger)
+        self.reference = Hamiltonian(*self.args, config=self.config)
+        self.compiled = CompiledHamiltonian(*self.args, config=self.config)
+        rng = np.random.default_rng(0)
+        n = self.sim.total_points
+        self.y = (rng.standard_normal(n) + 1j * rng.standard_normal(n)) / np.sqrt(2 * n)
+        self.past = np.exp(1j * rng.uniform(0, 2 * np.pi, n)) / np.sqrt(n)
+
+
+class TestCompiledHamiltonian(HamiltonianTestCase):
+    def test_regime_is_unsaturated(self):
+        self.assertLess(max_derivative(self.reference, self.y, [self.past]), 1e-3 * self.config["field_clamp_max"])
+
+    def test_matches_reference_without_history(self):
+        for t in (0.0, 0.3, 1.0):
+            expected = self.reference(t, self.y, [], None)
+            np.testing.assert_array_equal(self.compiled(t, self.y, [], None), expected)
+
+    def test_matches_reference_with_history(self):
+        for t in (0.0, 0.5):
+            expected = self.reference(t, self.y, [self.past], None)
+            np.testing.assert_array_equal(self.compiled(t, self.y, [self.past], None), expected)
+
+    def test_out_buffer(self):
+        out = np.empty_like(self.y)
+        result = self.compiled(0.1, self.y, [self.past], None, out=out)
+        self.assertIs(result, out)
+        np.testing.assert_array_equal(out, self.reference(0.1, self.y, [self.past], None))
+
+class TestSparseHamiltonian(HamiltonianTestCase):
+    def test_laplacian_matches_stencil(self):
+        grid = self.y.reshape(self.sim.grid_size)
+        stencil = sum(np.roll(grid, 1, axis=a) + np.roll(grid, -1, axis=a) - 2 * grid for a in range(6))
+        dense = laplacian_matrix(self.sim.grid_size, 1.0) @ self.y
+        np.testing.assert_allclose(dense, stencil.flatten(), rtol=1e-12, atol=1e-15)
+
+    def test_matches_compiled(self):
+        sparse = SparseHamiltonian(*self.args, config=self.config)
+        for history in ([], [self.past]):
+            expected = self.compiled(0.2, self.y, history, None)
+            np.testing.assert_allclose(sparse(0.2, self.y, history, None), expected, rtol=1e-12)
+
+    def test_operators_are_cached(self):
+        first = SparseHamiltonian(self.sim.grid_size, self.sim.dx, self.sim.V, self.sim.wormhole_state, self.logger)
+        second = SparseHamiltonian(self.sim.grid_size, self.sim.dx, self.sim.V.copy(), self.sim.wormhole_state, self.logger)
+        self.assertIs(first.kinetic_operator, second.kinetic_operator)
+
+if __name__ == "__main__":
+    unittest.main()
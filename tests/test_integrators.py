@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from scipy.sparse.linalg import expm_multiply
+from src.config import hbar
+from src.integrators import SolveIVPIntegrator, RK4Integrator, DormandPrinceIntegrator, SplitStepIntegrator
+from src.operators import kinetic_potential_operators
+
+def rotation(t, y, out=None):
+    """y' = -i * 2 * y, with exact solution y0 * exp(-2it)."""
+    return np.multiply(-2j, y, out=out)
+
+class TestIntegrators(unittest.TestCase):
+    def setUp(self):
+        self.y0 = np.exp(1j * np.linspace(0, 2 * np.pi, 16))
+        self.exact = self.y0 * np.exp(-2j * 0.1)
+
+    def test_fixed_step_accuracy(self):
+        for integrator, tol in ((RK4Integrator(substeps=4), 1e-8), (DormandPrinceIntegrator(substeps=2), 1e-10)):
+            y = self.y0.copy()
+            self.assertTrue(integrator.step(rotation, y, 0.1))
+            np.testing.assert_allclose(y, self.exact, atol=tol)
+
+    def test_state_updated_in_place_with_persistent_buffers(self):
+        integrator = RK4Integrator()
+        y = self.y0.copy()
+        integrator.step(rotation, y, 0.01)
+        buffers = integrator._workspace(y)
+        integrator.step(rotation, y, 0.01)
+        self.assertIs(integrator._workspace(y), buffers)
+        self.assertEqual(integrator.nfev, 8)
+        np.testing.assert_allclose(y, self.y0 * np.exp(-2j * 0.02), atol=1e-10)
+
+    def test_solve_ivp_reference(self):
+        y = self.y0.copy()
+        self.assertTrue(SolveIVPIntegrator().step(rotation, y, 0.1, 1e-10, 1e-12))
+        np.testing.assert_allclose(y, self.exact, atol=1e-8)
+
+    def test_split_step_kinetic_is_exact(self):
+        grid_size = (4, 3, 3, 3, 3, 3)
+        V = np.zeros(int(np.prod(grid_size)))
+        kinetic, _ = kinetic_potential_operators(grid_size, 1.0, V)
+        rng = np.random.default_rng(0)
+        y = np.exp(1j * rng.uniform(0, 2 * np.pi, V.size)) / np.sqrt(V.size)
+        dt = 1e-24
+        expected = expm_multiply(-1j * dt / hbar * kinetic, y)
+        no_nonlinear = lambda t, state, out=None, linear=True: np.multiply(state, 0, out=out)
+        SplitStepIntegrator(grid_size, 1.0, V, substeps=2).step(no_nonlinear, y, dt)
+        np.testing.assert_allclose(y, expected, atol=1e-12)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import logging
+import numpy as np
+from src.config import CONFIG, hbar
+from src.fields import wormhole_fields
+from src.hamiltonian import build_hamiltonian
+from src.integrators import build_integrator
+from src.jacobian import SparseJacobian, real_jacobian
+
+class TestSparseJacobian(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+        self.rng = np.random.default_rng(7)
+
+    def hamiltonian(self, grid_size, V, wormhole_state, backend="compiled", **overrides):
+        # Scaled so that every term of the derivative is of order one
+        config = dict(CONFIG, grid_size=grid_size, field_clamp_max=np.inf, wormhole_coupling=1.0,
+                      entanglement_coupling=2 * hbar, dt=1.0, **overrides)
+        return build_hamiltonian(grid_size, 1e10, V, wormhole_state, self.logger, backend=backend, config=config)
+
+    def test_matches_complex_derivative(self):
+        grid_size = (4, 3, 3, 2, 2, 2)
+        N = int(np.prod(grid_size))
+        wormhole_state = self.rng.normal(size=N)
+        wormhole_state /= np.linalg.norm(wormhole_state)
+        y = self.rng.normal(size=N) + 1j * self.rng.normal(size=N)
+        y /= np.linalg.norm(y)
+        history = [np.exp(1j * self.rng.uniform(0, 2 * np.pi, N)) / np.sqrt(N)]
+        v = self.rng.normal(size=N) + 1j * self.rng.normal(size=N)
+        for backend in ("reference", "compiled", "sparse"):
+            with self.subTest(backend=backend):
+                hamiltonian = self.hamiltonian(grid_size, hbar * self.rng.uniform(0, 1, N), wormhole_state, backend)
+
+                def f(z):
+                    return hamiltonian(0.3, z, history, None)
+
+                # d/dpsi part of the derivative from two complex directions
+                eps = 1e-6
+                expected = ((f(y + eps * v) - f(y - eps * v)) - 1j * (f(y + 1j * eps * v) - f(y - 1j * eps * v))) / (4 * eps)
+                result = SparseJacobian(hamiltonian).matvec(0.3, y, history, v)
+                np.testing.assert_allclose(result, expected, rtol=0, atol=1e-7 * np.abs(expected).max())
+
+    def test_real_jacobian(self):
+        N = 12
+        matrix = self.rng.normal(size=(N, N)) + 1j * self.rng.normal(size=(N, N))
+        v = self.rng.normal(size=N) + 1j * self.rng.normal(size=N)
+        np.testing.assert_allclose(real_jacobian(matrix) @ v.view(np.float64), (matrix @ v).view(np.float64))
+
+    def test_saturated_rows_vanish(self):
+        grid_size = CONFIG["grid_size"]
+        fields = wormhole_fields(grid_size, CONFIG["dx"], (0x123456789, None))
+        hamiltonian = build_hamiltonian(grid_size, CONFIG["dx"], fields["V"], fields["wormhole_state"], self.logger)
+        y = np.exp(1j * self.rng.uniform(0, 2 * np.pi, int(np.prod(grid_size)))) / np.sqrt(np.prod(grid_size))
+        jacobian = SparseJacobian(hamiltonian)
+        self.assertEqual(jacobian(0.0, y, [], hamiltonian(0.0, y, [], None)).count_nonzero(), 0)
+
+        integrator = build_integrator("solve_ivp", method="auto", hamiltonian=hamiltonian)
+        reference = y.copy()
+        build_integrator("solve_ivp", method="RK45").step(lambda t, z: hamiltonian(t, z, [], None), reference,
+                                                           CONFIG["dt"], CONFIG["rtol"], CONFIG["atol"])
+        integrator.step(lambda t, z: hamiltonian(t, z, [], None), y, CONFIG["dt"], CONFIG["rtol"], CONFIG["atol"])
+        self.assertEqual(integrator.method, "RK45")
+        self.assertEqual(integrator.stiffness, 0.0)
+        np.testing.assert_array_equal(y, reference)
+
+    def test_auto_selects_radau_for_stiff_smooth_state(self):
+        grid_size = (24, 2, 2, 2, 2, 2)
+        N = int(np.prod(grid_size))
+        hamiltonian = self.hamiltonian(grid_size, np.full(N, 0.5 * hbar), np.ones(N) / np.sqrt(N))
+        x = np.arange(grid_size[0]).reshape((-1,) + (1,) * 5)
+        y0 = ((1 + 0.1 * np.cos(2 * np.pi * x / grid_size[0])) * np.ones(grid_size)).ravel().astype(np.complex128)
+        y0 /= np.linalg.norm(y0)
+        history = [y0.copy()]
+
+        def f(t, z, out=None):
+            return hamiltonian(t, z, history, None, out=out)
+
+        explicit = build_integrator("solve_ivp", method="RK45", config=hamiltonian.config)
+        implicit = build_integrator("solve_ivp", method="auto", hamiltonian=hamiltonian, config=hamiltonian.config)
+        y_explicit, y_implicit = y0.copy(), y0.copy()
+        self.assertTrue(explicit.step(f, y_explicit, 0.2, 1e-6, 1e-9, state_history=history))
+        self.assertTrue(implicit.step(f, y_implicit, 0.2, 1e-6, 1e-9, state_history=history))
+        self.assertEqual(implicit.method, "Radau")
+        self.assertGreater(implicit.stiffness, hamiltonian.config["stiffness_threshold"])
+        self.assertLess(implicit.nfev, explicit.nfev / 2)
+        np.testing.assert_allclose(y_implicit, y_explicit, atol=1e-4)
+
+if __name__ == "__main__":
+    unittest.main()
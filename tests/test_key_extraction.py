@@ -0,0 +1,59 @@
+import unittest
+import logging
+import numpy as np
+from src.config import CONFIG, SEARCH_START, SEARCH_END
+from src.key_extraction import KeyExtractor
+from src.quantum_state import QuantumState
+
+GRID_SIZE = (5, 5, 5, 5, 3, 3)
+
+def reference_candidate(state, total_points):
+    """Candidate computed exactly as the original per-state extraction did."""
+    state_magnitude = np.abs(state)
+    state_phase = np.angle(state)
+    demon_observation = np.sum(state.reshape(GRID_SIZE), axis=(0, 1, 2, 3, 4)).flatten()
+    demon_factor = np.tile(demon_observation, total_points // 3)[:total_points]
+    scalar_wave = CONFIG["j4_coupling"] * np.sin(state_phase)
+    combined = state_magnitude + 0.5 * (state_phase / np.pi) + 0.1 * demon_factor + 0.1 * scalar_wave
+    indices = np.argsort(combined)
+    key_bits = np.zeros_like(combined, dtype=int)
+    key_bits[indices[total_points // 2:]] = 1
+    key_int = 0
+    for bit in key_bits[:256]:
+        key_int = (key_int << 1) | bit
+    return max(SEARCH_START, min(SEARCH_END, key_int))
+
+class TestKeyExtractor(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+        rng = np.random.default_rng(7)
+        n = int(np.prod(GRID_SIZE))
+        self.states = np.exp(1j * rng.uniform(0, 2 * np.pi, (64, n))) * rng.uniform(0.5, 1.5, (64, n)) / np.sqrt(n)
+
+    def test_batch_matches_reference(self):
+        n = self.states.shape[1]
+        expected = [reference_candidate(s, n) for s in self.states]
+        self.assertEqual(KeyExtractor.candidates(self.states, GRID_SIZE), expected)
+
+    def test_extract_matches_reference(self):
+        state = QuantumState(GRID_SIZE, self.logger, rng=np.random.default_rng(3))
+        key_int, success, _ = KeyExtractor.extract(state, "1TestAddress", state.total_points, [])
+        self.assertEqual(key_int, reference_candidate(state.state, state.total_points))
+        self.assertFalse(success)
+
+    def test_ties_broken_by_position(self):
+        combined = np.array([[3, 1, 2, 2, 2, 0, 2, 5]], dtype=np.complex128)
+        ranks = np.empty(8, dtype=int)
+        ranks[np.argsort(combined[0], kind="stable")] = np.arange(8)
+        np.testing.assert_array_equal(KeyExtractor.upper_half_bits(combined, n_bits=8)[0], ranks >= 4)
+
+    def test_pack_bits_keeps_low_64_bits(self):
+        bits = np.zeros(256, dtype=np.uint8)
+        bits[0] = bits[-1] = bits[-2] = 1
+        self.assertEqual(KeyExtractor.pack_bits(bits), 3)
+        bits[192] = 1
+        self.assertEqual(KeyExtractor.pack_bits(bits), 3 - 2**63)
+
+if __name__ == "__main__":
+    unittest.main()
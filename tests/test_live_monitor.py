@@ -0,0 +1,64 @@
+import unittest
+import logging
+import os
+import tempfile
+import time
+import numpy as np
+from src.config import CONFIG
+from src.live_monitor import LiveMonitor, projections, read_snapshot
+from src.simulation import Unified6DTOE
+
+class TestLiveMonitor(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+
+    def test_projections(self):
+        grid_size = (3, 4, 2, 2, 3, 5)
+        rng = np.random.default_rng(0)
+        state = rng.normal(size=int(np.prod(grid_size))) + 1j * rng.normal(size=int(np.prod(grid_size)))
+        state /= np.linalg.norm(state)
+        views = projections(state, grid_size, [(1, 0), (2, 4)])
+        probability = np.abs(state.reshape(grid_size))**2
+        np.testing.assert_allclose(views["x-y"], probability.sum(axis=(2, 3, 4, 5)))
+        self.assertEqual(views["z-w1"].shape, (2, 3))
+        self.assertEqual(views["w2"].shape, (5,))
+        self.assertAlmostEqual(views["w2"].sum(), 1.0)
+
+    def test_publishes_every_k_steps(self):
+        sim = Unified6DTOE("1TestAddress", (0x123456789, None), self.logger, rng=np.random.default_rng(0))
+        with LiveMonitor(sim.grid_size, every=3, render=False) as monitor:
+            sim.run_simulation(7, progress=False, monitor=monitor)
+            self.assertIsNone(sim.quantum_state.monitor)
+            self.assertEqual(monitor.published, 2)
+            out = np.empty_like(monitor.buffer)
+            sequence, iteration = read_snapshot(monitor.buffer, monitor.control, out)
+            self.assertEqual(iteration, 6)
+            self.assertIsNone(read_snapshot(monitor.buffer, monitor.control, out, sequence))
+            # A write in progress leaves the counter odd and the reader skips the frame
+            monitor.control[0] += 1
+            self.assertIsNone(read_snapshot(monitor.buffer, monitor.control, out))
+
+    def test_runs_alongside_convergence_monitor(self):
+        config = dict(CONFIG, convergence_window=3)
+        sim = Unified6DTOE("1TestAddress", (0x123456789, None), self.logger, rng=np.random.default_rng(0),
+                           config=config)
+        with LiveMonitor(sim.grid_size, every=2, render=False) as monitor:
+            sim.run_simulation(30, progress=False, monitor=monitor)
+            self.assertEqual(sim.converged_at, sim.stop_iteration)
+            self.assertLess(sim.stop_iteration, 30)
+            self.assertEqual(monitor.published, sim.stop_iteration // 2)
+
+    def test_renderer_writes_frames(self):
+        grid_size = (5, 5, 5, 5, 3, 3)
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "frame.png")
+            with LiveMonitor(grid_size, every=1, fps=20.0, output=output) as monitor:
+                monitor.publish(np.full(int(np.prod(grid_size)), 1 / 75, dtype=np.complex128))
+                deadline = time.monotonic() + 30
+                while not os.path.exists(output) and time.monotonic() < deadline:
+                    time.sleep(0.05)
+            self.assertTrue(os.path.exists(output))
+
+if __name__ == "__main__":
+    unittest.main()
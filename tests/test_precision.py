@@ -0,0 +1,91 @@
+import logging
+import unittest
+import numpy as np
+from src.config import CONFIG
+from src.hamiltonian import build_hamiltonian
+from src.integrators import build_integrator
+from src.key_extraction import KeyExtractor
+from src.quantum_state import QuantumStateEnsemble, state_norm
+from src.simulation import Unified6DTOE
+from tests.unsaturated import max_derivative, unsaturated_config, unsaturated_fields
+
+class TestSinglePrecision(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestPrecision")
+        self.saved = dict(CONFIG)
+        CONFIG.update(grid_size=(3, 3, 3, 3, 3, 4), integrator="rk4")
+
+    def tearDown(self):
+        CONFIG.clear()
+        CONFIG.update(self.saved)
+
+    def simulation(self, precision, iterations, unsaturated=False):
+        CONFIG["precision"] = precision
+        config = unsaturated_config(CONFIG["grid_size"], base=CONFIG) if unsaturated else None
+        fields = unsaturated_fields(config) if unsaturated else None
+        sim = Unified6DTOE("1TestAddress", (0x123456789, None), self.logger, rng=np.random.default_rng(5),
+                           fields=fields, config=config)
+        sim.run_simulation(iterations, progress=False)
+        return sim
+
+    def test_derivative_stays_single_and_matches_double(self):
+        # The default potential overflows float32 and clips every component in both
+        # precisions, so the derivatives are compared in the unsaturated regime
+        for backend in ("compiled", "sparse"):
+            with self.subTest(backend=backend):
+                sim = self.simulation("double", 0, unsaturated=True)
+                y = sim.quantum_state.state
+                double = build_hamiltonian(sim.grid_size, sim.dx, sim.V, sim.wormhole_state, self.logger, backend,
+                                           config=sim.config)
+                expected = double(0.1, y, [np.roll(y, 3)], None)
+                self.assertLess(max_derivative(double, y, [np.roll(y, 3)]), 1e-3 * sim.config["field_clamp_max"])
+                single = build_hamiltonian(sim.grid_size, sim.dx, sim.V, sim.wormhole_state, self.logger, backend,
+                                           config=dict(sim.config, precision="single"))
+                y32 = y.astype(np.complex64)
+                with np.errstate(over="raise", invalid="raise", divide="raise"):
+                    result = single(0.1, y32, [np.roll(y32, 3)], None)
+                self.assertEqual(result.dtype, np.complex64)
+                np.testing.assert_allclose(result, expected, rtol=0, atol=1e-6 * np.abs(expected).max())
+
+    def test_default_potential_overflows_and_clips(self):
+        sim = self.simulation("double", 0)
+        y = sim.quantum_state.state
+        CONFIG["precision"] = "single"
+        with self.assertLogs(self.logger, "WARNING"):
+            single = build_hamiltonian(sim.grid_size, sim.dx, sim.V, sim.wormhole_state, self.logger, "compiled")
+        result = single(0.1, y.astype(np.complex64), [], None)
+        np.testing.assert_array_equal(np.abs(result.real), CONFIG["field_clamp_max"])
+
+    def test_run_matches_double_precision_candidates(self):
+        double = self.simulation("double", 5, unsaturated=True)
+        single = self.simulation("single", 5, unsaturated=True)
+        self.assertEqual(single.quantum_state.state.dtype, np.complex64)
+        self.assertEqual(single.quantum_state.temporal_entanglement.dtype, np.complex64)
+        self.assertAlmostEqual(float(state_norm(single.quantum_state.state)), 1.0, places=6)
+        self.assertGreater(np.abs(double.quantum_state.state - single.quantum_state.state).max(), 0)
+        np.testing.assert_allclose(single.quantum_state.state, double.quantum_state.state, atol=1e-6)
+        self.assertEqual(
+            KeyExtractor.candidates(single.quantum_state.state[None, :], single.grid_size),
+            KeyExtractor.candidates(double.quantum_state.state[None, :], double.grid_size),
+        )
+
+    def test_batched_ensemble_in_single_precision(self):
+        CONFIG["precision"] = "single"
+        sim = Unified6DTOE("1TestAddress", (0x123456789, None), self.logger, rng=np.random.default_rng(5))
+        hamiltonian = build_hamiltonian(sim.grid_size, sim.dx, sim.V, sim.wormhole_state, self.logger)
+        ensemble = QuantumStateEnsemble(sim.grid_size, 2, self.logger, [np.random.default_rng(m) for m in range(2)])
+        for _ in range(2):
+            ensemble.evolve(sim.dt, CONFIG["rtol"], CONFIG["atol"], hamiltonian, build_integrator())
+        self.assertEqual(ensemble.state.dtype, np.complex64)
+        np.testing.assert_allclose(np.linalg.norm(ensemble.state, axis=1), 1.0, rtol=1e-6)
+
+    def test_unsupported_combinations_are_rejected(self):
+        CONFIG["precision"] = "single"
+        with self.assertRaises(ValueError):
+            build_integrator("solve_ivp")
+        sim = Unified6DTOE("1TestAddress", (0x123456789, None), self.logger)
+        with self.assertRaises(ValueError):
+            build_hamiltonian(sim.grid_size, sim.dx, sim.V, sim.wormhole_state, self.logger, "reference")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import json
+import logging
+import unittest
+import numpy as np
+from src.config import CONFIG
+from src.hamiltonian import CompiledHamiltonian
+from src.integrators import SolveIVPIntegrator, RK4Integrator
+from src.profiling import Profiler
+from src.simulation import Unified6DTOE
+from tests.unsaturated import max_derivative, unsaturated_config, unsaturated_fields
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("test")
+        self.saved = dict(CONFIG)
+
+    def tearDown(self):
+        CONFIG.clear()
+        CONFIG.update(self.saved)
+
+    def test_profiled_hamiltonian_is_unchanged(self):
+        grid_size = (3, 3, 3, 3, 3, 4)
+        n = int(np.prod(grid_size))
+        rng = np.random.default_rng(0)
+        y = (rng.normal(size=n) + 1j * rng.normal(size=n)) / np.sqrt(2 * n)
+        # Unclipped, so a profiled term computed differently would change the result
+        config = unsaturated_config(grid_size)
+        fields = unsaturated_fields(config)
+        hamiltonian = CompiledHamiltonian(grid_size, config["dx"], fields["V"], fields["wormhole_state"], self.logger,
+                                          config=config)
+        history = [np.roll(y, 1)]
+        self.assertLess(max_derivative(hamiltonian, y, history), 1e-3 * config["field_clamp_max"])
+        expected = hamiltonian(0.3, y, history, None).copy()
+        hamiltonian.profiler = Profiler()
+        np.testing.assert_array_equal(hamiltonian(0.3, y, history, None), expected)
+        terms = hamiltonian.profiler.to_dict()
+        for name in ("shift", "laplacian", "entanglement", "kinetic_potential", "wormhole", "ctc", "clip"):
+            self.assertEqual(terms[name]["calls"], 1)
+
+    def test_solver_statistics(self):
+        def rotation(t, y, out=None):
+            return np.multiply(-2j, y, out=out)
+
+        integrator = SolveIVPIntegrator()
+        integrator.step(rotation, np.ones(4, dtype=np.complex128), 1.0, 1e-8, 1e-10)
+        stats = integrator.last_stats
+        self.assertGreater(stats["accepted"], 1)
+        self.assertEqual(stats["nfev"], 2 + 6 * (stats["accepted"] + stats["rejected"]))
+        integrator = RK4Integrator(substeps=3)
+        integrator.step(rotation, np.ones(4, dtype=np.complex128), 1.0)
+        self.assertEqual(integrator.last_stats, {"nfev": 12, "accepted": 3, "rejected": 0})
+
+    def test_run_summary_exports_json(self):
+        CONFIG.update(grid_size=(3, 3, 3, 3, 3, 4), integrator="rk4", profiling=True)
+        sim = Unified6DTOE("1BitcoinEaterAddressDontSendf59kuE", (12345, 0), self.logger,
+                           rng=np.random.default_rng(1))
+        sim.run_simulation(3, progress=False)
+        summary = json.loads(sim.run_stats.to_json())
+        self.assertEqual(summary["iterations"], 3)
+        self.assertEqual(summary["solver"]["nfev"], 12)
+        self.assertEqual(len(summary["extraction"]["per_iteration"]), 3)
+        self.assertEqual(summary["hamiltonian_terms"]["clip"]["calls"], 12)
+
+if __name__ == "__main__":
+    unittest.main()
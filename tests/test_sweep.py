@@ -0,0 +1,88 @@
+import unittest
+import logging
+import tempfile
+from src.config import CONFIG
+from src.sweep import Sweep, ResultStore, expand_grid, resolve_config, run_key
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_expand_grid(self):
+        points = expand_grid({"dt": [1e-12, 2e-12], "wormhole_coupling": [1.0, 2.0, 3.0]})
+        self.assertEqual(len(points), 6)
+        self.assertEqual(points[0], {"dt": 1e-12, "wormhole_coupling": 1.0})
+        self.assertEqual(expand_grid([{"dt": 1e-12}]), [{"dt": 1e-12}])
+
+    def test_resolve_config_does_not_touch_global(self):
+        before = dict(CONFIG)
+        config = resolve_config({"dt": 2e-12, "grid_size": [3, 3, 3, 3, 2, 2]})
+        self.assertEqual(config["dt"], 2e-12)
+        self.assertEqual(config["grid_size"], (3, 3, 3, 3, 2, 2))
+        self.assertEqual(CONFIG, before)
+        with self.assertRaises(ValueError):
+            resolve_config({"no_such_key": 1})
+
+    def test_run_key(self):
+        config = resolve_config({})
+        key = run_key(config, 0, 5, "1TestAddress", (0x123456789, None))
+        self.assertEqual(key, run_key(resolve_config({"checkpoint_every": 7}), 0, 5, "1TestAddress", (0x123456789, None)))
+        self.assertNotEqual(key, run_key(config, 1, 5, "1TestAddress", (0x123456789, None)))
+        self.assertNotEqual(key, run_key(resolve_config({"dt": 2e-12}), 0, 5, "1TestAddress", (0x123456789, None)))
+
+    def test_sweep_skips_cached_runs(self):
+        store = ResultStore(self.tmp.name)
+        sweep = Sweep("1TestAddress", (0x123456789, None), self.logger, store, max_workers=2)
+        grid = {"ctc_feedback_factor": [0.25, 0.5]}
+        first = list(sweep.run(grid, seeds=[0, 1], iterations=3))
+        self.assertEqual(len(first), 4)
+        self.assertFalse(any(result.cached for result in first))
+        for result in first:
+            self.assertEqual(result.summary["iterations"], 3)
+            self.assertAlmostEqual(result.summary["norm"], 1.0)
+            self.assertGreater(result.summary["participation_ratio"], 0)
+
+        second = list(sweep.run(grid, seeds=[0, 1, 2], iterations=3))
+        self.assertEqual(sum(result.cached for result in second), 4)
+        cached = {result.key: result.summary for result in second if result.cached}
+        self.assertEqual(cached, {result.key: result.summary for result in first})
+        self.assertEqual(len(store.query(ctc_feedback_factor=0.25)), 3)
+        self.assertEqual(len(store.query(ctc_feedback_factor=0.5, seed=1)), 1)
+
+    def test_query_separates_base_configs(self):
+        store = ResultStore(self.tmp.name)
+        sweeps = [Sweep("1TestAddress", (0x123456789, None), self.logger, store,
+                        base_config=dict(CONFIG, ctc_feedback_factor=factor), max_workers=2)
+                  for factor in (0.25, 0.5)]
+        for sweep in sweeps:
+            list(sweep.run({"dt": [1e-12]}, iterations=2))
+        self.assertEqual(len(store.query(dt=1e-12)), 2)
+        for sweep, factor in zip(sweeps, (0.25, 0.5)):
+            records = sweep.query(dt=1e-12)
+            self.assertEqual(len(records), 1)
+            self.assertEqual(records[0]["config"]["ctc_feedback_factor"], factor)
+            self.assertEqual(store.query(ctc_feedback_factor=factor), records)
+        self.assertEqual(store.query(grid_size=CONFIG["grid_size"], seed=0, base_config=sweeps[0].base_config),
+                         sweeps[0].query())
+
+    def test_failed_runs_are_not_cached(self):
+        store = ResultStore(self.tmp.name)
+        sweep = Sweep("1TestAddress", (0x123456789, None), self.logger, store, max_workers=2)
+        grid = [{"ode_method": "RK45"}, {"ode_method": "NoSuchMethod"}]
+        for _ in range(2):
+            results = {result.params["ode_method"]: result for result in sweep.run(grid, iterations=2)}
+            self.assertEqual(results["RK45"].summary["status"], "ok")
+            self.assertIsNone(results["RK45"].summary["error"])
+            failed = results["NoSuchMethod"]
+            self.assertFalse(failed.cached)
+            self.assertEqual(failed.summary["status"], "failed")
+            self.assertIn("Error at iteration 0", failed.summary["error"])
+            self.assertEqual(failed.summary["iterations"], 0)
+            self.assertNotIn(failed.key, store)
+        self.assertTrue(results["RK45"].cached)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import io
+import logging
+import os
+import tempfile
+import threading
+import numpy as np
+from src.config import CONFIG
+from src.simulation import Unified6DTOE
+from src.telemetry import LazyQueueHandler, MetricRing, Progress, TelemetryWriter, read_telemetry, start_log_listener
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("TestLogger")
+        self.logger.addHandler(logging.NullHandler())
+
+    def test_ring_wraps_and_counts_dropped_rows(self):
+        ring = MetricRing(("iteration", "value"), capacity=4)
+        for i in range(3):
+            ring.record(i, 2.0 * i)
+        np.testing.assert_array_equal(ring.drain()["iteration"], [0, 1, 2])
+        for i in range(3, 10):
+            ring.record(i, 2.0 * i)
+        batch = ring.drain()
+        np.testing.assert_array_equal(batch["iteration"], [6, 7, 8, 9])
+        np.testing.assert_array_equal(batch["value"], [12, 14, 16, 18])
+        self.assertEqual(ring.dropped, 3)
+        self.assertEqual(len(ring.drain()), 0)
+
+    def test_writer_formats_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt in ("jsonl", "binary"):
+                with self.subTest(fmt=fmt):
+                    path = os.path.join(tmp, f"metrics.{fmt}")
+                    ring = MetricRing()
+                    writer = TelemetryWriter(ring, path, fmt, interval=0.01)
+                    for i in range(50):
+                        ring.record(i, 0.1 * i, 0.1, 6 * i)
+                    writer.close()
+                    rows = read_telemetry(path)
+                    np.testing.assert_array_equal(rows["iteration"], np.arange(50))
+                    np.testing.assert_allclose(rows["elapsed"], 0.1 * np.arange(50))
+                    np.testing.assert_array_equal(rows["nfev"], 6 * np.arange(50))
+
+    def test_run_simulation_writes_telemetry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "run.jsonl")
+            config = dict(CONFIG, telemetry_path=path)
+            sim = Unified6DTOE("1TestAddress", (0x123456789, None), self.logger, rng=np.random.default_rng(0),
+                               config=config)
+            sim.run_simulation(5, progress=False)
+            rows = read_telemetry(path)
+            np.testing.assert_array_equal(rows["iteration"], np.arange(5))
+            self.assertTrue(np.all(np.diff(rows["nfev"]) > 0))
+            self.assertTrue(np.all(rows["step_seconds"] > 0))
+
+    def test_interrupted_run_closes_telemetry(self):
+        class Interrupt:
+            def record(self, iteration, state):
+                if iteration == 2:
+                    raise KeyboardInterrupt
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "run.jsonl")
+            config = dict(CONFIG, telemetry_path=path)
+            sim = Unified6DTOE("1TestAddress", (0x123456789, None), self.logger, rng=np.random.default_rng(0),
+                               config=config)
+            with self.assertRaises(KeyboardInterrupt):
+                sim.run_simulation(5, progress=False, recorder=Interrupt())
+            self.assertNotIn("telemetry-writer", [thread.name for thread in threading.enumerate()])
+            np.testing.assert_array_equal(read_telemetry(path)["iteration"], np.arange(2))
+
+    def test_log_records_are_formatted_by_listener(self):
+        logger = logging.getLogger("TestTelemetryQueue")
+        logger.propagate = False
+        stream = io.StringIO()
+        listener = start_log_listener([logging.StreamHandler(stream)], logger=logger)
+        try:
+            handler = next(h for h in logger.handlers if isinstance(h, LazyQueueHandler))
+            record = logger.makeRecord(logger.name, logging.INFO, __file__, 0, "value %d", (7,), None)
+            self.assertIs(handler.prepare(record), record)
+            self.assertEqual(record.args, (7,))
+            logger.info("Iteration %d: Predicted Key = %#x", 3, 255)
+        finally:
+            listener.stop()
+            logger.handlers.clear()
+        self.assertEqual(stream.getvalue(), "Iteration 3: Predicted Key = 0xff\n")
+
+    def test_progress_redraw_rate(self):
+        stream = io.StringIO()
+        items = list(Progress(range(1000), desc="Test", min_interval=3600, stream=stream))
+        self.assertEqual(items, list(range(1000)))
+        # One draw at the start and the final line
+        self.assertEqual(stream.getvalue().count("\r"), 2)
+        self.assertRegex(stream.getvalue(), r"\rTest: 1000/1000 \(100%\) [0-9.]+ it/s\n$")
+
+if __name__ == "__main__":
+    unittest.main()